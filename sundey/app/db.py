@@ -0,0 +1,288 @@
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.settings import load_settings
+
+SETTINGS_FILE = "settings.json"
+
+# ערכי ברירת מחדל - settings.json דורס אותם, ומשתני סביבה דורסים את שניהם
+# (שם משתנה הסביבה = שם המפתח באותיות גדולות, למשל DB_POOL_SIZE)
+DEFAULTS = {
+    "db_url": None,
+    "db_pool_size": 5,
+    "db_max_overflow": 10,
+    "db_pool_timeout": 30,
+    "db_pool_pre_ping": True,
+    "db_pool_recycle": 3600,
+    "db_echo": False,
+    # instrumentation.py - מדידת שאילתות ויומן שאילתות איטיות
+    "db_instrument": False,
+    "db_slow_query_ms": 200.0,
+}
+
+_engines: dict = {}
+_engines_by_default: dict = {}
+_lock = threading.Lock()
+
+
+def _parse(value: str, like):
+    if isinstance(like, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(like, int):
+        return int(value)
+    return value
+
+
+def engine_settings(path: str = None) -> dict:
+    """
+    הגדרות ה-DB: DEFAULTS <- settings.json <- משתני סביבה
+    """
+    path = path or os.environ.get("DB_SETTINGS_FILE", SETTINGS_FILE)
+    settings = dict(DEFAULTS)
+    try:
+        settings.update(load_settings(path))
+    except FileNotFoundError:
+        pass
+
+    for key, default in DEFAULTS.items():
+        value = os.environ.get(key.upper())
+        if value is not None:
+            settings[key] = _parse(value, default)
+    return settings
+
+
+def resolve_url(settings: dict, default_url: str = None) -> str:
+    """
+    סדר עדיפות: db_url (סביבה / settings.json) -> default_url של המודול
+    -> הרכבה מ-db_host / db_user / db_password / db_name
+    """
+    if settings.get("db_url"):
+        return settings["db_url"]
+    if default_url:
+        return default_url
+    if settings.get("db_name"):
+        password = settings.get("db_password") or ""
+        auth = settings.get("db_user", "root") + (f":{password}" if password else "")
+        return f"mysql+pymysql://{auth}@{settings.get('db_host', 'localhost')}/{settings['db_name']}"
+    raise ValueError("לא הוגדר חיבור ל-DB (db_url / db_name ב-settings.json)")
+
+
+class PoolMetrics:
+    """
+    מונים של ה-pool: כמה checkouts, כמה חיבורים חדשים נפתחו,
+    כמה מוחזקים כרגע (ושיא), וכמה זמן חיכו לחיבור פנוי
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def on_connect(self, *args):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, *args):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            if self.checked_out > self.peak_checked_out:
+                self.peak_checked_out = self.checked_out
+
+    def on_checkin(self, *args):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "wait_total": self.wait_total,
+                "wait_avg": self.wait_total / self.checkouts if self.checkouts else 0.0,
+                "wait_max": self.wait_max,
+                "timeouts": self.timeouts,
+            }
+
+
+class _WaitTimingPool:
+    """
+    mixin ל-pool שמודד כמה זמן כל checkout חיכה לחיבור
+    """
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_WaitTimingPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingPool, AsyncAdaptedQueuePool):
+    pass
+
+
+# דרייבר אסינכרוני לכל דרייבר סינכרוני (ל-create_async_engine)
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _engine_kwargs(settings: dict, url, poolclass) -> dict:
+    kwargs = {
+        "echo": settings["db_echo"],
+        "pool_pre_ping": settings["db_pool_pre_ping"],
+        "pool_recycle": settings["db_pool_recycle"],
+    }
+    # SQLite בזיכרון חי בתוך חיבור אחד - אין טעם ב-QueuePool
+    if not _is_memory_sqlite(url):
+        kwargs.update(
+            poolclass=poolclass,
+            pool_size=settings["db_pool_size"],
+            max_overflow=settings["db_max_overflow"],
+            pool_timeout=settings["db_pool_timeout"],
+        )
+    return kwargs
+
+
+def _attach_metrics(engine: Engine) -> None:
+    metrics = PoolMetrics()
+    if isinstance(engine.pool, _WaitTimingPool):
+        engine.pool.metrics = metrics
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    engine.pool_metrics = metrics
+
+
+def create_engine_from_settings(settings: dict, default_url: str = None) -> Engine:
+    """
+    יוצר engine חדש (לא שמור) לפי ההגדרות, עם pool ממודד
+    """
+    url = make_url(resolve_url(settings, default_url))
+    engine = create_engine(url, **_engine_kwargs(settings, url, InstrumentedQueuePool))
+    _attach_metrics(engine)
+    return engine
+
+
+def async_url(url):
+    """
+    מחליף את הדרייבר ב-URL לדרייבר האסינכרוני המתאים
+    (mysql+pymysql -> mysql+aiomysql, sqlite -> sqlite+aiosqlite)
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"אין דרייבר אסינכרוני מוגדר עבור {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_async_engine_from_settings(settings: dict, default_url: str = None):
+    """
+    כמו create_engine_from_settings, אבל AsyncEngine (ל-AsyncSession)
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_url(resolve_url(settings, default_url))
+    engine = create_async_engine(
+        url, **_engine_kwargs(settings, url, InstrumentedAsyncQueuePool)
+    )
+    _attach_metrics(engine.sync_engine)
+    return engine
+
+
+def get_engine(default_url: str = None) -> Engine:
+    """
+    engine אחד לכל URL בכל תהליך (אחרי fork נוצר engine חדש).
+    ההגדרות נקראות רק בקריאה הראשונה לכל default_url.
+    """
+    pid = os.getpid()
+    engine = _engines_by_default.get((default_url, pid))
+    if engine is not None:
+        return engine
+
+    with _lock:
+        settings = engine_settings()
+        url = resolve_url(settings, default_url)
+        engine = _engines.get((url, pid))
+        if engine is None:
+            engine = create_engine_from_settings(settings, default_url)
+            _engines[(url, pid)] = engine
+        _engines_by_default[(default_url, pid)] = engine
+    return engine
+
+
+def get_async_engine(default_url: str = None):
+    """
+    AsyncEngine אחד לכל URL בכל תהליך
+    """
+    pid = os.getpid()
+    engine = _engines_by_default.get(("async", default_url, pid))
+    if engine is not None:
+        return engine
+
+    with _lock:
+        settings = engine_settings()
+        url = resolve_url(settings, default_url)
+        engine = _engines.get(("async", url, pid))
+        if engine is None:
+            engine = create_async_engine_from_settings(settings, default_url)
+            _engines[("async", url, pid)] = engine
+        _engines_by_default[("async", default_url, pid)] = engine
+    return engine
+
+
+def pool_metrics(engine: Engine) -> dict:
+    """
+    מוני ה-pool של engine שנוצר כאן + הסטטוס של SQLAlchemy
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    metrics = getattr(engine, "pool_metrics", None)
+    data = metrics.snapshot() if metrics is not None else {}
+    data["status"] = engine.pool.status()
+    return data
@@ -0,0 +1,109 @@
+"""
+ייצוא האימונים של משתמש ל-CSV בזרימה, בלי לטעון את כל השורות לזיכרון.
+
+השורות נקראות עם stream_results (cursor בצד השרת ב-MySQL) ב-batches של
+batch_size, וכל batch נכתב ל-CSV ומשוחרר לפני שנקרא הבא - כך הזיכרון
+תלוי ב-batch_size ולא במספר השורות.
+
+iter_csv_chunks מחזיר את ה-CSV כמחרוזות (chunk לכל batch), למשל ל-
+StreamingResponse של FastAPI בלי קובץ זמני:
+    StreamingResponse(iter_csv_chunks(user_id), media_type="text/csv")
+"""
+import csv
+import io
+import os
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.db import get_engine
+from app.tables import exercises, workout_exercises, workouts
+
+EXPORT_FIELDS = [
+    "workout_id", "date", "notes", "exercise", "muscle_group",
+    "sets", "reps", "weight", "volume",
+]
+BATCH_SIZE = 1000
+# באפר הכתיבה לקובץ
+WRITE_BUFFER = 1024 * 1024
+
+
+def _export_query(user_id: int):
+    return (
+        select(
+            workouts.c.id,
+            workouts.c.date,
+            workouts.c.notes,
+            exercises.c.name,
+            exercises.c.muscle_group,
+            workout_exercises.c.sets,
+            workout_exercises.c.reps,
+            workout_exercises.c.weight,
+        )
+        .select_from(
+            workouts.join(workout_exercises, workout_exercises.c.workout_id == workouts.c.id).join(
+                exercises, exercises.c.id == workout_exercises.c.exercise_id
+            )
+        )
+        .where(workouts.c.user_id == user_id)
+        .order_by(workouts.c.date.desc(), workouts.c.id, workout_exercises.c.id)
+    )
+
+
+def iter_export_batches(user_id: int, batch_size: int = BATCH_SIZE, engine=None):
+    """
+    מחזיר רשימות של עד batch_size שורות, מתוך cursor בצד השרת
+    """
+    engine = engine if engine is not None else get_engine()
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            _export_query(user_id)
+        )
+        for partition in result.partitions():
+            yield [
+                (w_id, d, notes, name, group, s, r, weight, s * r * weight)
+                for w_id, d, notes, name, group, s, r, weight in partition
+            ]
+
+
+def iter_csv_chunks(user_id: int, batch_size: int = BATCH_SIZE, engine=None):
+    """
+    ה-CSV כמחרוזות: קודם שורת הכותרת, ואז chunk אחד לכל batch
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+
+    for rows in iter_export_batches(user_id, batch_size, engine):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+def export_user_workouts_to_csv(user_id: int, path: str, batch_size: int = BATCH_SIZE,
+                                engine=None) -> int:
+    """
+    מייצאת את כל האימונים של משתמש מסוים לקובץ CSV
+    (שורה לכל תרגיל באימון, מהאימון החדש לישן).
+    הכתיבה לקובץ זמני ואז rename - קובץ קיים לא נשאר חצי כתוב.
+    מחזירה את מספר השורות שנכתבו.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, mode="w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_FIELDS)
+            for rows in iter_export_batches(user_id, batch_size, engine):
+                writer.writerows(rows)
+                count += len(rows)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return count
@@ -0,0 +1,355 @@
+"""
+ייבוא CSV גדול ל-DB בשלבים: קריאה -> פענוח+ולידציה במקביל -> כתיבה.
+
+- reader (ה-thread הראשי): קורא את הקובץ בחבילות של chunk_rows רשומות
+  כטקסט גולמי (בלי לפענח), ושולח כל חבילה ל-ProcessPoolExecutor.
+- parse (תהליכים): csv + המרת סוגים + ולידציה. שורה לא תקינה לא עוצרת
+  את הקובץ - היא נרשמת ב-errors עם מספר השורה.
+- writer (thread): לוקח את החבילות לפי הסדר ומכניס ב-INSERT מרובה
+  שורות, commit לכל batch_size שורות. batch שנכשל (למשל ISBN כפול)
+  נכנס שוב שורה-שורה כדי לדעת איזו שורה נכשלה.
+
+בין השלבים יש תור חסום של max_in_flight חבילות: כשה-writer מאחר
+ה-reader נעצר, כך שהזיכרון לא תלוי בגודל הקובץ.
+progress(stats) נקרא אחרי כל batch שנכתב.
+
+    python -m app.import_pipeline exercises exercises.csv --workers 4
+    python -m app.import_pipeline books books.csv --check
+"""
+import argparse
+import csv
+import io
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import MetaData, Table, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.tables import exercises
+
+CHUNK_ROWS = 10_000
+BATCH_SIZE = 5_000
+# כמה שגיאות נשמרות עם הפירוט (הספירה ב-failed היא של כולן)
+MAX_ERRORS = 1000
+READ_BUFFER = 1024 * 1024
+
+
+# ---------------------------------------------------------
+# פענוח + ולידציה - פונקציות ברמת המודול (צריכות לעבור pickle לתהליכים)
+# ---------------------------------------------------------
+
+def _text(row, name, min_len, max_len, required=True):
+    value = (row.get(name) or "").strip()
+    if not value:
+        if required:
+            raise ValueError(f"{name} חסר")
+        return None
+    if not min_len <= len(value) <= max_len:
+        raise ValueError(f"{name} באורך {len(value)}, מותר {min_len}-{max_len}")
+    return value
+
+
+def _number(row, name, cast, low, high, required=True):
+    raw = (row.get(name) or "").strip()
+    if not raw:
+        if required:
+            raise ValueError(f"{name} חסר")
+        return None
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValueError(f"{name} לא מספר: {raw!r}") from None
+    if not low <= value <= high:
+        raise ValueError(f"{name}={value} מחוץ לטווח {low}-{high}")
+    return value
+
+
+def parse_exercise(row: dict) -> dict:
+    """
+    id מהקובץ נשמר כשיש עמודת id - workout_exercises.exercise_id מפנים אליו
+    """
+    values = {
+        "name": _text(row, "name", 1, 100),
+        "muscle_group": _text(row, "muscle_group", 1, 50, required=False),
+    }
+    if "id" in row:
+        values["id"] = _number(row, "id", int, 1, 2**31 - 1, required=False)
+    return values
+
+
+def parse_book(row: dict) -> dict:
+    """
+    אותן הגבלות כמו Book ב-ex_tut.py (id מהקובץ לא נלקח)
+    """
+    in_stock = (row.get("in_stock") or "").strip().lower()
+    if in_stock and in_stock not in ("1", "0", "true", "false", "yes", "no"):
+        raise ValueError(f"in_stock לא תקין: {in_stock!r}")
+    return {
+        "title": _text(row, "title", 2, 200),
+        "author": _text(row, "author", 2, 100),
+        "pages": _number(row, "pages", int, 1, 5000),
+        "price": _number(row, "price", float, 0.01, 999.99),
+        "isbn": _text(row, "isbn", 1, 20, required=False),
+        "publication_year": _number(row, "publication_year", int, 1000, 2030, required=False),
+        "in_stock": in_stock not in ("0", "false", "no"),
+    }
+
+
+PARSERS = {"exercises": parse_exercise, "books": parse_book}
+
+
+def parse_chunk(kind: str, header: list, first_line: int, text: str):
+    """
+    מפענח חבילה אחת. מחזיר (rows, errors):
+    rows = [(line_no, values), ...], errors = [(line_no, message), ...]
+    """
+    parse = PARSERS[kind]
+    rows, errors = [], []
+    line_no = first_line
+    for record in csv.reader(io.StringIO(text, newline="")):
+        if record:
+            if len(record) != len(header):
+                errors.append((line_no, f"{len(record)} עמודות במקום {len(header)}"))
+            else:
+                try:
+                    rows.append((line_no, parse(dict(zip(header, record)))))
+                except ValueError as e:
+                    errors.append((line_no, str(e)))
+        line_no += 1
+    return rows, errors
+
+
+# ---------------------------------------------------------
+# reader
+# ---------------------------------------------------------
+
+def iter_chunks(f, chunk_rows: int = CHUNK_ROWS):
+    """
+    מחזיר (first_line, text) לכל chunk_rows רשומות, כטקסט גולמי.
+    רשומה עם ירידת שורה בתוך מרכאות נשארת שלמה (ספירת מרכאות).
+    מספרי השורות הם של הרשומות בקובץ (שורה 1 = הכותרת).
+    """
+    lines = []
+    record = ""
+    line_no = 2
+    first_line = line_no
+    for line in f:
+        record += line
+        if record.count('"') % 2:
+            continue
+        lines.append(record)
+        record = ""
+        line_no += 1
+        if len(lines) == chunk_rows:
+            yield first_line, "".join(lines)
+            lines = []
+            first_line = line_no
+    if record:
+        lines.append(record)
+    if lines:
+        yield first_line, "".join(lines)
+
+
+class _InlineExecutor:
+    """
+    workers=0 - הפענוח רץ ב-thread הראשי (להשוואה / לקבצים קטנים)
+    """
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+# ---------------------------------------------------------
+# writer
+# ---------------------------------------------------------
+
+def books_table(engine) -> Table:
+    """
+    טבלת books קיימת (נוצרת ע"י ex_tut.init_db) - נקראת מה-DB כדי לא לייבא את המודל
+    """
+    return Table("books", MetaData(), autoload_with=engine)
+
+
+def _write_batch(engine, table, batch, stats, now=None):
+    values = [v for _, v in batch]
+    if now is not None:
+        for v in values:
+            v["created_at"] = now
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(table), values)
+        stats["inserted"] += len(values)
+        return
+    except SQLAlchemyError:
+        pass
+
+    # ה-batch בוטל - שורה-שורה כדי לדעת איזו נכשלה
+    for line_no, value in batch:
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(table), [value])
+            stats["inserted"] += 1
+        except SQLAlchemyError as e:
+            _add_error(stats, line_no, str(e.orig if getattr(e, "orig", None) else e).splitlines()[0])
+
+
+def _add_error(stats, line_no, message):
+    stats["failed"] += 1
+    if len(stats["errors"]) < MAX_ERRORS:
+        stats["errors"].append((line_no, message))
+
+
+def _writer(pending, engine, table, kind, batch_size, stats, progress, failure):
+    batch = []
+    started = stats["started"]
+
+    def flush():
+        if engine is not None and batch:
+            _write_batch(engine, table, batch, stats, datetime.now() if kind == "books" else None)
+        batch.clear()
+        stats["seconds"] = time.perf_counter() - started
+        if progress is not None:
+            progress(stats)
+
+    try:
+        while True:
+            future = pending.get()
+            if future is None:
+                break
+            rows, errors = future.result()
+            stats["rows_read"] += len(rows) + len(errors)
+            stats["valid"] += len(rows)
+            for line_no, message in errors:
+                _add_error(stats, line_no, message)
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush()
+        flush()
+    except BaseException as e:
+        failure.append(e)
+        # משחררים את ה-reader אם הוא חסום על התור
+        while pending.get() is not None:
+            pass
+
+
+# ---------------------------------------------------------
+# pipeline
+# ---------------------------------------------------------
+
+def import_csv(path, kind: str, engine=None, workers: int = None,
+               chunk_rows: int = CHUNK_ROWS, batch_size: int = BATCH_SIZE,
+               max_in_flight: int = None, progress=None) -> dict:
+    """
+    מייבא את path (kind = "exercises" / "books") ל-engine.
+    engine=None - רק פענוח וולידציה, בלי כתיבה (בדיקת קובץ / מדידה).
+    workers: מספר תהליכים לפענוח (None = כמספר ה-CPUs, 0 = בלי תהליכים).
+    מחזיר stats: rows_read, valid, inserted, failed, errors[(line, message)],
+    bytes, seconds, rows_per_s
+    """
+    if kind not in PARSERS:
+        raise ValueError(f"סוג ייבוא לא מוכר: {kind}")
+    if chunk_rows < 1 or batch_size < 1:
+        raise ValueError("chunk_rows / batch_size חייבים להיות >= 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = max(2, workers * 2)
+
+    table = None
+    if engine is not None:
+        table = exercises if kind == "exercises" else books_table(engine)
+
+    stats = {
+        "kind": kind, "workers": workers, "rows_read": 0, "valid": 0, "inserted": 0, "failed": 0,
+        "errors": [], "bytes": os.path.getsize(path), "seconds": 0.0,
+        "started": time.perf_counter(),
+    }
+    pending = queue.Queue(maxsize=max_in_flight)
+    failure = []
+    writer = threading.Thread(
+        target=_writer,
+        args=(pending, engine, table, kind, batch_size, stats, progress, failure),
+        daemon=True,
+    )
+    executor = ProcessPoolExecutor(workers) if workers > 0 else _InlineExecutor()
+    writer.start()
+    try:
+        with open(path, mode="r", newline="", encoding="utf-8", buffering=READ_BUFFER) as f:
+            header = [h.strip() for h in next(csv.reader([f.readline()]), [])]
+            for first_line, text in iter_chunks(f, chunk_rows):
+                if failure:
+                    break
+                # put חוסם כשהתור מלא - זה ה-backpressure על הקריאה
+                pending.put(executor.submit(parse_chunk, kind, header, first_line, text))
+    finally:
+        pending.put(None)
+        writer.join()
+        executor.shutdown(wait=True, cancel_futures=bool(failure))
+    if failure:
+        raise failure[0]
+
+    stats["seconds"] = time.perf_counter() - stats.pop("started")
+    stats["rows_per_s"] = stats["rows_read"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ייבוא CSV ל-DB")
+    parser.add_argument("kind", choices=sorted(PARSERS))
+    parser.add_argument("path")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--check", action="store_true", help="רק ולידציה, בלי כתיבה ל-DB")
+    args = parser.parse_args(argv)
+
+    engine = None
+    if not args.check:
+        from app.db import get_engine
+
+        if args.kind == "books":
+            import ex_tut
+
+            ex_tut.init_db()
+            engine = ex_tut._engine()
+        else:
+            engine = get_engine()
+
+    def progress(stats):
+        mb = stats["bytes"] / 1024 / 1024
+        rate = stats["rows_read"] / stats["seconds"] if stats["seconds"] else 0
+        print(
+            f"\r{stats['rows_read']:,} שורות ({rate:,.0f} לשנייה, קובץ {mb:,.0f}MB), "
+            f"{stats['failed']} שגיאות",
+            end="", flush=True,
+        )
+
+    stats = import_csv(
+        args.path, args.kind, engine, workers=args.workers,
+        chunk_rows=args.chunk_rows, batch_size=args.batch_size, progress=progress,
+    )
+    print(
+        f"\nנקראו {stats['rows_read']} שורות, {stats['valid']} תקינות, נוספו {stats['inserted']}, "
+        f"{stats['failed']} נכשלו ({stats['seconds']:.1f} שניות)"
+    )
+    for line_no, message in stats["errors"][:20]:
+        print(f"  שורה {line_no}: {message}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import csv
+
+from app.import_pipeline import import_csv, parse_exercise
+from app.models import Exercise
+from app.workout_repository import get_repository
+
+# ייצוא בזרימה - ראה app/export.py
+from app.export import export_user_workouts_to_csv, iter_csv_chunks  # noqa: F401
+
+
+def get_user_from_db(email: str):
+    """
+    מקבלת email, מחפשת את המשתמש ב-DB ומחזירה אובייקט User או None.
+    """
+    return get_repository().get_user_by_email(email)
+
+
+def calculate_user_total_volume(user_id: int, pushdown: bool = False) -> float:
+    """
+    מחשבת את סך כל ה-volume של כל האימונים של משתמש מסוים,
+    תוך שימוש במחלקות Workout ו-WorkoutExercise.
+    pushdown=True - הסכום מחושב ב-SQL, בלי לבנות אובייקטים.
+    """
+    repo = get_repository()
+    if pushdown:
+        return repo.user_total_volume(user_id)
+
+    total = 0
+    for workout in repo.load_user_workouts(user_id):
+        total += workout.total_workout_volume()
+    return total
+
+
+def load_exercises_from_csv(path: str) -> list:
+    """
+    קוראת קובץ CSV ומחזירה רשימה של אובייקטי Exercise.
+    שורה לא תקינה -> ValueError (לקבצים גדולים ל-DB - import_exercises_from_csv)
+    """
+    result = []
+    with open(path, mode="r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            values = parse_exercise(row)
+            result.append(Exercise(values.get("id"), values["name"], values["muscle_group"]))
+    return result
+
+
+def import_exercises_from_csv(path: str, workers: int = None, progress=None) -> dict:
+    """
+    מייבאת קובץ CSV של תרגילים ישר ל-DB דרך app/import_pipeline.py
+    (פענוח במקביל, כתיבה ב-batches, שגיאות לכל שורה בלי לעצור).
+    """
+    return import_csv(path, "exercises", get_repository().engine, workers=workers, progress=progress)
@@ -0,0 +1,132 @@
+"""
+מיגרציות לסכמה של workout_manager - בלי DROP ובלי לאבד נתונים.
+
+כל שלב הוא (version, name, fn(conn)) ומריץ פעולות שבודקות קודם מה קיים
+(create_all עם checkfirst, inspector לאינדקסים), כך שאפשר להריץ אותו
+שוב על DB שכבר נוצר מ-schema.sql. גרסאות שהורצו נרשמות ב-schema_migrations
+וכל שלב רץ בטרנזקציה משלו.
+
+    python -m app.migrations            # מריץ את מה שעוד לא הורץ
+    python -m app.migrations status
+"""
+import sys
+from datetime import datetime
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, inspect, insert, select,
+)
+
+from app import tables, user_stats
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_tables(conn, *table_list):
+    """
+    יוצר רק טבלאות שלא קיימות (האינדקסים שלהן נוצרים איתן).
+    מחזיר את שמות הטבלאות שנוצרו.
+    """
+    existing = set(inspect(conn).get_table_names())
+    tables.metadata.create_all(conn, tables=list(table_list), checkfirst=True)
+    return [t.name for t in table_list if t.name not in existing]
+
+
+def _ensure_index(conn, index):
+    """
+    יוצר את האינדקס אם אין אינדקס בשם הזה.
+    (ב-MySQL האינדקס שה-FK יצר אוטומטית על אותה עמודה נמחק מעצמו
+    כשנוצר אינדקס אחר שמתאים ל-FK)
+    """
+    names = {i["name"] for i in inspect(conn).get_indexes(index.table.name)}
+    if index.name in names:
+        return False
+    index.create(conn)
+    return True
+
+
+def _base_tables(conn):
+    _create_tables(
+        conn, tables.users, tables.exercises, tables.workouts, tables.workout_exercises
+    )
+
+
+def _stats_tables(conn):
+    created = _create_tables(conn, tables.user_stats, tables.user_muscle_stats)
+    if created:
+        # DB קיים עם אימונים - ממלאים את הסיכומים מהנתונים
+        user_stats.rebuild(conn)
+
+
+def _hot_path_indexes(conn):
+    for table in (tables.workouts, tables.exercises, tables.workout_exercises):
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            _ensure_index(conn, index)
+
+
+MIGRATIONS = [
+    (1, "base tables", _base_tables),
+    (2, "user stats tables", _stats_tables),
+    (3, "hot path indexes", _hot_path_indexes),
+]
+
+
+def applied_versions(engine) -> set:
+    with engine.begin() as conn:
+        _meta.create_all(conn, checkfirst=True)
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def migrate(engine) -> list:
+    """
+    מריץ את המיגרציות שעוד לא הורצו, לפי הסדר. מחזיר את מה שהורץ.
+    """
+    done = applied_versions(engine)
+    ran = []
+    for version, name, step in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(
+                insert(schema_migrations).values(
+                    version=version, name=name, applied_at=datetime.now()
+                )
+            )
+        ran.append((version, name))
+    return ran
+
+
+def main(argv=None):
+    from app.db import get_engine
+
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "upgrade"
+    if command not in ("upgrade", "status"):
+        print("שימוש: python -m app.migrations [upgrade|status]")
+        return 2
+
+    engine = get_engine()
+    if command == "status":
+        done = applied_versions(engine)
+        for version, name, _ in MIGRATIONS:
+            mark = "V" if version in done else " "
+            print(f"[{mark}] {version:03d} {name}")
+        return 0
+
+    ran = migrate(engine)
+    for version, name in ran:
+        print(f"הורצה מיגרציה {version:03d}: {name}")
+    if not ran:
+        print("הסכמה מעודכנת.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
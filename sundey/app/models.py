@@ -1,4 +1,6 @@
 class User:
+    __slots__ = ("id", "full_name", "email", "join_date")
+
     def __init__(self,id,full_name,email,join_date):
         self.id=id
         self.full_name=full_name
@@ -10,6 +12,8 @@ class User:
     
 
 class Exercise:
+    __slots__ = ("id", "name", "muscle_group")
+
     def __init__(self,id,name,muscle_group):
         self.id=id
         self.name=name
@@ -17,6 +21,8 @@ class Exercise:
 
 
 class WorkoutExercise:
+    __slots__ = ("exercise", "sets", "reps", "weight")
+
     def __init__(self,exercise:Exercise,sets:int, reps:int, weight :float):
         self.exercise=exercise
         self.sets=sets
@@ -28,6 +34,8 @@ class WorkoutExercise:
 
 
 class Workout:
+    __slots__ = ("id", "user", "date", "notes", "exercises")
+
     def __init__(self,id ,user,date ,notes  ):
         self.id=id
         self.user=user
@@ -0,0 +1,85 @@
+"""
+בדיקת תוכניות הביצוע (EXPLAIN) של השאילתות ב-project/sql/queries.sql:
+כל שאילתה מסומנת ב-"-- uses:" עם האינדקסים שהיא אמורה להשתמש בהם,
+והבדיקה נכשלת אם אחד מהם לא מופיע בתוכנית.
+
+MySQL - עמודת key של EXPLAIN, SQLite - "USING [COVERING] INDEX x" של
+EXPLAIN QUERY PLAN. על טבלאות כמעט ריקות MySQL מעדיף לפעמים סריקה מלאה,
+לכן כדאי להריץ על DB עם נתונים (ואחרי ANALYZE TABLE).
+
+    python -m app.query_plans [path/to/queries.sql]
+"""
+import re
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+QUERIES_FILE = Path(__file__).resolve().parent.parent / "project" / "sql" / "queries.sql"
+
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+def load_queries(path=QUERIES_FILE) -> list:
+    """
+    [(name, sql, [expected indexes]), ...] לפי הסימונים "-- name:" / "-- uses:"
+    """
+    queries = []
+    current = None
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        if stripped.startswith("-- name:"):
+            current = {"name": stripped[len("-- name:"):].strip(), "uses": [], "sql": []}
+            queries.append(current)
+        elif current is None:
+            continue
+        elif stripped.startswith("-- uses:"):
+            current["uses"] = [i.strip() for i in stripped[len("-- uses:"):].split(",") if i.strip()]
+        elif stripped and not stripped.startswith("--"):
+            current["sql"].append(line)
+    return [(q["name"], "\n".join(q["sql"]).strip().rstrip(";"), q["uses"]) for q in queries]
+
+
+def used_indexes(conn, sql: str) -> set:
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql)).all()
+        return {m.group(1) for row in rows for m in _SQLITE_INDEX.finditer(row[-1])}
+    if dialect in ("mysql", "mariadb"):
+        rows = conn.execute(text("EXPLAIN " + sql)).mappings().all()
+        return {row["key"] for row in rows if row["key"]}
+    raise ValueError(f"אין תמיכה ב-EXPLAIN עבור {dialect}")
+
+
+def check_plans(conn, path=QUERIES_FILE) -> list:
+    """
+    [(name, expected, used, missing), ...] לכל שאילתה
+    """
+    results = []
+    for name, sql, expected in load_queries(path):
+        used = used_indexes(conn, sql)
+        results.append((name, expected, used, [i for i in expected if i not in used]))
+    return results
+
+
+def main(argv=None):
+    from app.db import get_engine
+
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else QUERIES_FILE
+    with get_engine().connect() as conn:
+        results = check_plans(conn, path)
+
+    failed = 0
+    for name, expected, used, missing in results:
+        status = "OK" if not missing else "חסר: " + ", ".join(missing)
+        print(f"{name:<30} {status}   (בשימוש: {', '.join(sorted(used)) or '-'})")
+        failed += bool(missing)
+    if failed:
+        print(f"{failed} שאילתות לא משתמשות באינדקסים הצפויים.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+הטבלאות של workout_manager כ-SQLAlchemy Core - מקבילות ל-project/sql/schema.sql.
+metadata נפרד מזה של SQLModel (טבלת books של ex_tut / ex_sql).
+"""
+from sqlalchemy import (
+    CheckConstraint, Column, Date, ForeignKey, Index, Integer, MetaData, Numeric,
+    PrimaryKeyConstraint, String, Table, text,
+)
+
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("full_name", String(100), nullable=False),
+    Column("email", String(100), nullable=False, unique=True),
+    Column("join_date", Date, nullable=False, server_default=text("(CURRENT_DATE)")),
+)
+
+exercises = Table(
+    "exercises",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(100), nullable=False),
+    Column("muscle_group", String(50)),
+    # שאילתות א.4: לפי שם תרגיל, וקיבוץ לפי קבוצת שרירים
+    Index("ix_exercises_name", "name"),
+    Index("ix_exercises_muscle_group", "muscle_group"),
+)
+
+workouts = Table(
+    "workouts",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", name="fk_workouts_user", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    ),
+    Column("date", Date, nullable=False),
+    Column("notes", String(255)),
+    # "האימונים של משתמש מהחדש לישן" - גם משמש את ה-FK על user_id
+    Index("ix_workouts_user_date", "user_id", "date"),
+)
+
+workout_exercises = Table(
+    "workout_exercises",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column(
+        "workout_id",
+        Integer,
+        ForeignKey("workouts.id", name="fk_we_workout", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    ),
+    Column(
+        "exercise_id",
+        Integer,
+        ForeignKey("exercises.id", name="fk_we_exercise", ondelete="RESTRICT", onupdate="CASCADE"),
+        nullable=False,
+    ),
+    Column("sets", Integer, nullable=False),
+    Column("reps", Integer, nullable=False),
+    # float ולא Decimal - החישובים בפייתון / NumPy עובדים עם float
+    Column("weight", Numeric(5, 2, asdecimal=False), nullable=False),
+    CheckConstraint("sets > 0", name="ck_we_sets"),
+    CheckConstraint("reps > 0", name="ck_we_reps"),
+    # ה-JOIN מאימון לתרגילים שלו, ומתרגיל לשורות שלו
+    Index("ix_workout_exercises_workout_exercise", "workout_id", "exercise_id"),
+    Index("ix_workout_exercises_exercise", "exercise_id"),
+)
+
+
+# סיכומים לכל משתמש - מתעדכנים באותה טרנזקציה שמוסיפה / מוחקת אימון
+# (ראה app/user_stats.py)
+user_stats = Table(
+    "user_stats",
+    metadata,
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", name="fk_user_stats_user", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+        autoincrement=False,
+    ),
+    Column("total_workouts", Integer, nullable=False, server_default=text("0")),
+    Column("total_volume", Numeric(14, 2, asdecimal=False), nullable=False, server_default=text("0")),
+)
+
+# מונה לכל (משתמש, קבוצת שרירים); תרגיל בלי muscle_group נשמר כ-''
+user_muscle_stats = Table(
+    "user_muscle_stats",
+    metadata,
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", name="fk_user_muscle_stats_user", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    ),
+    Column("muscle_group", String(50), nullable=False),
+    Column("exercise_count", Integer, nullable=False, server_default=text("0")),
+    Column("volume", Numeric(14, 2, asdecimal=False), nullable=False, server_default=text("0")),
+    PrimaryKeyConstraint("user_id", "muscle_group", name="pk_user_muscle_stats"),
+)
@@ -0,0 +1,253 @@
+"""
+סיכומים לכל משתמש (user_stats, user_muscle_stats) ל-/users/{id}/stats:
+total_workouts, total_volume ו-favorite_muscle_group בקריאה לפי מפתח,
+בלי לסרוק את כל האימונים של המשתמש.
+
+apply_workout() נקראת מתוך הטרנזקציה שמוסיפה / מוחקת אימון
+(WorkoutRepository.create_workout / delete_workout) ומעדכנת את המונים.
+העדכון הוא UPDATE ואם אין שורה - INSERT (עובד גם ב-MySQL וגם ב-SQLite);
+אם INSERT מקביל הקדים אותנו, חוזרים ל-UPDATE.
+
+rebuild() מחשב הכול מחדש מהטבלאות, verify() משווה את הסיכום לחישוב מלא.
+
+    python -m app.user_stats rebuild     # מחשב מחדש ובודק
+    python -m app.user_stats verify      # רק בודק
+"""
+import sys
+
+from sqlalchemy import delete, distinct, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.tables import (
+    exercises, user_muscle_stats, user_stats, users, workout_exercises, workouts,
+)
+
+# ההפרש המותר בין הסיכום לחישוב מלא (עמודות DECIMAL(14,2))
+TOLERANCE = 0.01
+
+
+def _group_key(muscle_group) -> str:
+    return muscle_group if muscle_group is not None else ""
+
+
+def _upsert_add(conn, table, key: dict, deltas: dict):
+    """
+    UPDATE table SET col = col + delta WHERE key; אם אין שורה - INSERT
+    """
+    where = [table.c[k] == v for k, v in key.items()]
+    values = {col: table.c[col] + delta for col, delta in deltas.items()}
+    if conn.execute(update(table).where(*where).values(values)).rowcount:
+        return
+    try:
+        with conn.begin_nested():
+            conn.execute(insert(table).values({**key, **deltas}))
+    except IntegrityError:
+        # INSERT מקביל של אותו מפתח הספיק לפנינו
+        conn.execute(update(table).where(*where).values(values))
+
+
+def apply_workout(conn, user_id: int, rows, sign: int = 1):
+    """
+    מעדכן את הסיכומים של user_id עבור אימון אחד.
+    rows - (exercise_id, sets, reps, weight) של התרגילים באימון.
+    sign=1 - אימון נוסף, sign=-1 - אימון נמחק.
+    """
+    rows = list(rows)
+    groups = {}
+    if rows:
+        ids = {r[0] for r in rows}
+        groups = dict(
+            conn.execute(
+                select(exercises.c.id, exercises.c.muscle_group).where(exercises.c.id.in_(ids))
+            ).all()
+        )
+
+    total = 0.0
+    per_group = {}
+    for exercise_id, sets, reps, weight in rows:
+        volume = sets * reps * float(weight)
+        total += volume
+        key = _group_key(groups.get(exercise_id))
+        count, group_volume = per_group.get(key, (0, 0.0))
+        per_group[key] = (count + 1, group_volume + volume)
+
+    _upsert_add(
+        conn,
+        user_stats,
+        {"user_id": user_id},
+        {"total_workouts": sign, "total_volume": sign * total},
+    )
+    for group, (count, volume) in per_group.items():
+        _upsert_add(
+            conn,
+            user_muscle_stats,
+            {"user_id": user_id, "muscle_group": group},
+            {"exercise_count": sign * count, "volume": sign * volume},
+        )
+
+    if sign < 0:
+        conn.execute(
+            delete(user_muscle_stats).where(
+                user_muscle_stats.c.user_id == user_id,
+                user_muscle_stats.c.exercise_count <= 0,
+            )
+        )
+
+
+def get_user_stats(conn, user_id: int) -> dict:
+    """
+    total_workouts, total_volume, favorite_muscle_group (הקבוצה עם הכי
+    הרבה תרגילים; בשוויון - לפי שם). משתמש בלי אימונים -> אפסים.
+    """
+    row = conn.execute(
+        select(user_stats.c.total_workouts, user_stats.c.total_volume).where(
+            user_stats.c.user_id == user_id
+        )
+    ).first()
+    favorite = conn.execute(
+        select(user_muscle_stats.c.muscle_group)
+        .where(
+            user_muscle_stats.c.user_id == user_id,
+            user_muscle_stats.c.muscle_group != "",
+            user_muscle_stats.c.exercise_count > 0,
+        )
+        .order_by(user_muscle_stats.c.exercise_count.desc(), user_muscle_stats.c.muscle_group)
+        .limit(1)
+    ).scalar()
+    return {
+        "user_id": user_id,
+        "total_workouts": row.total_workouts if row is not None else 0,
+        "total_volume": float(row.total_volume) if row is not None else 0.0,
+        "favorite_muscle_group": favorite,
+    }
+
+
+def _volume():
+    return workout_exercises.c.sets * workout_exercises.c.reps * workout_exercises.c.weight
+
+
+def _workout_totals():
+    """
+    SELECT לכל משתמש עם אימונים: (user_id, total_workouts, total_volume)
+    """
+    return (
+        select(
+            workouts.c.user_id,
+            func.count(distinct(workouts.c.id)),
+            func.coalesce(func.sum(_volume()), 0),
+        )
+        .select_from(
+            workouts.outerjoin(workout_exercises, workout_exercises.c.workout_id == workouts.c.id)
+        )
+        .group_by(workouts.c.user_id)
+    )
+
+
+def _muscle_totals():
+    """
+    SELECT לכל (משתמש, קבוצת שרירים): (user_id, muscle_group, count, volume)
+    """
+    group = func.coalesce(exercises.c.muscle_group, literal(""))
+    return (
+        select(workouts.c.user_id, group, func.count(), func.sum(_volume()))
+        .select_from(
+            workouts.join(workout_exercises, workout_exercises.c.workout_id == workouts.c.id).join(
+                exercises, exercises.c.id == workout_exercises.c.exercise_id
+            )
+        )
+        .group_by(workouts.c.user_id, group)
+    )
+
+
+def rebuild_statements() -> list:
+    """
+    DELETE + INSERT ... SELECT של rebuild - גם ל-load_data.sql של workout_generator
+    """
+    return [
+        delete(user_muscle_stats),
+        delete(user_stats),
+        insert(user_stats).from_select(
+            ["user_id", "total_workouts", "total_volume"], _workout_totals()
+        ),
+        insert(user_muscle_stats).from_select(
+            ["user_id", "muscle_group", "exercise_count", "volume"], _muscle_totals()
+        ),
+    ]
+
+
+def rebuild(conn):
+    """
+    מוחק את הסיכומים ומחשב אותם מחדש מ-workouts / workout_exercises
+    """
+    for stmt in rebuild_statements():
+        conn.execute(stmt)
+
+
+def verify(conn) -> list:
+    """
+    משווה את הסיכומים לחישוב מלא. מחזיר רשימת הבדלים (ריקה = תקין).
+    """
+    expected = {u: (n, float(v)) for u, n, v in conn.execute(_workout_totals())}
+    actual = {
+        u: (n, float(v))
+        for u, n, v in conn.execute(
+            select(user_stats.c.user_id, user_stats.c.total_workouts, user_stats.c.total_volume)
+        )
+    }
+    problems = []
+    for user_id in sorted(expected.keys() | actual.keys()):
+        exp = expected.get(user_id, (0, 0.0))
+        act = actual.get(user_id, (0, 0.0))
+        if exp[0] != act[0] or abs(exp[1] - act[1]) > TOLERANCE:
+            problems.append(("user_stats", user_id, None, exp, act))
+
+    expected = {(u, g): (n, float(v)) for u, g, n, v in conn.execute(_muscle_totals())}
+    actual = {
+        (u, g): (n, float(v))
+        for u, g, n, v in conn.execute(
+            select(
+                user_muscle_stats.c.user_id,
+                user_muscle_stats.c.muscle_group,
+                user_muscle_stats.c.exercise_count,
+                user_muscle_stats.c.volume,
+            )
+        )
+    }
+    for key in sorted(expected.keys() | actual.keys()):
+        exp = expected.get(key, (0, 0.0))
+        act = actual.get(key, (0, 0.0))
+        if exp[0] != act[0] or abs(exp[1] - act[1]) > TOLERANCE:
+            problems.append(("user_muscle_stats", key[0], key[1], exp, act))
+    return problems
+
+
+def main(argv=None):
+    from app.db import get_engine
+
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "verify"
+    if command not in ("rebuild", "verify"):
+        print("שימוש: python -m app.user_stats [rebuild|verify]")
+        return 2
+
+    engine = get_engine()
+    if command == "rebuild":
+        with engine.begin() as conn:
+            rebuild(conn)
+        print("הסיכומים חושבו מחדש.")
+
+    with engine.connect() as conn:
+        problems = verify(conn)
+        user_count = conn.execute(select(func.count()).select_from(users)).scalar_one()
+    for table, user_id, group, exp, act in problems:
+        where = f"user {user_id}" + (f" group '{group}'" if group is not None else "")
+        print(f"{table}: {where}: expected {exp}, found {act}")
+    if problems:
+        print(f"נמצאו {len(problems)} הבדלים.")
+        return 1
+    print(f"הסיכומים תקינים ({user_count} משתמשים).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+ייצוג עמודתי (NumPy) של הרבה אימונים לחישובי volume.
+
+במקום אובייקט WorkoutExercise לכל שורה - מערך אחד לכל עמודה:
+workout_id, user_id, exercise_id, sets, reps, weight.
+החישובים (סה"כ, לפי אימון / משתמש / קבוצת שרירים) הם פעולות וקטוריות
+(bincount) ולא לולאת פייתון.
+
+from_workouts / to_workouts ממירים מ/אל המחלקות של models.py.
+"""
+import numpy as np
+
+from app.models import Exercise, Workout, WorkoutExercise
+
+
+def _group_sum(keys: np.ndarray, values: np.ndarray) -> dict:
+    """
+    סכום values לכל ערך שונה ב-keys -> {key: sum}
+    """
+    if len(keys) == 0:
+        return {}
+    unique, inverse = np.unique(keys, return_inverse=True)
+    sums = np.bincount(inverse, weights=values, minlength=len(unique))
+    return dict(zip(unique.tolist(), sums.tolist()))
+
+
+class WorkoutBatch:
+    """
+    שורות workout_exercises כעמודות NumPy.
+    workouts - {workout_id: (user_id, date, notes)}
+    exercises - {exercise_id: Exercise}, users - {user_id: User}
+    (נדרשים רק ל-to_workouts ולחישוב לפי קבוצת שרירים)
+    """
+
+    def __init__(self, workout_id, user_id, exercise_id, sets, reps, weight,
+                 workouts: dict = None, exercises: dict = None, users: dict = None):
+        self.workout_id = np.asarray(workout_id, dtype=np.int64)
+        self.user_id = np.asarray(user_id, dtype=np.int64)
+        self.exercise_id = np.asarray(exercise_id, dtype=np.int64)
+        self.sets = np.asarray(sets, dtype=np.int32)
+        self.reps = np.asarray(reps, dtype=np.int32)
+        self.weight = np.asarray(weight, dtype=np.float64)
+        n = len(self.workout_id)
+        for column in (self.user_id, self.exercise_id, self.sets, self.reps, self.weight):
+            if len(column) != n:
+                raise ValueError("כל העמודות חייבות להיות באותו אורך")
+        self.workouts = workouts if workouts is not None else {}
+        self.exercises = exercises if exercises is not None else {}
+        self.users = users if users is not None else {}
+        self._volume = None
+
+    def __len__(self):
+        return len(self.workout_id)
+
+    @classmethod
+    def from_workouts(cls, workouts):
+        """
+        בונה batch מרשימת Workout (אובייקט Exercise / User משותף נשמר פעם אחת)
+        """
+        workout_ids, user_ids, exercise_ids = [], [], []
+        sets, reps, weights = [], [], []
+        meta, exercises, users = {}, {}, {}
+        for w in workouts:
+            user_id = w.user.id if w.user is not None else -1
+            if w.user is not None:
+                users[user_id] = w.user
+            meta[w.id] = (user_id, w.date, w.notes)
+            for we in w.exercises:
+                exercises[we.exercise.id] = we.exercise
+                workout_ids.append(w.id)
+                user_ids.append(user_id)
+                exercise_ids.append(we.exercise.id)
+                sets.append(we.sets)
+                reps.append(we.reps)
+                weights.append(float(we.weight))
+        return cls(workout_ids, user_ids, exercise_ids, sets, reps, weights, meta, exercises, users)
+
+    def to_workouts(self) -> list:
+        """
+        ממיר חזרה לאובייקטי Workout, לפי סדר ה-id של האימונים
+        """
+        workouts = {}
+        for workout_id, (user_id, date, notes) in sorted(self.workouts.items()):
+            workouts[workout_id] = Workout(workout_id, self.users.get(user_id), date, notes)
+
+        exercises = dict(self.exercises)
+        for workout_id, exercise_id, s, r, w in zip(
+            self.workout_id.tolist(),
+            self.exercise_id.tolist(),
+            self.sets.tolist(),
+            self.reps.tolist(),
+            self.weight.tolist(),
+        ):
+            workout = workouts.get(workout_id)
+            if workout is None:
+                workout = workouts[workout_id] = Workout(workout_id, None, None, None)
+            exercise = exercises.get(exercise_id)
+            if exercise is None:
+                exercise = exercises[exercise_id] = Exercise(exercise_id, None, None)
+            workout.add_exercise(WorkoutExercise(exercise, s, r, w))
+        return list(workouts.values())
+
+    def volume(self) -> np.ndarray:
+        """
+        volume לכל שורה = sets * reps * weight (מחושב פעם אחת)
+        """
+        if self._volume is None:
+            self._volume = self.sets * self.reps * self.weight
+        return self._volume
+
+    def total_volume(self) -> float:
+        return float(self.volume().sum())
+
+    def volume_by_workout(self) -> dict:
+        return _group_sum(self.workout_id, self.volume())
+
+    def volume_by_user(self) -> dict:
+        return _group_sum(self.user_id, self.volume())
+
+    def volume_by_muscle_group(self) -> dict:
+        """
+        {muscle_group: volume} לפי exercises; תרגיל שלא מוכר נספר תחת None
+        """
+        if len(self) == 0:
+            return {}
+        groups = sorted(
+            {e.muscle_group for e in self.exercises.values()} | {None},
+            key=lambda g: (g is None, g or ""),
+        )
+        code_of = {g: i for i, g in enumerate(groups)}
+        ids = np.array(sorted(self.exercises), dtype=np.int64)
+        codes = np.array(
+            [code_of[self.exercises[i].muscle_group] for i in ids.tolist()] + [code_of[None]],
+            dtype=np.int64,
+        )
+        # מיקום כל exercise_id במערך הממוין; מה שלא נמצא -> התא האחרון (None)
+        pos = np.searchsorted(ids, self.exercise_id)
+        found = pos < len(ids)
+        found[found] = ids[pos[found]] == self.exercise_id[found]
+        row_codes = codes[np.where(found, pos, len(ids))]
+
+        sums = np.bincount(row_codes, weights=self.volume(), minlength=len(groups))
+        return {g: float(sums[i]) for g, i in code_of.items() if sums[i] or g is not None}
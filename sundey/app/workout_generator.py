@@ -0,0 +1,283 @@
+"""
+מחולל היסטוריית אימונים סינתטית בהיקף גדול + טעינה מהירה ל-DB.
+
+הנתונים נוצרים בבלוקים של משתמשים עם NumPy (בלי לולאת פייתון לכל שורה),
+עם ids מפורשים, ואותו seed נותן בדיוק את אותם נתונים:
+- מספר אימונים למשתמש סביב workouts_per_user (±50%)
+- תאריכים פזורים על days ימים מ-start, ממוינים לכל משתמש
+- מספר תרגילים לאימון בטווח exercises_per_workout
+- קבוצות שרירים בהתפלגות מוטה (skew: 0 = אחיד, גדול = מעט קבוצות שולטות)
+- משקל לפי התרגיל, "כוח" המשתמש והתקדמות לאורך הזמן
+
+טעינה: executemany של DBAPI בחבילות (ב-pymysql זה נהפך ל-INSERT מרובה
+שורות), או קבצי CSV + load_data.sql ל-LOAD DATA של MySQL. בשתי הדרכים
+טבלאות user_stats / user_muscle_stats מחושבות מחדש בסוף (ב-load_data.sql
+כ-INSERT ... SELECT אחרי ה-LOAD DATA).
+
+מדידה מול היעד של 10M שורות workout_exercises: bench/bench_workout_generator.py
+
+    python -m app.workout_generator --users 10000 --workouts 150 --seed 1
+    python -m app.workout_generator --users 10000 --csv out_dir
+"""
+import argparse
+import csv
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import inspect
+from sqlalchemy.dialects import mysql
+
+from app import user_stats
+from app.tables import exercises, users, workout_exercises, workouts
+
+# (שם, קבוצת שרירים, משקל בסיס בק"ג; 0 = משקל גוף)
+EXERCISES = [
+    ("Bench Press", "Chest", 60), ("Incline Dumbbell Press", "Chest", 24),
+    ("Chest Fly", "Chest", 14), ("Push Up", "Chest", 0), ("Dips", "Chest", 0),
+    ("Squat", "Legs", 80), ("Leg Press", "Legs", 120), ("Lunge", "Legs", 20),
+    ("Romanian Deadlift", "Legs", 60), ("Calf Raise", "Legs", 40),
+    ("Deadlift", "Back", 100), ("Pull Up", "Back", 0), ("Barbell Row", "Back", 50),
+    ("Lat Pulldown", "Back", 45), ("Seated Row", "Back", 40),
+    ("Overhead Press", "Shoulders", 35), ("Lateral Raise", "Shoulders", 8),
+    ("Face Pull", "Shoulders", 15), ("Arnold Press", "Shoulders", 16),
+    ("Bicep Curl", "Arms", 12), ("Hammer Curl", "Arms", 12),
+    ("Tricep Pushdown", "Arms", 20), ("Skull Crusher", "Arms", 25),
+    ("Plank", "Core", 0), ("Cable Crunch", "Core", 30), ("Hanging Leg Raise", "Core", 0),
+]
+NOTES = ["", "Felt strong", "Tired", "Deload", "New PR", "Short session"]
+MAX_WEIGHT = 999.5  # DECIMAL(5,2)
+USER_BLOCK = 1000
+INSERT_CHUNK = 50_000
+
+
+def _group_weights(groups: list, skew: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, len(groups) + 1) ** skew
+    return weights / weights.sum()
+
+
+def generate(users_count: int = 1000, workouts_per_user: int = 100,
+             exercises_per_workout=(3, 8), start: date = date(2021, 1, 1),
+             days: int = 3 * 365, skew: float = 1.0, seed: int = 0):
+    """
+    מחזיר (users_rows, exercise_rows, blocks):
+    blocks הוא generator של (workout_rows, workout_exercise_rows) לכל בלוק
+    משתמשים. כל שורה היא tuple לפי סדר העמודות בטבלה.
+    """
+    lo_ex, hi_ex = exercises_per_workout
+    groups = sorted({g for _, g, _ in EXERCISES}, key=[g for _, g, _ in EXERCISES].index)
+    group_p = _group_weights(groups, skew)
+    by_group = [np.array([i + 1 for i, e in enumerate(EXERCISES) if e[1] == g]) for g in groups]
+    group_start = np.cumsum([0] + [len(ids) for ids in by_group])[:-1]
+    group_size = np.array([len(ids) for ids in by_group])
+    flat_ids = np.concatenate(by_group)
+    base = np.array([0.0] + [float(w) for _, _, w in EXERCISES])
+
+    user_rows = [
+        (u, f"User {u}", f"user{u}@example.com", (np.datetime64(start) - (u % 365)).astype(str))
+        for u in range(1, users_count + 1)
+    ]
+    exercise_rows = [(i + 1, name, group) for i, (name, group, _) in enumerate(EXERCISES)]
+
+    def blocks():
+        rng = np.random.default_rng(seed)
+        next_workout = 1
+        next_row = 1
+        lo_w = max(1, workouts_per_user // 2)
+        hi_w = max(lo_w, workouts_per_user * 3 // 2)
+        for first in range(1, users_count + 1, USER_BLOCK):
+            user_ids = np.arange(first, min(first + USER_BLOCK, users_count + 1))
+            strength = rng.uniform(0.5, 1.5, len(user_ids))
+
+            # אימונים: כמה לכל משתמש, ותאריכים ממוינים לכל משתמש
+            per_user = rng.integers(lo_w, hi_w + 1, len(user_ids))
+            w_user = np.repeat(user_ids, per_user)
+            w_offset = rng.integers(0, days, len(w_user))
+            order = np.lexsort((w_offset, w_user))
+            w_user, w_offset = w_user[order], w_offset[order]
+            w_ids = np.arange(next_workout, next_workout + len(w_user))
+            next_workout += len(w_user)
+            w_dates = (np.datetime64(start) + w_offset).astype(str)
+            w_notes = np.array(NOTES, dtype=object)[rng.integers(0, len(NOTES), len(w_user))]
+            workout_rows = list(zip(
+                w_ids.tolist(), w_user.tolist(), w_dates.tolist(),
+                [n or None for n in w_notes.tolist()],
+            ))
+
+            # תרגילים באימון: קבוצת שרירים מוטה, ותרגיל אחיד בתוך הקבוצה
+            per_workout = rng.integers(lo_ex, hi_ex + 1, len(w_ids))
+            r_workout = np.repeat(w_ids, per_workout)
+            r_user_index = np.repeat(w_user - first, per_workout)
+            r_progress = np.repeat(w_offset / days, per_workout)
+            r_group = rng.choice(len(groups), len(r_workout), p=group_p)
+            pick = (rng.random(len(r_workout)) * group_size[r_group]).astype(np.int64)
+            r_exercise = flat_ids[group_start[r_group] + pick]
+            sets = rng.integers(2, 6, len(r_workout))
+            reps = rng.integers(4, 16, len(r_workout))
+            weight = base[r_exercise] * strength[r_user_index] * (0.8 + 0.4 * r_progress)
+            weight = np.minimum(np.round(weight * 2) / 2, MAX_WEIGHT)
+            r_ids = np.arange(next_row, next_row + len(r_workout))
+            next_row += len(r_workout)
+            we_rows = list(zip(
+                r_ids.tolist(), r_workout.tolist(), r_exercise.tolist(),
+                sets.tolist(), reps.tolist(), weight.tolist(),
+            ))
+            yield workout_rows, we_rows
+
+    return user_rows, exercise_rows, blocks()
+
+
+def _insert_sql(conn, table) -> str:
+    marker = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+    columns = [c.name for c in table.columns]
+    return (
+        f"INSERT INTO {table.name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join([marker] * len(columns))})"
+    )
+
+
+def _insert_rows(conn, table, rows):
+    sql = _insert_sql(conn, table)
+    for i in range(0, len(rows), INSERT_CHUNK):
+        conn.exec_driver_sql(sql, rows[i:i + INSERT_CHUNK])
+
+
+def load(engine, users_count: int = 1000, workouts_per_user: int = 100,
+         exercises_per_workout=(3, 8), days: int = 3 * 365, skew: float = 1.0,
+         seed: int = 0, progress=None) -> dict:
+    """
+    מייצר וטוען ל-DB (הטבלאות צריכות להיות קיימות וריקות - app.migrations).
+    ב-SQLite האינדקסים המשניים נמחקים בזמן הטעינה ונבנים מחדש בסוף.
+    אם טבלאות user_stats קיימות - הן מחושבות מחדש בסוף.
+    """
+    user_rows, exercise_rows, blocks = generate(
+        users_count, workouts_per_user, exercises_per_workout, days=days, skew=skew, seed=seed
+    )
+    counts = {"users": len(user_rows), "workouts": 0, "workout_exercises": 0}
+    started = time.perf_counter()
+    is_sqlite = engine.dialect.name == "sqlite"
+    deferred = []
+
+    with engine.begin() as conn:
+        if is_sqlite:
+            for table in (workouts, workout_exercises):
+                for index in table.indexes:
+                    index.drop(conn, checkfirst=True)
+                    deferred.append(index)
+        _insert_rows(conn, users, user_rows)
+        _insert_rows(conn, exercises, exercise_rows)
+
+    for workout_rows, we_rows in blocks:
+        with engine.begin() as conn:
+            _insert_rows(conn, workouts, workout_rows)
+            _insert_rows(conn, workout_exercises, we_rows)
+        counts["workouts"] += len(workout_rows)
+        counts["workout_exercises"] += len(we_rows)
+        if progress is not None:
+            progress(counts, time.perf_counter() - started)
+
+    with engine.begin() as conn:
+        for index in deferred:
+            index.create(conn)
+        if inspect(conn).has_table(user_stats.user_stats.name):
+            user_stats.rebuild(conn)
+
+    counts["seconds"] = time.perf_counter() - started
+    return counts
+
+
+def write_csv(out_dir, users_count: int = 1000, workouts_per_user: int = 100,
+              exercises_per_workout=(3, 8), days: int = 3 * 365, skew: float = 1.0,
+              seed: int = 0) -> dict:
+    """
+    כותב קובץ CSV לכל טבלה (NULL = \\N) ו-load_data.sql עם LOAD DATA לכל אחד,
+    ובסופו החישוב מחדש של user_stats / user_muscle_stats (כמו ב-load)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    user_rows, exercise_rows, blocks = generate(
+        users_count, workouts_per_user, exercises_per_workout, days=days, skew=skew, seed=seed
+    )
+    counts = {"users": len(user_rows), "exercises": len(exercise_rows), "workouts": 0, "workout_exercises": 0}
+
+    def writer(name):
+        f = (out_dir / f"{name}.csv").open("w", newline="", encoding="utf-8", buffering=1024 * 1024)
+        return f, csv.writer(f)
+
+    files = {t.name: writer(t.name) for t in (users, exercises, workouts, workout_exercises)}
+    try:
+        files["users"][1].writerows(user_rows)
+        files["exercises"][1].writerows(exercise_rows)
+        for workout_rows, we_rows in blocks:
+            files["workouts"][1].writerows(
+                (w, u, d, n if n is not None else "\\N") for w, u, d, n in workout_rows
+            )
+            files["workout_exercises"][1].writerows(we_rows)
+            counts["workouts"] += len(workout_rows)
+            counts["workout_exercises"] += len(we_rows)
+    finally:
+        for f, _ in files.values():
+            f.close()
+
+    with (out_dir / "load_data.sql").open("w", encoding="utf-8") as f:
+        f.write("-- mysql --local-infile=1 workout_manager < load_data.sql\n")
+        f.write("SET foreign_key_checks = 0;\nSET unique_checks = 0;\n")
+        for table in (users, exercises, workouts, workout_exercises):
+            columns = ", ".join(c.name for c in table.columns)
+            f.write(
+                f"LOAD DATA LOCAL INFILE '{table.name}.csv' INTO TABLE {table.name}\n"
+                f"  FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"'\n"
+                f"  LINES TERMINATED BY '\\r\\n' ({columns});\n"
+            )
+        f.write("SET unique_checks = 1;\nSET foreign_key_checks = 1;\n")
+        f.write("-- user_stats / user_muscle_stats (app.user_stats.rebuild)\n")
+        dialect = mysql.dialect()
+        for stmt in user_stats.rebuild_statements():
+            f.write(f"{stmt.compile(dialect=dialect, compile_kwargs={'literal_binds': True})};\n")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="מחולל אימונים סינתטי")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--workouts", type=int, default=100, help="ממוצע אימונים למשתמש")
+    parser.add_argument("--exercises", default="3,8", help="טווח תרגילים לאימון, למשל 3,8")
+    parser.add_argument("--days", type=int, default=3 * 365)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="תיקייה לקבצי CSV במקום טעינה ל-DB")
+    args = parser.parse_args(argv)
+    lo, hi = (int(x) for x in args.exercises.split(","))
+    options = dict(
+        users_count=args.users, workouts_per_user=args.workouts,
+        exercises_per_workout=(lo, hi), days=args.days, skew=args.skew, seed=args.seed,
+    )
+
+    if args.csv:
+        counts = write_csv(args.csv, **options)
+        print(f"נכתבו {counts['workout_exercises']} שורות workout_exercises ל-{args.csv}")
+        print(f"טעינה: mysql --local-infile=1 <db> < {Path(args.csv) / 'load_data.sql'}")
+        return 0
+
+    from app.db import get_engine
+    from app.migrations import migrate
+
+    engine = get_engine()
+    migrate(engine)
+
+    def progress(counts, seconds):
+        rate = counts["workout_exercises"] / seconds if seconds else 0
+        print(f"\r{counts['workout_exercises']:,} שורות ({rate:,.0f} לשנייה)", end="", flush=True)
+
+    counts = load(engine, progress=progress, **options)
+    print(
+        f"\nנטענו {counts['users']} משתמשים, {counts['workouts']} אימונים, "
+        f"{counts['workout_exercises']} שורות תוך {counts['seconds']:.1f} שניות"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+טעינת אימונים מה-DB לאובייקטים של models.py בלי N+1:
+כל האימונים של משתמש + התרגילים שלהם נשלפים בשאילתת JOIN אחת,
+ולכל exercise_id נוצר אובייקט Exercise אחד שמשותף לכל האימונים.
+
+user_total_volume מחשב SUM(sets * reps * weight) ב-SQL, כשלא צריך אובייקטים.
+
+create_workout / delete_workout מעדכנים גם את user_stats באותה טרנזקציה.
+
+AsyncWorkoutRepository - אותן פעולות עם await (AsyncEngine, למשל aiosqlite),
+שמריצות את אותו קוד על החיבור דרך run_sync - אין עותק שני של השאילתות.
+"""
+from sqlalchemy import and_, delete, func, insert, select
+
+from app import user_stats
+from app.db import get_async_engine, get_engine
+from app.models import Exercise, User, Workout, WorkoutExercise
+from app.tables import exercises, users, workout_exercises, workouts
+from app.workout_batch import WorkoutBatch
+
+
+def _user_from_row(row) -> User:
+    return User(row.id, row.full_name, row.email, row.join_date)
+
+
+class _WorkoutQueries:
+    """
+    המימוש של כל הפעולות על חיבור נתון (Connection סינכרוני) -
+    משותף ל-WorkoutRepository ול-AsyncWorkoutRepository
+    """
+
+    def __init__(self):
+        # אובייקט Exercise אחד לכל id, לאורך כל הטעינות
+        self._exercises = {}
+
+    def _exercise(self, exercise_id, name, muscle_group) -> Exercise:
+        exercise = self._exercises.get(exercise_id)
+        if exercise is None:
+            exercise = self._exercises[exercise_id] = Exercise(exercise_id, name, muscle_group)
+        elif exercise.name != name or exercise.muscle_group != muscle_group:
+            exercise.name = name
+            exercise.muscle_group = muscle_group
+        return exercise
+
+    def _get_user(self, conn, user_id: int):
+        row = conn.execute(select(users).where(users.c.id == user_id)).first()
+        return _user_from_row(row) if row is not None else None
+
+    def _get_user_by_email(self, conn, email: str):
+        row = conn.execute(select(users).where(users.c.email == email)).first()
+        return _user_from_row(row) if row is not None else None
+
+    def _graph_query(self, columns, user_id: int, from_date=None, to_date=None):
+        # הסינון לפי תאריך ב-ON של ה-JOIN, כדי שמשתמש בלי אימונים בטווח
+        # עדיין יחזיר שורה (ולא ייראה כמו משתמש שלא קיים)
+        on = [workouts.c.user_id == users.c.id]
+        if from_date is not None:
+            on.append(workouts.c.date >= from_date)
+        if to_date is not None:
+            on.append(workouts.c.date <= to_date)
+        joined = (
+            users.outerjoin(workouts, and_(*on))
+            .outerjoin(workout_exercises, workout_exercises.c.workout_id == workouts.c.id)
+            .outerjoin(exercises, exercises.c.id == workout_exercises.c.exercise_id)
+        )
+        return (
+            select(*columns)
+            .select_from(joined)
+            .where(users.c.id == user_id)
+            .order_by(workouts.c.date.desc(), workouts.c.id, workout_exercises.c.id)
+        )
+
+    def _load_user_workouts(self, conn, user_id: int, from_date=None, to_date=None) -> list:
+        stmt = self._graph_query(
+            [
+                users.c.full_name,
+                users.c.email,
+                users.c.join_date,
+                workouts.c.id.label("workout_id"),
+                workouts.c.date,
+                workouts.c.notes,
+                workout_exercises.c.sets,
+                workout_exercises.c.reps,
+                workout_exercises.c.weight,
+                exercises.c.id.label("exercise_id"),
+                exercises.c.name,
+                exercises.c.muscle_group,
+            ],
+            user_id,
+            from_date,
+            to_date,
+        )
+        rows = conn.execute(stmt).all()
+
+        result = []
+        user = None
+        workout = None
+        for row in rows:
+            if user is None:
+                user = User(user_id, row.full_name, row.email, row.join_date)
+            if row.workout_id is None:
+                continue
+            if workout is None or workout.id != row.workout_id:
+                workout = Workout(row.workout_id, user, row.date, row.notes)
+                result.append(workout)
+            if row.exercise_id is not None:
+                exercise = self._exercise(row.exercise_id, row.name, row.muscle_group)
+                workout.add_exercise(WorkoutExercise(exercise, row.sets, row.reps, row.weight))
+        return result
+
+    def _load_user_batch(self, conn, user_id: int, from_date=None, to_date=None) -> WorkoutBatch:
+        stmt = self._graph_query(
+            [
+                users.c.full_name,
+                users.c.email,
+                users.c.join_date,
+                workouts.c.id.label("workout_id"),
+                workouts.c.date,
+                workouts.c.notes,
+                workout_exercises.c.exercise_id,
+                workout_exercises.c.sets,
+                workout_exercises.c.reps,
+                workout_exercises.c.weight,
+                exercises.c.name,
+                exercises.c.muscle_group,
+            ],
+            user_id,
+            from_date,
+            to_date,
+        )
+        workout_ids, exercise_ids, sets, reps, weights = [], [], [], [], []
+        meta, used, user_map = {}, {}, {}
+        for row in conn.execute(stmt):
+            if not user_map:
+                user_map[user_id] = User(user_id, row.full_name, row.email, row.join_date)
+            if row.workout_id is None:
+                continue
+            meta[row.workout_id] = (user_id, row.date, row.notes)
+            if row.exercise_id is None:
+                continue
+            used[row.exercise_id] = self._exercise(row.exercise_id, row.name, row.muscle_group)
+            workout_ids.append(row.workout_id)
+            exercise_ids.append(row.exercise_id)
+            sets.append(row.sets)
+            reps.append(row.reps)
+            weights.append(row.weight)
+        return WorkoutBatch(
+            workout_ids, [user_id] * len(workout_ids), exercise_ids, sets, reps, weights,
+            meta, used, user_map,
+        )
+
+    def _user_total_volume(self, conn, user_id: int) -> float:
+        volume = workout_exercises.c.sets * workout_exercises.c.reps * workout_exercises.c.weight
+        stmt = (
+            select(func.coalesce(func.sum(volume), 0))
+            .select_from(workout_exercises.join(workouts, workouts.c.id == workout_exercises.c.workout_id))
+            .where(workouts.c.user_id == user_id)
+        )
+        return float(conn.execute(stmt).scalar_one())
+
+    def _create_workout(self, conn, user_id: int, date, notes=None, exercise_rows=()) -> int:
+        rows = [
+            (r["exercise_id"], r["sets"], r["reps"], r["weight"]) for r in exercise_rows
+        ]
+        workout_id = conn.execute(
+            insert(workouts).values(user_id=user_id, date=date, notes=notes)
+        ).inserted_primary_key[0]
+        if rows:
+            conn.execute(
+                insert(workout_exercises),
+                [
+                    {"workout_id": workout_id, "exercise_id": e, "sets": s, "reps": r, "weight": w}
+                    for e, s, r, w in rows
+                ],
+            )
+        user_stats.apply_workout(conn, user_id, rows)
+        return workout_id
+
+    def _delete_workout(self, conn, workout_id: int) -> bool:
+        user_id = conn.execute(
+            select(workouts.c.user_id).where(workouts.c.id == workout_id)
+        ).scalar()
+        if user_id is None:
+            return False
+        rows = conn.execute(
+            select(
+                workout_exercises.c.exercise_id,
+                workout_exercises.c.sets,
+                workout_exercises.c.reps,
+                workout_exercises.c.weight,
+            ).where(workout_exercises.c.workout_id == workout_id)
+        ).all()
+        # בלי להסתמך על ON DELETE CASCADE (ב-SQLite הוא כבוי כברירת מחדל)
+        conn.execute(delete(workout_exercises).where(workout_exercises.c.workout_id == workout_id))
+        conn.execute(delete(workouts).where(workouts.c.id == workout_id))
+        user_stats.apply_workout(conn, user_id, rows, sign=-1)
+        return True
+
+
+class WorkoutRepository(_WorkoutQueries):
+    """
+    engine=None - ה-engine המשותף לפי settings.json (db_name)
+    """
+
+    def __init__(self, engine=None):
+        super().__init__()
+        self.engine = engine if engine is not None else get_engine()
+
+    def get_user(self, user_id: int):
+        with self.engine.connect() as conn:
+            return self._get_user(conn, user_id)
+
+    def get_user_by_email(self, email: str):
+        with self.engine.connect() as conn:
+            return self._get_user_by_email(conn, email)
+
+    def load_user_workouts(self, user_id: int, from_date=None, to_date=None) -> list:
+        """
+        כל האימונים של המשתמש (מהחדש לישן) עם התרגילים שלהם - שאילתה אחת.
+        משתמש שלא קיים / בלי אימונים -> []
+        """
+        with self.engine.connect() as conn:
+            return self._load_user_workouts(conn, user_id, from_date, to_date)
+
+    def load_user_batch(self, user_id: int, from_date=None, to_date=None) -> WorkoutBatch:
+        """
+        אותה שאילתה, אבל ישר לעמודות של WorkoutBatch (בלי אובייקט לכל שורה)
+        """
+        with self.engine.connect() as conn:
+            return self._load_user_batch(conn, user_id, from_date, to_date)
+
+    def user_total_volume(self, user_id: int) -> float:
+        """
+        SUM(sets * reps * weight) של כל האימונים של המשתמש - מחושב ב-DB
+        """
+        with self.engine.connect() as conn:
+            return self._user_total_volume(conn, user_id)
+
+    def create_workout(self, user_id: int, date, notes=None, exercise_rows=()) -> int:
+        """
+        מוסיף אימון + התרגילים שלו ומעדכן את user_stats - הכול בטרנזקציה אחת.
+        exercise_rows - מילונים עם exercise_id, sets, reps, weight.
+        מחזיר את ה-id של האימון.
+        """
+        with self.engine.begin() as conn:
+            return self._create_workout(conn, user_id, date, notes, exercise_rows)
+
+    def delete_workout(self, workout_id: int) -> bool:
+        """
+        מוחק אימון (והתרגילים שלו) ומוריד אותו מ-user_stats באותה טרנזקציה
+        """
+        with self.engine.begin() as conn:
+            return self._delete_workout(conn, workout_id)
+
+    def get_user_stats(self, user_id: int) -> dict:
+        with self.engine.connect() as conn:
+            return user_stats.get_user_stats(conn, user_id)
+
+
+class AsyncWorkoutRepository(_WorkoutQueries):
+    """
+    כמו WorkoutRepository, עם await. engine=None - ה-AsyncEngine המשותף
+    לפי settings.json (הדרייבר מומר לאסינכרוני ב-app/db.py)
+    """
+
+    def __init__(self, engine=None):
+        super().__init__()
+        self.engine = engine if engine is not None else get_async_engine()
+
+    async def _read(self, fn, *args):
+        async with self.engine.connect() as conn:
+            return await conn.run_sync(fn, *args)
+
+    async def _write(self, fn, *args):
+        async with self.engine.begin() as conn:
+            return await conn.run_sync(fn, *args)
+
+    async def get_user(self, user_id: int):
+        return await self._read(self._get_user, user_id)
+
+    async def get_user_by_email(self, email: str):
+        return await self._read(self._get_user_by_email, email)
+
+    async def load_user_workouts(self, user_id: int, from_date=None, to_date=None) -> list:
+        return await self._read(self._load_user_workouts, user_id, from_date, to_date)
+
+    async def load_user_batch(self, user_id: int, from_date=None, to_date=None) -> WorkoutBatch:
+        return await self._read(self._load_user_batch, user_id, from_date, to_date)
+
+    async def user_total_volume(self, user_id: int) -> float:
+        return await self._read(self._user_total_volume, user_id)
+
+    async def create_workout(self, user_id: int, date, notes=None, exercise_rows=()) -> int:
+        # רשימה לפני run_sync - exercise_rows יכול להיות generator
+        return await self._write(self._create_workout, user_id, date, notes, list(exercise_rows))
+
+    async def delete_workout(self, workout_id: int) -> bool:
+        return await self._write(self._delete_workout, workout_id)
+
+    async def get_user_stats(self, user_id: int) -> dict:
+        return await self._read(user_stats.get_user_stats, user_id)
+
+
+_repository = None
+_async_repository = None
+
+
+def get_repository() -> WorkoutRepository:
+    global _repository
+    if _repository is None:
+        _repository = WorkoutRepository()
+    return _repository
+
+
+def get_async_repository() -> AsyncWorkoutRepository:
+    global _async_repository
+    if _async_repository is None:
+        _async_repository = AsyncWorkoutRepository()
+    return _async_repository
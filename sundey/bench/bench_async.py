@@ -0,0 +1,87 @@
+"""
+בקשות לשנייה עם הרבה לקוחות במקביל:
+ex_tut_async (asyncio + AsyncSession) מול ex_tut (סינכרוני) ב-thread pool
+בגודל של ה-threadpool של FastAPI (40).
+
+כל "בקשה" = get_book_by_id על ספר אקראי. רץ על SQLite זמני (aiosqlite).
+book_cache מכובה (NullCache) בשני הצדדים - כל בקשה מגיעה ל-DB, אחרת
+המדידה היא של המטמון ולא של sync מול async.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_async.py [clients] [requests_per_client]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+TMP_DIR = tempfile.mkdtemp(prefix="bench_async_")
+os.environ["DB_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+import ex_tut  # noqa: E402
+import ex_tut_async  # noqa: E402
+from lookup_cache import NullCache  # noqa: E402
+
+BOOKS = 10_000
+THREADPOOL_SIZE = 40
+
+
+def seed():
+    rnd = random.Random(1)
+    rows = [
+        (f"Book {i}", f"Author {i % 300}", rnd.randint(1, 5000), round(rnd.uniform(1, 999), 2))
+        for i in range(BOOKS)
+    ]
+    ex_tut.init_db()
+    ex_tut.bulk_add_books(rows, chunk_size=2000)
+
+
+def run_sync(clients: int, per_client: int) -> float:
+    rnd = random.Random(2)
+    ids = [rnd.randint(1, BOOKS) for _ in range(clients * per_client)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as pool:
+        list(pool.map(ex_tut.get_book_by_id, ids))
+    return time.perf_counter() - start
+
+
+async def run_async(clients: int, per_client: int) -> float:
+    rnd = random.Random(2)
+
+    async def client():
+        for _ in range(per_client):
+            await ex_tut_async.get_book_by_id(rnd.randint(1, BOOKS))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return time.perf_counter() - start
+
+
+def main(clients: int, per_client: int):
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed()
+            ex_tut.set_book_cache(NullCache())
+            sync_seconds = run_sync(clients, per_client)
+            async_seconds = asyncio.run(run_async(clients, per_client))
+        total = clients * per_client
+        print(f"clients={clients} requests={total}")
+        print(f"sync (threads={THREADPOOL_SIZE}): {total / sync_seconds:8.0f} req/s")
+        print(f"async:              {total / async_seconds:8.0f} req/s")
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [200, 20][len(args):]))
@@ -0,0 +1,60 @@
+"""
+זמני טעינה של books.csv: פענוח CSV רגיל מול המטמון הבינארי (csv_cache).
+
+cold  - אין מטמון: פענוח ה-CSV + כתיבת המטמון
+warm  - המטמון תקף: קריאה מהקובץ הממופה (mmap) לרשומות
+open  - רק פתיחת המטמון וסכום עמודת המחירים, בלי ליצור מילונים
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_csv_cache.py [rows]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import csv_cache  # noqa: E402
+import ex_csv  # noqa: E402
+from bench_csv_memory import write_catalog  # noqa: E402
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "books.csv"
+        write_catalog(path, rows)
+        cache_file = csv_cache.cache_path_for(path)
+
+        def cold():
+            cache_file.unlink(missing_ok=True)
+            ex_csv.load_books(path, use_cache=True)
+
+        def open_only():
+            with csv_cache.open_cache(path) as cache:
+                sum(cache.prices)
+
+        results = {
+            "csv": timed(lambda: ex_csv.load_books(path, use_cache=False)),
+            "cold": timed(cold),
+            "warm": timed(lambda: ex_csv.load_books(path, use_cache=True)),
+            "open": timed(open_only),
+        }
+        print(f"rows={rows}  csv={path.stat().st_size / 1e6:.1f}MB  cache={cache_file.stat().st_size / 1e6:.1f}MB")
+        for name, seconds in results.items():
+            print(f"{name:>5}: {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,98 @@
+"""
+מדידת זיכרון שיא (peak RSS) של מעבר על books.csv כפונקציה של גודל הקובץ:
+iter_books (זורם) מול load_books (טוען הכול).
+
+בדיקה: על הקובץ הגדול ביותר, שיא ההקצאות של פייתון (tracemalloc) בזמן
+מעבר עם iter_books חייב להיות מתחת לגבול קבוע שלא תלוי בגודל הקובץ.
+יוצא עם קוד 1 אם הגבול נחצה או שמספר השורות לא תואם.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_csv_memory.py
+"""
+import csv
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import ex_csv  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+# שיא tracemalloc מותר (בתים) - load_books על מיליון שורות צריך ~400MB
+PEAK_LIMITS = {"stream": 1024 * 1024, "chunks": 4 * 1024 * 1024}
+
+
+def write_catalog(path: Path, rows: int):
+    with path.open(mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(ex_csv.FIELDNAMES)
+        for i in range(1, rows + 1):
+            writer.writerow([i, f"Title {i}", f"Author {i % 997}", 100 + i % 900, 10 + i % 500])
+
+
+def peak_rss_kb() -> int:
+    # ב-Linux ru_maxrss נמדד ב-KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode: str, path: str, trace: bool = False):
+    if trace:
+        tracemalloc.start()
+    if mode == "stream":
+        count = sum(1 for _ in ex_csv.iter_books(path=path))
+    elif mode == "chunks":
+        count = sum(len(c) for c in ex_csv.iter_books(chunk_size=1000, path=path))
+    else:
+        count = len(ex_csv.load_books(path))
+    traced_peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    print(count, peak_rss_kb(), traced_peak)
+
+
+def measure(mode: str, path: Path, trace: bool = False):
+    """
+    (מספר שורות, peak RSS ב-KB, שיא tracemalloc בבתים - 0 בלי trace)
+    """
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(path)] + (["--trace"] if trace else []),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return int(out[0]), int(out[1]), int(out[2])
+
+
+def main() -> int:
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>10} {'file MB':>8} {'stream KB':>10} {'chunks KB':>10} {'load KB':>10}")
+        for rows in SIZES:
+            path = Path(tmp) / f"books_{rows}.csv"
+            write_catalog(path, rows)
+            size_mb = path.stat().st_size / 1024 / 1024
+            results = [measure(mode, path)[1] for mode in ("stream", "chunks", "load")]
+            print(f"{rows:>10} {size_mb:>8.1f} {results[0]:>10} {results[1]:>10} {results[2]:>10}")
+
+        # path - הקובץ הגדול ביותר
+        for mode, limit in PEAK_LIMITS.items():
+            count, _, traced_peak = measure(mode, path, trace=True)
+            ok = count == SIZES[-1] and traced_peak < limit
+            failed += not ok
+            print(f"{mode:<7} tracemalloc peak {traced_peak / 1024:8.0f} KB"
+                  f" (גבול {limit // 1024} KB, {count} שורות) {'OK' if ok else 'FAIL'}")
+
+    if failed:
+        print(f"{failed} בדיקות נכשלו.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) in (4, 5) and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], trace=sys.argv[4:] == ["--trace"])
+    else:
+        sys.exit(main())
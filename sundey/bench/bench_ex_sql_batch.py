@@ -0,0 +1,67 @@
+"""
+ex_sql: הוספת ספרים בלולאה של add_book (Session + commit + refresh לכל ספר)
+מול add_books_batched (Session אחד, commit לכל batch).
+
+רץ על SQLite זמני (קובץ, כדי שה-commit יגיע לדיסק) במקום ה-MySQL.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_ex_sql_batch.py [rows]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# ה-engine של המודול נוצר לפי DB_URL (בשימוש הראשון)
+TMP_DIR = tempfile.mkdtemp(prefix="bench_ex_sql_batch_")
+os.environ["DB_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+from sqlmodel import SQLModel, create_engine  # noqa: E402
+
+import ex_sql  # noqa: E402
+
+
+def rows(n: int):
+    return [(f"Book {i}", f"Author {i % 100}", 100 + i % 400, 10.0 + i % 90) for i in range(n)]
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def main(n: int):
+    data = rows(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        cases = {
+            "loop add_book": lambda: [ex_sql.add_book(*r) for r in data],
+            "batched 100": lambda: ex_sql.add_books_batched(data, 100),
+            "batched 1000": lambda: ex_sql.add_books_batched(data, 1000),
+            "batched 1000 +ids": lambda: ex_sql.add_books_batched(data, 1000, return_ids=True),
+        }
+        for i, (name, fn) in enumerate(cases.items()):
+            # DB נפרד לכל מקרה - מחליפים את ה-engine של המודול
+            engine = create_engine(f"sqlite:///{tmp}/bench_{i}.db")
+            SQLModel.metadata.create_all(engine)
+            ex_sql._engine = lambda engine=engine: engine
+            results[name] = timed(fn)
+
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+    print(f"rows={n}")
+    for name, seconds in results.items():
+        print(f"{name:>20}: {seconds:8.2f}s  {n / seconds:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
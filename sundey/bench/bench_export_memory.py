@@ -0,0 +1,95 @@
+"""
+זיכרון שיא (peak RSS) של ייצוא האימונים של משתמש ל-CSV כפונקציה של
+מספר השורות: export_user_workouts_to_csv (זורם, batches) מול fetchall
+וכתיבה (טוען הכול). הזיכרון של הזורם אמור להישאר קבוע.
+
+רץ על SQLite זמני; כל מדידה בתהליך נפרד.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_export_memory.py
+"""
+import csv
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+from app import export  # noqa: E402
+from app.tables import exercises, metadata, users, workout_exercises, workouts  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+PER_WORKOUT = 10
+
+
+def seed(db_path: str, rows: int):
+    rnd = random.Random(5)
+    engine = create_engine(f"sqlite:///{db_path}")
+    metadata.create_all(engine)
+    start = date(2015, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(users).values(id=1, full_name="Power User", email="p@example.com", join_date=start))
+        conn.execute(insert(exercises), [
+            {"id": i, "name": f"Exercise {i}", "muscle_group": "Legs"} for i in range(1, 31)
+        ])
+        for first in range(0, rows // PER_WORKOUT, 10_000):
+            ids = range(first + 1, min(first + 10_000, rows // PER_WORKOUT) + 1)
+            conn.execute(insert(workouts), [
+                {"id": w, "user_id": 1, "date": start + timedelta(days=w % 3650), "notes": "session"} for w in ids
+            ])
+            conn.execute(insert(workout_exercises), [
+                {"workout_id": w, "exercise_id": rnd.randint(1, 30), "sets": 3, "reps": 10, "weight": 42.5}
+                for w in ids for _ in range(PER_WORKOUT)
+            ])
+    engine.dispose()
+
+
+def child(mode: str, db_path: str, out: str):
+    engine = create_engine(f"sqlite:///{db_path}")
+    if mode == "stream":
+        count = export.export_user_workouts_to_csv(1, out, engine=engine)
+    else:
+        with engine.connect() as conn:
+            rows = conn.execute(export._export_query(1)).all()
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(export.EXPORT_FIELDS)
+            writer.writerows(tuple(r) + (r.sets * r.reps * r.weight,) for r in rows)
+        count = len(rows)
+    # ב-Linux ru_maxrss נמדד ב-KB
+    print(count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main():
+    tmp = Path(tempfile.mkdtemp(prefix="bench_export_"))
+    try:
+        print(f"{'rows':>10} {'stream MB':>10} {'fetchall MB':>12}")
+        for rows in SIZES:
+            db_path = str(tmp / f"w{rows}.db")
+            seed(db_path, rows)
+            peaks = []
+            for mode in ("stream", "all"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", mode, db_path, str(tmp / "out.csv")],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                assert int(out[0]) == rows
+                peaks.append(int(out[1]) / 1024)
+            print(f"{rows:>10} {peaks[0]:>10.1f} {peaks[1]:>12.1f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(*sys.argv[2:5])
+    else:
+        main()
@@ -0,0 +1,115 @@
+"""
+קצב הייבוא של app/import_pipeline.py לפי מספר התהליכים לפענוח.
+
+- serial: DictReader + ולידציה לרשימה אחת (כמו load_books), להשוואה
+- check: רק reader + פענוח במקביל (בלי DB) - כאן רואים את הסקיילינג
+- write: הכול כולל INSERT ל-SQLite זמני (ה-writer הוא צוואר בקבוק
+  יחיד, לכן הסקיילינג כאן נמוך יותר)
+
+0.1% מהשורות לא תקינות, ובודקים שכולן נספרות ב-failed.
+לקובץ של כמה GB:  --rows 40000000
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_import_pipeline.py [--rows 1000000] [--workers 0,1,2,4]
+"""
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from catalog import generate_books  # noqa: E402
+from app import import_pipeline  # noqa: E402
+
+FIELDS = ["id", "title", "author", "pages", "price", "isbn"]
+BAD_EVERY = 1000
+
+
+def write_csv(path: Path, rows: int) -> int:
+    bad = 0
+    with path.open("w", newline="", encoding="utf-8", buffering=1024 * 1024) as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for i, b in enumerate(generate_books(rows), start=1):
+            if i % BAD_EVERY == 0:
+                b["price"] = "free"
+                bad += 1
+            writer.writerow([i, b["title"], b["author"], b["pages"], b["price"], b["isbn"]])
+    return bad
+
+
+def serial(path: Path) -> dict:
+    started = time.perf_counter()
+    books, failed = [], 0
+    with path.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                books.append(import_pipeline.parse_book(row))
+            except ValueError:
+                failed += 1
+    return {"rows_read": len(books) + failed, "failed": failed, "seconds": time.perf_counter() - started}
+
+
+def report(label, workers, stats, mb, base):
+    rate = stats["rows_read"] / stats["seconds"]
+    speedup = f"{base / stats['seconds']:.2f}x" if base else "-"
+    print(f"{label:<8} {workers:>7} {rate:>12,.0f} {mb / stats['seconds']:>8.1f} {speedup:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", default=None, help="למשל 0,1,2,4")
+    args = parser.parse_args()
+    cpus = os.cpu_count() or 1
+    workers_list = (
+        [int(w) for w in args.workers.split(",")] if args.workers
+        else sorted({0, 1, 2, 4, cpus})
+    )
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_import_"))
+    try:
+        path = tmp / "books.csv"
+        bad = write_csv(path, args.rows)
+        mb = path.stat().st_size / 1024 / 1024
+        print(f"{args.rows:,} שורות, {mb:,.0f}MB, {cpus} CPUs")
+        print(f"{'mode':<8} {'workers':>7} {'rows/s':>12} {'MB/s':>8} {'speedup':>8}")
+
+        stats = serial(path)
+        assert stats["failed"] == bad
+        report("serial", "-", stats, mb, None)
+
+        base = None
+        for workers in workers_list:
+            stats = import_pipeline.import_csv(path, "books", None, workers=workers)
+            assert stats["failed"] == bad and stats["rows_read"] == args.rows
+            base = base or stats["seconds"]
+            report("check", workers, stats, mb, base)
+
+        # books נוצרת ע"י ex_tut.init_db על ה-DB_URL הזמני
+        os.environ["DB_URL"] = f"sqlite:///{tmp / 'books.db'}"
+        import ex_tut
+
+        ex_tut.init_db()
+        engine = ex_tut._engine()
+
+        base = None
+        for workers in workers_list:
+            with engine.begin() as conn:
+                conn.exec_driver_sql("DELETE FROM books")
+            stats = import_pipeline.import_csv(path, "books", engine, workers=workers)
+            assert stats["failed"] == bad and stats["inserted"] == args.rows - bad
+            base = base or stats["seconds"]
+            report("write", workers, stats, mb, base)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
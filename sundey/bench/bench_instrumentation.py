@@ -0,0 +1,80 @@
+"""
+התקורה של instrumentation.py: אותן פונקציות של ex_tut כשהמדידה כבויה
+ומופעלת (המטמון כבוי כדי שכל קריאה תגיע ל-DB).
+
+רץ על SQLite זמני במקום ה-MySQL של ex_tut.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_instrumentation.py [rows]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# ה-engine של המודול נוצר לפי DB_URL (בשימוש הראשון)
+TMP_DIR = tempfile.mkdtemp(prefix="bench_instrumentation_")
+os.environ["DB_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+import ex_tut  # noqa: E402
+import instrumentation  # noqa: E402
+from catalog import generate_books, sample_ids  # noqa: E402
+from lookup_cache import NullCache  # noqa: E402
+
+CALLS = 3000
+REPEAT = 5
+
+
+def workload(ids):
+    for i, book_id in enumerate(ids):
+        ex_tut.get_book_by_id(book_id)
+        if i % 10 == 0:
+            ex_tut.count_books()
+            ex_tut.get_books_after(None, 20, "price")
+
+
+def best_of(ids) -> float:
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            workload(ids)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(rows: int):
+    try:
+        ex_tut.init_db()
+        ex_tut.bulk_add_books(generate_books(rows), chunk_size=5000)
+        ex_tut.set_book_cache(NullCache())
+        ids = sample_ids(rows, CALLS)
+
+        instrumentation.disable()
+        off = best_of(ids)
+        instrumentation.enable(threshold_ms=5)
+        on = best_of(ids)
+
+        snap = instrumentation.snapshot()
+        print(f"rows={rows} calls={CALLS} (best of {REPEAT})")
+        print(f"disabled: {off * 1000:8.1f} ms")
+        print(f"enabled:  {on * 1000:8.1f} ms  overhead {(on / off - 1) * 100:+.1f}%")
+        print(f"fingerprints={len(snap['queries'])} slow={len(snap['slow_queries'])} "
+              f"checkouts={snap['checkouts']}")
+        for name, stats in sorted(snap["functions"].items()):
+            print(f"  {name:<20} n={stats['count']:<6} p50={stats['p50_ms']} p99={stats['p99_ms']}")
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
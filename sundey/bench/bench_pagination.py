@@ -0,0 +1,111 @@
+"""
+השוואת זמן שליפת דף לפי עומק הדף:
+get_books_page (offset/limit) מול get_books_after (keyset / cursor).
+
+רץ על SQLite זמני במקום ה-MySQL של ex_tut.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_pagination.py [rows]
+"""
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# ה-engine של המודול נוצר לפי DB_URL (בשימוש הראשון)
+TMP_DIR = tempfile.mkdtemp(prefix="bench_pagination_")
+os.environ["DB_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+
+import ex_tut  # noqa: E402
+
+PAGE_SIZE = 20
+DEPTHS = [1, 100, 1_000, 5_000, 9_000]
+REPEAT = 5
+
+
+def seed(rows: int):
+    rnd = random.Random(42)
+    batch = []
+    ex_tut.init_db()
+    with ex_tut._engine().begin() as conn:
+        for i in range(rows):
+            batch.append(
+                {
+                    "title": f"Book {i}",
+                    "author": f"Author {i % 1000}",
+                    "pages": rnd.randint(1, 5000),
+                    "price": round(rnd.uniform(0.01, 999.99), 2),
+                    "in_stock": True,
+                    "created_at": ex_tut.datetime.now(),
+                }
+            )
+            if len(batch) == 5000:
+                conn.execute(insert(ex_tut.Book), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(ex_tut.Book), batch)
+
+
+def cursor_at(position: int, order_by: str) -> str:
+    """
+    ה-cursor שמצביע על השורה ה-position בסדר המיון (הכנה, לא נמדד)
+    """
+    names = ex_tut.SEEK_ORDERS[order_by]
+    columns = [getattr(ex_tut.Book, n) for n in names]
+    with Session(ex_tut._engine()) as session:
+        row = session.exec(
+            select(*columns).order_by(*columns).offset(position - 1).limit(1)
+        ).one()
+    values = list(row) if len(names) > 1 else [row]
+    return ex_tut._encode_cursor(order_by, False, values)
+
+
+def best_of(fn) -> float:
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main(rows: int):
+    try:
+        seed(rows)
+
+        print(f"rows={rows} page_size={PAGE_SIZE}  (ms, best of {REPEAT})")
+        print(f"{'page':>8} {'offset':>10} {'seek id':>10} {'seek price':>11}")
+        for page in DEPTHS:
+            if page * PAGE_SIZE > rows:
+                break
+            position = (page - 1) * PAGE_SIZE
+            offset_ms = best_of(lambda: ex_tut.get_books_page(page, PAGE_SIZE))
+            if position == 0:
+                id_cursor = price_cursor = None
+            else:
+                id_cursor = cursor_at(position, "id")
+                price_cursor = cursor_at(position, "price")
+            seek_ms = best_of(lambda: ex_tut.get_books_after(id_cursor, PAGE_SIZE))
+            price_ms = best_of(
+                lambda: ex_tut.get_books_after(price_cursor, PAGE_SIZE, "price")
+            )
+            print(f"{page:>8} {offset_ms:>10.2f} {seek_ms:>10.2f} {price_ms:>11.2f}")
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
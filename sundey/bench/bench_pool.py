@@ -0,0 +1,68 @@
+"""
+בדיקת עומס על ה-pool של app/db.py: הרבה threads במקביל, כל אחד מחזיק
+חיבור לזמן קצר (מדמה שאילתה של כמה ms), עם גדלי pool שונים.
+מדפיס תפוקה וזמן המתנה לחיבור פנוי לפי מוני ה-pool.
+
+ברירת מחדל: SQLite זמני. אפשר להריץ מול DB אמיתי עם DB_URL.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_pool.py [threads] [queries_per_thread]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.db import create_engine_from_settings, engine_settings, pool_metrics  # noqa: E402
+
+POOL_SIZES = [1, 2, 5, 10, 20]
+HOLD_SECONDS = 0.005
+
+
+def run(engine, threads: int, per_thread: int) -> float:
+    def worker():
+        for _ in range(per_thread):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                time.sleep(HOLD_SECONDS)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start
+
+
+def main(threads: int, per_thread: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = engine_settings()
+        if not os.environ.get("DB_URL"):
+            settings["db_url"] = f"sqlite:///{tmp}/bench.db"
+
+        print(f"threads={threads} queries/thread={per_thread} hold={HOLD_SECONDS * 1000:.0f}ms")
+        print(f"{'pool':>5} {'q/s':>8} {'wait avg ms':>12} {'wait max ms':>12} {'peak':>5} {'connects':>9}")
+        for size in POOL_SIZES:
+            settings.update(db_pool_size=size, db_max_overflow=0)
+            engine = create_engine_from_settings(settings)
+            seconds = run(engine, threads, per_thread)
+            m = pool_metrics(engine)
+            engine.dispose()
+            print(
+                f"{size:>5} {threads * per_thread / seconds:>8.0f} "
+                f"{m['wait_avg'] * 1000:>12.2f} {m['wait_max'] * 1000:>12.2f} "
+                f"{m['peak_checked_out']:>5} {m['connects']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [32, 50][len(args):]))
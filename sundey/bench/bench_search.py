@@ -0,0 +1,69 @@
+"""
+חיפוש חלקי בכותרות: LIKE '%kw%' (SQLite בזיכרון) מול אינדקס ה-trigrams
+של search_index.py, על קורפוס סינתטי של כותרות באנגלית ובעברית.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_search.py [titles]
+"""
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from search_index import TrigramIndex  # noqa: E402
+
+WORDS = (
+    "harry potter ring lord shadow night river stone garden winter city "
+    "הארי פוטר שר הטבעות אורוול ספר אהבה מלחמה שלום ים לילה עיר גן חורף אבן"
+).split()
+KEYWORDS = ["potter", "הטבעות", "winter gar", "ים ל", "zzz"]
+REPEAT = 3
+
+
+def corpus(n: int):
+    rnd = random.Random(7)
+    for i in range(n):
+        yield i + 1, " ".join(rnd.choices(WORDS, k=rnd.randint(2, 5))) + f" {i}"
+
+
+def best_of(fn):
+    best, result = None, None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main(n: int):
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT)")
+    db.executemany("INSERT INTO books VALUES (?, ?)", corpus(n))
+
+    start = time.perf_counter()
+    index = TrigramIndex()
+    for doc_id, title in corpus(n):
+        index.add(doc_id, title)
+    build = time.perf_counter() - start
+
+    print(f"titles={n}  index build={build:.1f}s")
+    print(f"{'keyword':>12} {'LIKE ms':>10} {'index ms':>10} {'hits':>8}")
+    for kw in KEYWORDS:
+        like_ms, like_rows = best_of(
+            lambda: db.execute(
+                "SELECT id FROM books WHERE title LIKE ?", (f"%{kw}%",)
+            ).fetchall()
+        )
+        index_ms, ids = best_of(lambda: index.search(kw))
+        # LIKE של SQLite לא מתעלם מרישיות בעברית, אבל כאן המילים כבר באותיות קטנות
+        assert len(ids) == len(like_rows), (kw, len(ids), len(like_rows))
+        print(f"{kw:>12} {like_ms:>10.1f} {index_ms:>10.1f} {len(ids):>8}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,76 @@
+"""
+זמן עלייה: מ-import של המודול עד שהשאילתה הראשונה חוזרת.
+
+כל מדידה בתהליך Python חדש (import קר):
+- import: זמן ה-import בלבד (בלי engine ובלי DDL)
+- first query: init_db לא נמדד (הטבלה כבר קיימת), רק count_books הראשון
+  - כולל יצירת ה-engine והחיבור הראשון
+- no db: import כשה-DB לא זמין (פורט סגור) - חייב להצליח
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_startup.py [repeat]
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = {
+    "ex_tut": "mod.count_books()",
+    "ex_sql": "mod.count_books()",
+    "ex_tut_async": "asyncio.run(mod.count_books())",
+}
+
+CHILD = """
+import asyncio, contextlib, importlib, io, sys, time
+t0 = time.perf_counter()
+mod = importlib.import_module(sys.argv[1])
+t1 = time.perf_counter()
+if sys.argv[2] == "query":
+    with contextlib.redirect_stdout(io.StringIO()):
+        {query}
+t2 = time.perf_counter()
+print((t1 - t0) * 1000, (t2 - t1) * 1000)
+"""
+
+
+def run(module: str, mode: str, db_url: str) -> tuple:
+    env = dict(os.environ, DB_URL=db_url)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(query=MODULES[module]), module, mode],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout.split()
+    return float(out[0]), float(out[1])
+
+
+def main(repeat: int):
+    tmp = Path(tempfile.mkdtemp(prefix="bench_startup_"))
+    try:
+        print(f"{'module':<14} {'import ms':>10} {'first query ms':>15} {'total ms':>9} {'no db':>6}")
+        for module in MODULES:
+            db_url = f"sqlite:///{tmp / (module + '.db')}"
+            # הכנה: יצירת הטבלה (לא נמדד). ex_tut_async משתמש בטבלה של ex_tut
+            setup = "ex_tut" if module == "ex_tut_async" else module
+            subprocess.run(
+                [sys.executable, "-c", f"import {setup}; {setup}.init_db()"],
+                cwd=ROOT, env=dict(os.environ, DB_URL=db_url), check=True,
+            )
+            samples = [run(module, "query", db_url) for _ in range(repeat)]
+            imports = statistics.median(s[0] for s in samples)
+            queries = statistics.median(s[1] for s in samples)
+            try:
+                run(module, "import", "mysql+pymysql://root@127.0.0.1:1/none")
+                no_db = "OK"
+            except subprocess.CalledProcessError:
+                no_db = "FAIL"
+            print(f"{module:<14} {imports:>10.1f} {queries:>15.1f} {imports + queries:>9.1f} {no_db:>6}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
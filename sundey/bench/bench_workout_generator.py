@@ -0,0 +1,89 @@
+"""
+מדידה של app/workout_generator מול היעד של 10M שורות workout_exercises:
+load() ל-SQLite זמני ו-write_csv() לתיקייה זמנית, עם ספירת שורות בפועל
+ב-DB, בדיקת user_stats.verify אחרי הטעינה, וקצב (שורות/שנייה) + הערכה
+לזמן של 10M בקצב הזה.
+
+ברירת המחדל קטנה (~1M שורות). ריצה מלאה של 10M:
+    python bench/bench_workout_generator.py 10000000
+
+יוצא עם קוד 1 אם מספר השורות לא תואם או ש-user_stats לא תואם.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_workout_generator.py [target_rows]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+
+from app import user_stats, workout_generator  # noqa: E402
+from app.tables import metadata, users, workout_exercises, workouts  # noqa: E402
+
+TARGET = 10_000_000
+WORKOUTS_PER_USER = 100
+EXERCISES_PER_WORKOUT = (3, 8)
+
+
+def users_for(rows: int) -> int:
+    per_user = WORKOUTS_PER_USER * sum(EXERCISES_PER_WORKOUT) / 2
+    return max(1, round(rows / per_user))
+
+
+def main(rows: int) -> int:
+    users_count = users_for(rows)
+    tmp = Path(tempfile.mkdtemp(prefix="bench_generator_"))
+    failed = 0
+    try:
+        engine = create_engine(f"sqlite:///{tmp / 'bench.db'}")
+        metadata.create_all(engine)
+        counts = workout_generator.load(
+            engine, users_count, WORKOUTS_PER_USER, EXERCISES_PER_WORKOUT, seed=1
+        )
+        with engine.connect() as conn:
+            actual = {
+                t.name: conn.execute(select(func.count()).select_from(t)).scalar_one()
+                for t in (users, workouts, workout_exercises)
+            }
+            problems = user_stats.verify(conn)
+        engine.dispose()
+
+        loaded = counts["workout_exercises"]
+        rate = loaded / counts["seconds"]
+        print(f"users={users_count} workout_exercises={loaded}")
+        print(f"load (SQLite):  {counts['seconds']:7.1f}s  {rate:10.0f} rows/s"
+              f"  -> 10M בערך {TARGET / rate:6.0f}s")
+        mismatch = {name: (counts[name], n) for name, n in actual.items() if counts[name] != n}
+        if mismatch:
+            failed += 1
+            print(f"FAIL ספירת שורות ב-DB לא תואמת (צפוי, בפועל): {mismatch}")
+        if problems:
+            failed += 1
+            print(f"FAIL user_stats: {len(problems)} הבדלים, למשל {problems[:3]}")
+
+        start = time.perf_counter()
+        workout_generator.write_csv(
+            tmp / "csv", users_count, WORKOUTS_PER_USER, EXERCISES_PER_WORKOUT, seed=1
+        )
+        seconds = time.perf_counter() - start
+        print(f"write_csv:      {seconds:7.1f}s  {loaded / seconds:10.0f} rows/s"
+              f"  -> 10M בערך {TARGET * seconds / loaded:6.0f}s")
+        sql = (tmp / "csv" / "load_data.sql").read_text(encoding="utf-8")
+        if "INSERT INTO user_stats" not in sql or "INSERT INTO user_muscle_stats" not in sql:
+            failed += 1
+            print("FAIL load_data.sql בלי חישוב מחדש של user_stats")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("OK" if not failed else f"{failed} בדיקות נכשלו.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
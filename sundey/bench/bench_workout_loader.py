@@ -0,0 +1,110 @@
+"""
+טעינת כל האימונים של משתמש: N+1 (שאילתה לאימונים, ואז שאילתה לתרגילים
+של כל אימון ולכל תרגיל) מול WorkoutRepository (JOIN אחד) מול SUM ב-SQL.
+
+רץ על SQLite זמני במקום ה-MySQL של workout_manager.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_workout_loader.py [workouts_per_user]
+"""
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, event, insert, select  # noqa: E402
+
+from app.models import Exercise, User, Workout, WorkoutExercise  # noqa: E402
+from app.tables import exercises, metadata, users, workout_exercises, workouts  # noqa: E402
+from app.workout_repository import WorkoutRepository  # noqa: E402
+
+USERS = 20
+EXERCISES_PER_WORKOUT = 5
+GROUPS = ["Chest", "Back", "Legs", "Shoulders", "Arms"]
+
+
+def seed(engine, per_user: int):
+    rnd = random.Random(3)
+    start = date(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(exercises), [
+            {"id": i, "name": f"Exercise {i}", "muscle_group": GROUPS[i % len(GROUPS)]} for i in range(1, 41)
+        ])
+        conn.execute(insert(users), [
+            {"id": u, "full_name": f"User {u}", "email": f"user{u}@example.com", "join_date": start}
+            for u in range(1, USERS + 1)
+        ])
+        w_rows, we_rows = [], []
+        workout_id = 1
+        for u in range(1, USERS + 1):
+            for _ in range(per_user):
+                w_rows.append({"id": workout_id, "user_id": u, "date": start + timedelta(days=rnd.randrange(365)), "notes": None})
+                for e in rnd.sample(range(1, 41), EXERCISES_PER_WORKOUT):
+                    we_rows.append({"workout_id": workout_id, "exercise_id": e, "sets": rnd.randint(1, 5),
+                                    "reps": rnd.randint(1, 12), "weight": rnd.randint(0, 200) / 2})
+                workout_id += 1
+        conn.execute(insert(workouts), w_rows)
+        conn.execute(insert(workout_exercises), we_rows)
+
+
+def n_plus_one(engine, user_id: int) -> float:
+    with engine.connect() as conn:
+        u = conn.execute(select(users).where(users.c.id == user_id)).first()
+        user = User(u.id, u.full_name, u.email, u.join_date)
+        total = 0
+        for w in conn.execute(select(workouts).where(workouts.c.user_id == user_id)).all():
+            workout = Workout(w.id, user, w.date, w.notes)
+            for we in conn.execute(select(workout_exercises).where(workout_exercises.c.workout_id == w.id)).all():
+                e = conn.execute(select(exercises).where(exercises.c.id == we.exercise_id)).first()
+                workout.add_exercise(WorkoutExercise(Exercise(e.id, e.name, e.muscle_group), we.sets, we.reps, we.weight))
+            total += workout.total_workout_volume()
+    return total
+
+
+def timed(engine, fn):
+    counter = {"n": 0}
+
+    def count(*args):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    event.remove(engine, "before_cursor_execute", count)
+    return result, elapsed, counter["n"]
+
+
+def main(per_user: int):
+    tmp = tempfile.mkdtemp(prefix="bench_workout_loader_")
+    try:
+        engine = create_engine(f"sqlite:///{tmp}/workouts.db")
+        metadata.create_all(engine)
+        seed(engine, per_user)
+        repo = WorkoutRepository(engine)
+
+        cases = {
+            "N+1": lambda: n_plus_one(engine, 1),
+            "joined": lambda: sum(w.total_workout_volume() for w in repo.load_user_workouts(1)),
+            "joined batch": lambda: repo.load_user_batch(1).total_volume(),
+            "SQL SUM": lambda: repo.user_total_volume(1),
+        }
+        print(f"workouts={per_user} rows={per_user * EXERCISES_PER_WORKOUT} (user 1)")
+        expected = None
+        for name, fn in cases.items():
+            total, ms, queries = timed(engine, fn)
+            expected = total if expected is None else expected
+            assert abs(total - expected) < 1e-6 * max(1, expected), name
+            print(f"{name:<14} {ms:9.1f} ms  queries={queries:<6} volume={total:.1f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
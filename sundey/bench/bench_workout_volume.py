@@ -0,0 +1,80 @@
+"""
+חישוב volume על הרבה אימונים: לולאה על אובייקטי Workout (models.py)
+מול WorkoutBatch (עמודות NumPy), וזיכרון של שני הייצוגים.
+
+הרצה מתוך התיקייה sundey:
+    python bench/bench_workout_volume.py [users] [workouts_per_user]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.models import Exercise, User, Workout, WorkoutExercise  # noqa: E402
+from app.workout_batch import WorkoutBatch  # noqa: E402
+
+GROUPS = ["Chest", "Back", "Legs", "Shoulders", "Arms", "Core"]
+EXERCISES_PER_WORKOUT = 6
+
+
+def build_workouts(users: int, per_user: int) -> list:
+    rnd = random.Random(7)
+    exercises = [Exercise(i, f"Exercise {i}", GROUPS[i % len(GROUPS)]) for i in range(1, 61)]
+    start = date(2025, 1, 1)
+    workouts = []
+    workout_id = 1
+    for user_id in range(1, users + 1):
+        user = User(user_id, f"User {user_id}", f"user{user_id}@example.com", start)
+        for _ in range(per_user):
+            w = Workout(workout_id, user, start + timedelta(days=rnd.randrange(365)), None)
+            for e in rnd.sample(exercises, EXERCISES_PER_WORKOUT):
+                w.add_exercise(WorkoutExercise(e, rnd.randint(1, 5), rnd.randint(1, 15), rnd.randint(0, 200) / 2))
+            workouts.append(w)
+            workout_id += 1
+    return workouts
+
+
+def objects_by_user(workouts) -> dict:
+    totals = {}
+    for w in workouts:
+        totals[w.user.id] = totals.get(w.user.id, 0) + w.total_workout_volume()
+    return totals
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(users: int, per_user: int):
+    tracemalloc.start()
+    workouts = build_workouts(users, per_user)
+    objects_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    batch = WorkoutBatch.from_workouts(workouts)
+    batch_mb = tracemalloc.get_traced_memory()[0] / 2**20 - objects_mb
+    tracemalloc.stop()
+
+    loop, loop_ms = timed(lambda: objects_by_user(workouts))
+    _, batch_ms = timed(lambda: (setattr(batch, "_volume", None), batch.volume_by_user()))
+    vec = batch.volume_by_user()
+    assert all(abs(loop[k] - vec[k]) < 1e-6 * max(1, loop[k]) for k in loop)
+
+    rows = len(batch)
+    print(f"users={users} workouts={len(workouts)} rows={rows}")
+    print(f"memory: objects {objects_mb:8.1f} MB   batch {batch_mb:8.1f} MB")
+    print(f"volume by user: objects {loop_ms:8.1f} ms   batch {batch_ms:8.1f} ms")
+    _, ms = timed(batch.volume_by_muscle_group)
+    print(f"batch volume by muscle group: {ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 150,
+    )
@@ -0,0 +1,32 @@
+"""
+מחולל קטלוג ספרים סינתטי ודטרמיניסטי (אותו seed -> אותם ספרים)
+"""
+import random
+
+WORDS = (
+    "harry potter ring lord shadow night river stone garden winter city "
+    "empire secret silver storm dragon ocean letter house mountain "
+    "הארי פוטר שר הטבעות ספר אהבה מלחמה שלום ים לילה עיר גן חורף אבן"
+).split()
+AUTHORS = 2_000
+
+
+def generate_books(n: int, seed: int = 0):
+    """
+    מחזיר n מילונים עם title / author / pages / price / isbn
+    """
+    rnd = random.Random(seed)
+    for i in range(n):
+        title = " ".join(rnd.choices(WORDS, k=rnd.randint(1, 4))) + f" {i}"
+        yield {
+            "title": title,
+            "author": f"Author {rnd.randrange(AUTHORS)}",
+            "pages": rnd.randint(1, 5000),
+            "price": round(rnd.uniform(0.01, 999.99), 2),
+            "isbn": f"978{seed:03d}{i:010d}",
+        }
+
+
+def sample_ids(n: int, count: int, seed: int = 1):
+    rnd = random.Random(seed)
+    return [rnd.randint(1, n) for _ in range(count)]
@@ -0,0 +1,145 @@
+"""
+בדיקת התאמה לחוזה של BookRepository (book_repository.py) - אותו תרחיש
+על כל backend, כל אחד בתיקייה זמנית (sqlmodel על SQLite זמני דרך DB_URL).
+בסוף גם זמן שליפה לפי id (p50) לכל backend (ב-sqlmodel בלי book_cache).
+
+יוצא עם קוד 1 אם בדיקה כלשהי נכשלה.
+
+הרצה מתוך התיקייה sundey:
+    python bench/check_book_backends.py [csv,sqlmodel,sqlite,records]
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+TMP_DIR = tempfile.mkdtemp(prefix="check_book_backends_")
+os.environ["DB_URL"] = f"sqlite:///{TMP_DIR}/sqlmodel.db"
+
+import book_repository  # noqa: E402
+
+LOOKUPS = 2000
+
+
+def make(backend: str):
+    repo = book_repository.create_repository(
+        backend, csv_path=Path(TMP_DIR) / "books.csv", sqlite_path=Path(TMP_DIR) / "books.db",
+        records_path=Path(TMP_DIR) / "books.rec",
+    )
+    repo.init_db()
+    return repo
+
+
+def check_empty(repo, backend):
+    assert repo.count() == 0
+    assert repo.all() == []
+    assert repo.get(1) is None
+    assert repo.update_price(1, 10.0) is False
+    assert repo.delete(1) is False
+    assert repo.search("harry") == []
+
+
+def check_add_get(repo, backend):
+    book = repo.add("Harry Potter", "J. K. Rowling", 400, 79.9)
+    assert set(book) == set(book_repository.BOOK_FIELDS)
+    assert isinstance(book["id"], int)
+    assert repo.get(book["id"]) == book
+    other = repo.add("שר הטבעות", "טולקין", 600, 89.9)
+    assert other["id"] != book["id"]
+    assert repo.count() == 2
+    assert [b["id"] for b in repo.all()] == sorted([book["id"], other["id"]])
+
+
+def check_update_and_range(repo, backend):
+    cheap = repo.add("Cheap Book", "Author A", 100, 10.0)
+    tie = repo.add("Tie Book", "Author B", 120, 10.0)
+    assert repo.update_price(cheap["id"], 20.0) is True
+    assert repo.get(cheap["id"])["price"] == 20.0
+    assert repo.update_price(cheap["id"], 10.0) is True
+
+    in_range = repo.by_price(10.0, 79.9)
+    assert [b["price"] for b in in_range] == [10.0, 10.0, 79.9]
+    assert [b["id"] for b in in_range[:2]] == sorted([cheap["id"], tie["id"]])
+    assert [b["price"] for b in repo.by_price(min_price=80)] == [89.9]
+    assert len(repo.by_price()) == repo.count()
+
+
+def check_search(repo, backend):
+    assert [b["title"] for b in repo.search("HARRY")] == ["Harry Potter"]
+    assert [b["title"] for b in repo.search("טבעות")] == ["שר הטבעות"]
+    assert [b["title"] for b in repo.search("book")] == ["Cheap Book", "Tie Book"]
+    assert repo.search("   ") == []
+    assert repo.search("no such title") == []
+
+
+def check_delete(repo, backend):
+    book = repo.search("harry")[0]
+    before = repo.count()
+    assert repo.delete(book["id"]) is True
+    assert repo.get(book["id"]) is None
+    assert repo.delete(book["id"]) is False
+    assert repo.count() == before - 1
+    assert repo.search("harry") == []
+
+
+def check_persistence(repo, backend):
+    expected = repo.all()
+    fresh = make(backend)
+    try:
+        assert fresh.all() == expected
+    finally:
+        fresh.close()
+
+
+CHECKS = [check_empty, check_add_get, check_update_and_range, check_search, check_delete, check_persistence]
+
+
+def lookup_p50_ms(repo, backend) -> float:
+    if backend == "sqlmodel":
+        # בלי המטמון של ex_tut - מודדים את הדרך ל-DB
+        import ex_tut
+        from lookup_cache import NullCache
+
+        ex_tut.set_book_cache(NullCache())
+    ids = [repo.add(f"Book {i}", f"Author {i % 50}", 100 + i, 1.0 + i % 500)["id"] for i in range(500)]
+    rnd = random.Random(3)
+    samples = []
+    for _ in range(LOOKUPS):
+        start = time.perf_counter()
+        repo.get(rnd.choice(ids))
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main(backends):
+    failed = 0
+    try:
+        for backend in backends:
+            repo = make(backend)
+            for check in CHECKS:
+                try:
+                    check(repo, backend)
+                    status = "OK"
+                except AssertionError as e:
+                    failed += 1
+                    status = f"FAIL {e}"
+                print(f"{backend:<9} {check.__name__:<25} {status}")
+            print(f"{backend:<9} {'get p50':<25} {lookup_p50_ms(repo, backend):.3f} ms")
+            repo.close()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+    if failed:
+        print(f"{failed} בדיקות נכשלו.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1].split(",") if len(sys.argv) > 1 else book_repository.BACKENDS))
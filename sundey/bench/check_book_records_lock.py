@@ -0,0 +1,109 @@
+"""
+בדיקה של book_records.py עם כמה תהליכים על אותו books.rec:
+- מופע פתוח (כמו RecordBookRepository._file) אחרי import_csv מתהליך אחר:
+  קורא את הקובץ החדש, והכתיבות שלו (update_price / add) לא הולכות לאיבוד
+- כמה תהליכים מוסיפים ספרים במקביל: כל התוספות נשמרות, בלי id כפול,
+  ו-verify() נקי
+
+יוצא עם קוד 1 אם בדיקה כלשהי נכשלה.
+
+הרצה מתוך התיקייה sundey:
+    python bench/check_book_records_lock.py
+"""
+import shutil
+import subprocess
+import sys
+import tempfile
+from multiprocessing import Pool
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import ex_csv  # noqa: E402
+from book_records import BookRecordFile, import_csv  # noqa: E402
+
+BOOKS = 100
+WRITERS = 4
+ADDS_PER_WRITER = 500
+
+
+def write_csv(csv_path: Path, price: float):
+    ex_csv.save_books(
+        [{"id": i, "title": f"Book {i}", "author": f"Author {i % 10}", "pages": 100 + i, "price": price}
+         for i in range(1, BOOKS + 1)],
+        path=csv_path,
+    )
+
+
+def check_import_from_other_process(tmp: Path) -> list:
+    rec_path, csv_path = tmp / "import.rec", tmp / "import.csv"
+    write_csv(csv_path, 10.0)
+    import_csv(csv_path, rec_path)
+    problems = []
+    with BookRecordFile(rec_path) as records:
+        records.get(1)
+        write_csv(csv_path, 20.0)
+        subprocess.run(
+            [sys.executable, "book_records.py", "import", str(csv_path), str(rec_path)],
+            cwd=ROOT, check=True, capture_output=True,
+        )
+        if records.get(2)["price"] != 20.0:
+            problems.append("המופע הפתוח קורא את הקובץ הישן")
+        records.update_price(1, 30.0)
+        added = records.add("After Import", "Someone", 10, 5.0)
+    with BookRecordFile(rec_path) as records:
+        book = records.get(1)
+        if book is None or book["price"] != 30.0:
+            problems.append(f"update_price אחרי import אבד: {book}")
+        if records.get(added["id"]) is None:
+            problems.append("add אחרי import אבד")
+        problems.extend(records.verify())
+    return problems
+
+
+def add_books(args):
+    rec_path, writer = args
+    with BookRecordFile(rec_path) as records:
+        return [records.add(f"W{writer} {i}", f"Writer {writer}", 10, 1.0)["id"]
+                for i in range(ADDS_PER_WRITER)]
+
+
+def check_concurrent_adds(tmp: Path) -> list:
+    rec_path = tmp / "adds.rec"
+    BookRecordFile(rec_path).close()
+    with Pool(WRITERS) as pool:
+        ids = [i for chunk in pool.map(add_books, [(str(rec_path), w) for w in range(WRITERS)]) for i in chunk]
+    problems = []
+    total = WRITERS * ADDS_PER_WRITER
+    if len(set(ids)) != total:
+        problems.append(f"{total - len(set(ids))} ids כפולים")
+    with BookRecordFile(rec_path) as records:
+        if len(records) != total:
+            problems.append(f"{len(records)} ספרים בקובץ במקום {total}")
+        titles = {b["title"] for b in records}
+        if len(titles) != total:
+            problems.append(f"{total - len(titles)} ספרים נדרסו")
+        problems.extend(records.verify())
+    return problems
+
+
+def main():
+    tmp = Path(tempfile.mkdtemp(prefix="check_book_records_lock_"))
+    failed = 0
+    try:
+        for check in (check_import_from_other_process, check_concurrent_adds):
+            problems = check(tmp)
+            failed += bool(problems)
+            print(f"{check.__name__:<34} {'OK' if not problems else 'FAIL ' + '; '.join(problems)}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if failed:
+        print(f"{failed} בדיקות נכשלו.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+בדיקה של app/import_pipeline.py על exercises.csv: ה-ids מהקובץ (לא רציפים)
+נשמרים כמו שהם ב-DB, כדי ש-workout_exercises.exercise_id ימשיכו להפנות
+לתרגיל הנכון. id לא תקין (0 / לא מספר) נספר ב-failed עם מספר השורה.
+רץ על SQLite זמני, עם ובלי תהליכים לפענוח.
+
+יוצא עם קוד 1 אם בדיקה כלשהי נכשלה.
+
+הרצה מתוך התיקייה sundey:
+    python bench/check_import_pipeline.py
+"""
+import csv
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, select  # noqa: E402
+
+from app import import_pipeline  # noqa: E402
+from app.logic import load_exercises_from_csv  # noqa: E402
+from app.tables import exercises, metadata  # noqa: E402
+
+IDS = [3, 7, 8, 42, 1000, 1001, 99999]
+BAD_ROWS = [("0", "Zero", "legs"), ("x", "NotNumber", "legs")]
+
+
+def write_csv(path: Path):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "muscle_group"])
+        for exercise_id in IDS:
+            writer.writerow([exercise_id, f"Exercise {exercise_id}", "chest"])
+        writer.writerows(BAD_ROWS)
+
+
+def check(tmp: Path, path: Path, workers: int) -> list:
+    engine = create_engine(f"sqlite:///{tmp / f'workers_{workers}.db'}")
+    metadata.create_all(engine)
+    # batch_size=3 - גם batch שלם וגם חבילה אחרונה חלקית
+    stats = import_pipeline.import_csv(path, "exercises", engine, workers=workers, batch_size=3)
+    with engine.connect() as conn:
+        rows = conn.execute(select(exercises.c.id, exercises.c.name).order_by(exercises.c.id)).all()
+    engine.dispose()
+
+    problems = []
+    if [r.id for r in rows] != IDS:
+        problems.append(f"ids ב-DB {[r.id for r in rows]} במקום {IDS}")
+    if any(r.name != f"Exercise {r.id}" for r in rows):
+        problems.append("שם לא תואם ל-id")
+    if stats["inserted"] != len(IDS) or stats["failed"] != len(BAD_ROWS):
+        problems.append(f"inserted={stats['inserted']} failed={stats['failed']}")
+    if sorted(line for line, _ in stats["errors"]) != [len(IDS) + 2, len(IDS) + 3]:
+        problems.append(f"שגיאות בשורות לא צפויות: {stats['errors']}")
+    return problems
+
+
+def main():
+    tmp = Path(tempfile.mkdtemp(prefix="check_import_"))
+    failed = 0
+    try:
+        path = tmp / "exercises.csv"
+        write_csv(path)
+        for workers in (0, 2):
+            problems = check(tmp, path, workers)
+            failed += bool(problems)
+            print(f"import workers={workers}: {'OK' if not problems else 'FAIL ' + '; '.join(problems)}")
+
+        # load_exercises_from_csv - אותו פענוח, בלי השורות הלא תקינות
+        good = tmp / "good.csv"
+        good.write_text("".join(path.read_text(encoding="utf-8").splitlines(True)[:len(IDS) + 1]),
+                        encoding="utf-8")
+        loaded = [e.id for e in load_exercises_from_csv(str(good))]
+        ok = loaded == IDS
+        failed += not ok
+        print(f"load_exercises_from_csv: {'OK' if ok else f'FAIL {loaded}'}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if failed:
+        print(f"{failed} בדיקות נכשלו.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+בדיקת עמידות לקריסה של book_records.py: תהליך בן מריץ פעולות אקראיות
+(add / update_price / set_in_stock / delete, ולפעמים import_csv) ונהרג
+ב-SIGKILL בזמן אקראי. אחרי כל הריגה פותחים את הקובץ מחדש ובודקים:
+- verify() לא מוצא בעיות
+- כל פעולה שהסתיימה (D ביומן) נמצאת בקובץ, והפעולה שהייתה באמצע
+  (B בלי D) הוחלה במלואה או לא הוחלה בכלל
+- import שנקטע: הקובץ הוא או המצב הקודם או כל ה-CSV החדש
+בסוף export_csv ל-books.csv והשוואה למצב הצפוי.
+
+הריגת תהליך בלבד - נפילת חשמל (דפים שלא נכתבו לדיסק) לא מדומה כאן.
+
+הרצה מתוך התיקייה sundey:
+    python bench/crash_book_records.py [rounds]
+"""
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import ex_csv  # noqa: E402
+from book_records import BookRecordFile, export_csv, import_csv  # noqa: E402
+
+INITIAL_BOOKS = 200
+
+
+def log(fd, entry):
+    os.write(fd, (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def child_ops(rec_path, log_path, seed):
+    rnd = random.Random(seed)
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+    with BookRecordFile(rec_path) as records:
+        while True:
+            op = rnd.choice(["add", "price", "price", "stock", "delete"])
+            book_id = rnd.randint(1, max(records.max_id, 1))
+            if op == "add":
+                entry = {"op": "add", "id": records.max_id + 1, "title": f"ספר {rnd.random():.6f}",
+                         "author": f"Author {rnd.randint(1, 50)}", "pages": rnd.randint(1, 5000),
+                         "price": round(rnd.uniform(0.01, 999.99), 2)}
+            elif op == "price":
+                entry = {"op": "price", "id": book_id, "price": round(rnd.uniform(0.01, 999.99), 2)}
+            elif op == "stock":
+                entry = {"op": "stock", "id": book_id, "in_stock": rnd.random() < 0.5}
+            else:
+                entry = {"op": "delete", "id": book_id}
+            log(fd, {"B": entry})
+            if op == "add":
+                records.add(entry["title"], entry["author"], entry["pages"], entry["price"])
+            elif op == "price":
+                records.update_price(book_id, entry["price"])
+            elif op == "stock":
+                records.set_in_stock(book_id, entry["in_stock"])
+            else:
+                records.delete(book_id)
+            log(fd, {"D": True})
+
+
+def child_import(rec_path, csv_path):
+    import_csv(csv_path, rec_path)
+    # נשאר חי עד ההריגה, כדי שלא נדע אם ההחלפה הסתיימה
+    time.sleep(60)
+
+
+def apply(state, entry):
+    state = dict(state)
+    book = state.get(entry["id"])
+    if entry["op"] == "add":
+        state[entry["id"]] = {k: entry[k] for k in ("id", "title", "author", "pages", "price")}
+        state[entry["id"]]["in_stock"] = True
+    elif book is None:
+        pass
+    elif entry["op"] == "price":
+        state[entry["id"]] = dict(book, price=entry["price"])
+    elif entry["op"] == "stock":
+        state[entry["id"]] = dict(book, in_stock=entry["in_stock"])
+    else:
+        del state[entry["id"]]
+    return state
+
+
+def read_log(log_path):
+    done, pending = [], None
+    for line in Path(log_path).read_text(encoding="utf-8").splitlines():
+        if not line.endswith("}"):
+            break  # שורה חצי כתובה
+        item = json.loads(line)
+        if "B" in item:
+            pending = item["B"]
+        elif pending is not None:
+            done.append(pending)
+            pending = None
+    return done, pending
+
+
+def snapshot(rec_path):
+    with BookRecordFile(rec_path) as records:
+        problems = records.verify()
+        return {b["id"]: b for b in records}, problems
+
+
+def run_child(args, seconds):
+    proc = subprocess.Popen([sys.executable, __file__, "--child", *args], cwd=ROOT)
+    time.sleep(seconds)
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+
+
+def main(rounds: int):
+    tmp = Path(tempfile.mkdtemp(prefix="crash_book_records_"))
+    rnd = random.Random(7)
+    failures = 0
+    try:
+        rec_path, csv_path = tmp / "books.rec", tmp / "books.csv"
+        ex_csv.save_books(
+            [{"id": i, "title": f"Book {i}", "author": f"Author {i % 20}", "pages": 100 + i, "price": 10.0 + i}
+             for i in range(1, INITIAL_BOOKS + 1)],
+            path=csv_path,
+        )
+        import_csv(csv_path, rec_path)
+        state, problems = snapshot(rec_path)
+        assert len(state) == INITIAL_BOOKS and not problems
+
+        for round_no in range(1, rounds + 1):
+            if round_no % 5 == 0:
+                # import שנקטע: CSV חדש עם מחירים אחרים
+                new_books = [dict(b, price=round(b["price"] + 1, 2)) for b in state.values()]
+                ex_csv.save_books(new_books, path=csv_path)
+                run_child(["import", str(rec_path), str(csv_path)], rnd.uniform(0.0, 0.4))
+                after, problems = snapshot(rec_path)
+                new_state = {b["id"]: dict(b, in_stock=True) for b in new_books}
+                ok = not problems and after in (state, new_state)
+                kind = "import"
+                state = after if ok else state
+            else:
+                log_path = tmp / f"ops_{round_no}.log"
+                run_child(["ops", str(rec_path), str(log_path), str(round_no)], rnd.uniform(0.05, 0.4))
+                done, pending = read_log(log_path)
+                for entry in done:
+                    state = apply(state, entry)
+                after, problems = snapshot(rec_path)
+                ok = not problems and (after == state or (pending and after == apply(state, pending)))
+                kind = f"ops ({len(done)} + {'1' if pending else '0'} באמצע)"
+                state = after if ok else state
+            failures += not ok
+            print(f"סבב {round_no:3d} {kind:<24} {'OK' if ok else 'FAIL'} {'; '.join(problems)}")
+
+        export_csv(rec_path, csv_path)
+        exported = {b["id"]: b for b in ex_csv.load_books(path=csv_path)}
+        expected = {i: {k: b[k] for k in ("id", "title", "author", "pages", "price")} for i, b in state.items()}
+        ok = exported == expected
+        failures += not ok
+        print(f"export ל-books.csv: {'OK' if ok else 'FAIL'} ({len(exported)} ספרים)")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if failures:
+        print(f"{failures} סבבים נכשלו.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        if sys.argv[2] == "ops":
+            child_ops(sys.argv[3], sys.argv[4], int(sys.argv[5]))
+        else:
+            child_import(sys.argv[3], sys.argv[4])
+    else:
+        sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 30))
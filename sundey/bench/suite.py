@@ -0,0 +1,289 @@
+"""
+חבילת מדידות להשוואה בין ה-backends של הספרים בגדלים שונים:
+csv (ex_csv, שמירה מלאה), csv_journal (ex_csv עם journal), ex_sql, ex_tut.
+
+לכל backend ולכל גודל נבנה קטלוג סינתטי דטרמיניסטי (bench/catalog.py),
+ואז נמדדות הפעולות: add, get_by_id, update_price, search, range,
+pagination, count, delete. פעולה שאין ל-backend פונקציה עבורה מסומנת null.
+
+כל הרצה (backend + גודל) היא תהליך נפרד - ex_sql ו-ex_tut מגדירים את
+אותה טבלת books על אותו metadata ולא ניתן לייבא את שניהם יחד.
+ה-backends של SQL רצים על SQLite זמני (DB_URL) במקום ה-MySQL.
+
+הרצה מתוך התיקייה sundey:
+    python bench/suite.py --sizes 10000,100000 --out results.json
+    python bench/suite.py --compare results.json   # התרעה על רגרסיה ב-p50
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from catalog import generate_books, sample_ids  # noqa: E402
+
+BACKENDS = ("csv", "csv_journal", "ex_sql", "ex_tut")
+OPS = ("add", "get_by_id", "update_price", "search", "range", "pagination", "count", "delete")
+SIZES = [10_000, 100_000]
+SEARCH_WORDS = ("potter", "dragon", "שלום", "river stone", "ring 1")
+PAGE_SIZE = 20
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    # nearest-rank
+    index = max(0, min(len(sorted_values) - 1, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(fn, count: int, max_seconds: float, min_count: int = 5) -> dict:
+    """
+    מריץ fn(i) עד count פעמים (או עד max_seconds) ומחזיר throughput ו-p50/p99
+    """
+    latencies = []
+    started = time.perf_counter()
+    for i in range(count):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - t0)
+        if i + 1 >= min_count and time.perf_counter() - started > max_seconds:
+            break
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        "n": len(latencies),
+        "ops_per_s": len(latencies) / total if total else None,
+        "mean_ms": total / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def _setup_csv(tmp: Path, size: int, seed: int, journal: bool):
+    import ex_csv
+
+    ex_csv.CSV_FILE = tmp / "books.csv"
+    ex_csv.JOURNAL_MODE = journal
+    books = [
+        {"id": i, "title": b["title"], "author": b["author"], "pages": b["pages"], "price": b["price"]}
+        for i, b in enumerate(generate_books(size, seed), start=1)
+    ]
+    ex_csv.save_books(books)
+    del books
+    ex_csv.get_store().all()
+
+    return {
+        "add": lambda b: ex_csv.add_book(b["title"], b["author"], b["pages"], b["price"]),
+        "get_by_id": ex_csv.get_book_by_id,
+        "update_price": ex_csv.update_book_price,
+        "delete": ex_csv.delete_book,
+        "range": ex_csv.books_in_price_range,
+        "count": lambda: len(ex_csv.get_store()),
+    }
+
+
+def _setup_ex_sql(tmp: Path, size: int, seed: int):
+    import ex_sql
+
+    ex_sql.init_db()
+    rows = ((b["title"], b["author"], b["pages"], b["price"]) for b in generate_books(size, seed))
+    ex_sql.add_books_batched(rows, batch_size=5000)
+
+    return {
+        "add": lambda b: ex_sql.add_book(b["title"], b["author"], b["pages"], b["price"]),
+        "get_by_id": ex_sql.get_book_by_id,
+        "update_price": ex_sql.update_book_price,
+        "delete": ex_sql.delete_book,
+        "count": ex_sql.count_books,
+    }
+
+
+def _setup_ex_tut(tmp: Path, size: int, seed: int):
+    import ex_tut
+
+    ex_tut.init_db()
+    ex_tut.bulk_add_books(generate_books(size, seed), chunk_size=5000)
+    ex_tut.rebuild_search_index()
+    state = {"cursor": None}
+
+    def next_page():
+        books, cursor = ex_tut.get_books_after(state["cursor"], PAGE_SIZE, "price")
+        state["cursor"] = cursor
+
+    return {
+        "add": lambda b: ex_tut.add_book(b["title"], b["author"], b["pages"], b["price"]),
+        "get_by_id": ex_tut.get_book_by_id,
+        "update_price": ex_tut.update_book_price,
+        "delete": ex_tut.delete_book,
+        "search": ex_tut.search_books,
+        "range": ex_tut.books_in_price_range,
+        "pagination": next_page,
+        "count": ex_tut.count_books,
+    }
+
+
+def run_child(backend: str, size: int, seed: int, count: int, max_seconds: float) -> dict:
+    tmp = Path(tempfile.mkdtemp(prefix=f"bench_suite_{backend}_"))
+    # ה-engine של המודולים נוצר לפי DB_URL בשימוש הראשון
+    os.environ["DB_URL"] = f"sqlite:///{tmp}/bench.db"
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            t0 = time.perf_counter()
+            if backend in ("csv", "csv_journal"):
+                api = _setup_csv(tmp, size, seed, journal=backend == "csv_journal")
+            elif backend == "ex_sql":
+                api = _setup_ex_sql(tmp, size, seed)
+            else:
+                api = _setup_ex_tut(tmp, size, seed)
+            setup_s = time.perf_counter() - t0
+
+            rnd = random.Random(seed + 1)
+            new_books = list(generate_books(count, seed + 1000))
+            ids = sample_ids(size, count, seed + 2)
+            delete_ids = rnd.sample(range(1, size + 1), min(count, size))
+            args = {
+                "add": lambda i: api["add"](new_books[i]),
+                "get_by_id": lambda i: api["get_by_id"](ids[i]),
+                "update_price": lambda i: api["update_price"](ids[i], round(rnd.uniform(1, 999), 2)),
+                "search": lambda i: api["search"](SEARCH_WORDS[i % len(SEARCH_WORDS)]),
+                "range": lambda i: api["range"](i % 990, i % 990 + 5),
+                "pagination": lambda i: api["pagination"](),
+                "count": lambda i: api["count"](),
+                "delete": lambda i: api["delete"](delete_ids[i % len(delete_ids)]),
+            }
+
+            ops = {}
+            for op in OPS:
+                if op not in api:
+                    ops[op] = None
+                    continue
+                ops[op] = measure(args[op], count, max_seconds)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return {"backend": backend, "size": size, "setup_s": setup_s, "ops": ops}
+
+
+def run_suite(backends, sizes, seed: int, count: int, max_seconds: float) -> dict:
+    results = []
+    for size in sizes:
+        for backend in backends:
+            print(f"{backend} size={size} ...", file=sys.stderr)
+            proc = subprocess.run(
+                [
+                    sys.executable, __file__, "--child", backend,
+                    "--sizes", str(size), "--seed", str(seed),
+                    "--count", str(count), "--max-seconds", str(max_seconds),
+                ],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                print(proc.stderr, file=sys.stderr)
+                results.append({"backend": backend, "size": size, "error": proc.stderr.strip()[-500:]})
+                continue
+            results.append(json.loads(proc.stdout))
+
+    return {
+        "meta": {
+            "seed": seed,
+            "count": count,
+            "max_seconds": max_seconds,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def _p50_by_key(report: dict) -> dict:
+    data = {}
+    for r in report["results"]:
+        for op, stats in (r.get("ops") or {}).items():
+            if stats:
+                data[(r["backend"], r["size"], op)] = stats["p50_ms"]
+    return data
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """
+    רשימת (backend, size, op, base_ms, new_ms) שבהן p50 עלה ביותר מ-threshold
+    """
+    old = _p50_by_key(baseline)
+    regressions = []
+    for key, new_ms in _p50_by_key(report).items():
+        base_ms = old.get(key)
+        if base_ms is not None and new_ms > base_ms * (1 + threshold):
+            regressions.append((*key, base_ms, new_ms))
+    return regressions
+
+
+def print_table(report: dict):
+    print(f"{'backend':<12} {'size':>9} {'op':<13} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for r in report["results"]:
+        if "error" in r:
+            print(f"{r['backend']:<12} {r['size']:>9} error")
+            continue
+        for op, stats in r["ops"].items():
+            if stats is None:
+                print(f"{r['backend']:<12} {r['size']:>9} {op:<13} {'n/a':>10}")
+            else:
+                print(
+                    f"{r['backend']:<12} {r['size']:>9} {op:<13} {stats['ops_per_s']:>10.1f} "
+                    f"{stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f}"
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=200, help="מספר פעולות מכל סוג")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="זמן מקסימלי לכל פעולה")
+    parser.add_argument("--out", help="קובץ JSON לתוצאות")
+    parser.add_argument("--compare", help="קובץ JSON קודם להשוואה")
+    parser.add_argument("--threshold", type=float, default=0.2, help="עלייה יחסית ב-p50 שנחשבת רגרסיה")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    if args.child:
+        result = run_child(args.child, sizes[0], args.seed, args.count, args.max_seconds)
+        print(json.dumps(result))
+        return 0
+
+    backends = [b for b in args.backends.split(",") if b]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"backend לא מוכר: {', '.join(sorted(unknown))}")
+
+    report = run_suite(backends, sizes, args.seed, args.count, args.max_seconds)
+    print_table(report)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        for backend, size, op, base_ms, new_ms in regressions:
+            print(f"רגרסיה: {backend} size={size} {op}: p50 {base_ms:.3f} -> {new_ms:.3f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
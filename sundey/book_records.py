@@ -0,0 +1,510 @@
+"""
+קובץ ספרים בינארי ברשומות באורך קבוע (mmap), לפי id:
+
+    books.rec           - header (64 בתים) + רשומה של 40 בתים לכל id
+    books.rec.<gen>.heap - המחרוזות (title / author) ב-UTF-8, רק הוספה בסוף
+
+הרשומה של id נמצאת ב-HEADER_SIZE + (id - 1) * RECORD_SIZE, ולכן
+get / update_price / set_in_stock / delete הם O(1): עדכון מחיר הוא כתיבה
+אחת של 8 בתים במקום, מלאי / מחיקה - בית אחד של flags (ב-CSV צריך
+לכתוב את כל הקובץ מחדש כי אורך השורות משתנה).
+
+סדר הכתיבה שומר על הקובץ תקין גם אם התהליך נהרג באמצע:
+- add: המחרוזות נכתבות ל-heap קודם, אחר כך הרשומה עם flags=0,
+  ורק בסוף בית ה-flags (LIVE) ו-max_id ב-header. רשומה שנכתבה במלואה
+  אבל max_id לא עודכן מאומצת בפתיחה הבאה; מחרוזות בלי רשומה הן זבל.
+- import_csv: נכתבים heap חדש (gen+1) וקובץ רשומות זמני, ואז rename
+  אטומי של קובץ הרשומות. רק אחרי זה, ועדיין תחת הנעילה, נמחקים
+  ה-heaps של דורות קודמים (פתיחת הקובץ לא מוחקת כלום - מופע פתוח
+  שעוד קורא מ-heap ישן לא נשבר).
+flush() (או durable=True) - msync + fsync, נגד נפילת חשמל.
+
+בין תהליכים: import_csv וכל כתיבה לוקחים flock בלעדי על books.rec.lock
+(לא על books.rec עצמו - ה-rename מחליף את ה-inode שלו). import_csv מסמן
+בקובץ הישן REPLACED אחרי ה-rename; מופע פתוח (ה-mmap שלו עדיין על
+ה-inode הישן) רואה את הסימון ונפתח מחדש לפני הקריאה / הכתיבה הבאה.
+כתיבה גם משווה את ה-inode ל-stat של הנתיב, וקוראת מחדש max_id, גודל
+ה-heap וגודל הקובץ - תהליך אחר יכול היה להוסיף ספרים בינתיים.
+
+    python book_records.py import books.csv books.rec
+    python book_records.py export books.rec books.csv
+    python book_records.py verify books.rec
+"""
+import contextlib
+import fcntl
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+MAGIC = b"BOOKREC1"
+VERSION = 1
+# magic, version, record_size, max_id, heap_gen
+HEADER = struct.Struct("<8sIIQQ")
+HEADER_SIZE = 64
+# flags, pages, price, title_off, title_len, author_off, author_len
+RECORD = struct.Struct("<BxxxIdQIQI")
+RECORD_SIZE = RECORD.size
+PRICE_OFFSET = 8
+MAX_ID_OFFSET = 16
+# בית אחרי ה-header (היה ריפוד): 1 = import_csv החליף את הקובץ
+REPLACED_OFFSET = HEADER.size
+
+LIVE = 1
+IN_STOCK = 2
+DELETED = 4
+
+GROW_RECORDS = 1024
+
+
+def heap_path_for(path: Path, gen: int) -> Path:
+    return path.with_name(f"{path.name}.{gen}.heap")
+
+
+def lock_path_for(path: Path) -> Path:
+    return path.with_name(f"{path.name}.lock")
+
+
+@contextlib.contextmanager
+def _flock(lock_file):
+    """
+    נעילה בלעדית בין תהליכים (וגם בין מופעים באותו תהליך - כל אחד עם fd משלו)
+    """
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        if not lock_file.closed:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _fsync_dir(path: Path):
+    try:
+        fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class BookRecordFile:
+    """
+    הקובץ פתוח כל עוד האובייקט פתוח (with / close).
+    כל הגישה ל-mmap תחת נעילה אחת (הגדלת הקובץ ממפה אותו מחדש),
+    וכתיבות גם תחת ה-flock של books.rec.lock.
+    """
+
+    def __init__(self, path="books.rec", durable: bool = False):
+        self.path = Path(path)
+        self.durable = durable
+        self._lock = threading.RLock()
+        self._lock_file = lock_path_for(self.path).open("a+b")
+        try:
+            with _flock(self._lock_file):
+                if not self.path.exists():
+                    heap_path_for(self.path, 1).touch()
+                    self._write_file(self.path, gen=1)
+                self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    # ---------------- פתיחה / סגירה ----------------
+
+    @staticmethod
+    def _write_file(path: Path, gen: int, max_id: int = 0, records: bytes = b""):
+        with path.open("wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, max_id, gen).ljust(HEADER_SIZE, b"\0"))
+            f.write(records)
+            f.write(b"\0" * (GROW_RECORDS * RECORD_SIZE))
+
+    def _open(self):
+        self._file = self.path.open("r+b")
+        stat = os.fstat(self._file.fileno())
+        self._inode = (stat.st_dev, stat.st_ino)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, record_size, self._max_id, self.heap_gen = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self._close_files()
+            raise ValueError(f"{self.path} אינו קובץ רשומות ספרים (גרסה {VERSION})")
+        self.heap_path = heap_path_for(self.path, self.heap_gen)
+        self._heap = self.heap_path.open("a+b")
+        self._heap_size = self._heap.seek(0, os.SEEK_END)
+        self._recover()
+
+    def _recover(self):
+        """
+        רשומות שנכתבו במלואן אחרי max_id (התהליך נפל לפני עדכון ה-header)
+        """
+        max_id = self._max_id
+        for book_id in range(self._max_id + 1, self._capacity() + 1):
+            if not self._map[self._offset(book_id)] & LIVE:
+                continue
+            _, _, _, t_off, t_len, a_off, a_len = self._unpack(book_id)
+            if t_off + t_len <= self._heap_size and a_off + a_len <= self._heap_size:
+                max_id = book_id
+        if max_id != self._max_id:
+            self._set_max_id(max_id)
+
+    def _close_files(self):
+        for name in ("_map", "_heap", "_file"):
+            obj = getattr(self, name, None)
+            if obj is not None and not obj.closed:
+                obj.close()
+
+    def close(self):
+        self._close_files()
+        self._lock_file.close()
+
+    def _sync(self):
+        """
+        תחת ה-flock: קובץ שהוחלף (import_csv) נפתח מחדש, ואחרת max_id,
+        גודל ה-heap וגודל הקובץ נקראים מהדיסק - תהליך אחר יכול היה לשנות אותם
+        """
+        stat = os.stat(self.path)
+        if self._map[REPLACED_OFFSET] or (stat.st_dev, stat.st_ino) != self._inode:
+            self._close_files()
+            self._open()
+            return
+        if stat.st_size != len(self._map):
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        self._max_id = struct.unpack_from("<Q", self._map, MAX_ID_OFFSET)[0]
+        self._heap_size = os.fstat(self._heap.fileno()).st_size
+
+    def _refresh(self):
+        """
+        לפני קריאה (תחת self._lock): בלי syscall אם הקובץ לא הוחלף ולא גדל
+        """
+        max_id = struct.unpack_from("<Q", self._map, MAX_ID_OFFSET)[0]
+        if self._map[REPLACED_OFFSET] or max_id > self._capacity():
+            with _flock(self._lock_file):
+                self._sync()
+        else:
+            self._max_id = max_id
+
+    @contextlib.contextmanager
+    def _writing(self):
+        with self._lock, _flock(self._lock_file):
+            self._sync()
+            yield
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def flush(self):
+        with self._lock:
+            self._refresh()
+            self._heap.flush()
+            os.fsync(self._heap.fileno())
+            self._map.flush()
+
+    # ---------------- רשומות ----------------
+
+    def _capacity(self) -> int:
+        return (len(self._map) - HEADER_SIZE) // RECORD_SIZE
+
+    def _offset(self, book_id: int) -> int:
+        return HEADER_SIZE + (book_id - 1) * RECORD_SIZE
+
+    def _unpack(self, book_id: int):
+        return RECORD.unpack_from(self._map, self._offset(book_id))
+
+    def _set_max_id(self, max_id: int):
+        struct.pack_into("<Q", self._map, MAX_ID_OFFSET, max_id)
+        self._max_id = max_id
+
+    def _grow(self, min_records: int):
+        capacity = max(min_records, self._capacity() * 2, GROW_RECORDS)
+        self._map.close()
+        self._file.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _read_heap(self, offset: int, length: int) -> str:
+        return os.pread(self._heap.fileno(), length, offset).decode("utf-8")
+
+    def _append_heap(self, *texts) -> list:
+        refs = []
+        data = b""
+        for text in texts:
+            raw = text.encode("utf-8")
+            refs.append((self._heap_size + len(data), len(raw)))
+            data += raw
+        self._heap.write(data)
+        self._heap.flush()
+        self._heap_size += len(data)
+        return refs
+
+    def _book(self, book_id: int, record) -> dict:
+        flags, pages, price, t_off, t_len, a_off, a_len = record
+        return {
+            "id": book_id,
+            "title": self._read_heap(t_off, t_len),
+            "author": self._read_heap(a_off, a_len),
+            "pages": pages,
+            "price": price,
+            "in_stock": bool(flags & IN_STOCK),
+        }
+
+    def _live(self, book_id: int):
+        if not 1 <= book_id <= self._max_id:
+            return None
+        record = self._unpack(book_id)
+        return record if record[0] & LIVE else None
+
+    def _commit(self):
+        if self.durable:
+            self.flush()
+
+    # ---------------- API ----------------
+
+    @property
+    def max_id(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._max_id
+
+    def get(self, book_id: int):
+        with self._lock:
+            self._refresh()
+            record = self._live(book_id)
+            return self._book(book_id, record) if record is not None else None
+
+    def __iter__(self):
+        book_id = 1
+        while book_id <= self.max_id:
+            book = self.get(book_id)
+            if book is not None:
+                yield book
+            book_id += 1
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return sum(1 for book_id in range(1, self._max_id + 1) if self._map[self._offset(book_id)] & LIVE)
+
+    def add(self, title: str, author: str, pages: int, price: float,
+            in_stock: bool = True, book_id: int = None) -> dict:
+        """
+        book_id=None - ה-id הבא. id קיים (חי או מחוק) לא נכתב מחדש.
+        """
+        with self._writing():
+            book_id = self._max_id + 1 if book_id is None else book_id
+            if book_id < 1:
+                raise ValueError(f"id לא תקין: {book_id}")
+            if book_id <= self._max_id and self._unpack(book_id)[0] & (LIVE | DELETED):
+                raise ValueError(f"ספר עם id {book_id} כבר קיים")
+            if book_id > self._capacity():
+                self._grow(book_id)
+            (t_off, t_len), (a_off, a_len) = self._append_heap(title, author)
+            offset = self._offset(book_id)
+            RECORD.pack_into(self._map, offset, 0, pages, price, t_off, t_len, a_off, a_len)
+            # ה-flags אחרונים: עד כאן הרשומה לא קיימת
+            self._map[offset] = LIVE | (IN_STOCK if in_stock else 0)
+            if book_id > self._max_id:
+                self._set_max_id(book_id)
+            self._commit()
+        return {"id": book_id, "title": title, "author": author, "pages": pages,
+                "price": price, "in_stock": in_stock}
+
+    def update_price(self, book_id: int, new_price: float) -> bool:
+        with self._writing():
+            if self._live(book_id) is None:
+                return False
+            struct.pack_into("<d", self._map, self._offset(book_id) + PRICE_OFFSET, new_price)
+            self._commit()
+            return True
+
+    def _set_flags(self, book_id: int, set_bits: int = 0, clear_bits: int = 0) -> bool:
+        with self._writing():
+            record = self._live(book_id)
+            if record is None:
+                return False
+            self._map[self._offset(book_id)] = (record[0] | set_bits) & ~clear_bits
+            self._commit()
+            return True
+
+    def set_in_stock(self, book_id: int, in_stock: bool) -> bool:
+        if in_stock:
+            return self._set_flags(book_id, set_bits=IN_STOCK)
+        return self._set_flags(book_id, clear_bits=IN_STOCK)
+
+    def delete(self, book_id: int) -> bool:
+        # המחרוזות נשארות ב-heap עד import_csv הבא (export_csv ואז import_csv בונה heap חדש)
+        return self._set_flags(book_id, set_bits=DELETED, clear_bits=LIVE | IN_STOCK)
+
+    def verify(self) -> list:
+        """
+        בדיקת תקינות - מחזירה רשימת בעיות (ריקה = תקין)
+        """
+        with self._lock:
+            self._refresh()
+            return self._verify()
+
+    def _verify(self) -> list:
+        problems = []
+        if self._max_id > self._capacity():
+            problems.append(f"max_id={self._max_id} גדול מהקובץ ({self._capacity()} רשומות)")
+            return problems
+        for book_id in range(1, self._max_id + 1):
+            flags, pages, price, t_off, t_len, a_off, a_len = self._unpack(book_id)
+            if flags & ~(LIVE | IN_STOCK | DELETED) or (flags & LIVE and flags & DELETED):
+                problems.append(f"id {book_id}: flags לא תקינים ({flags})")
+            if not flags & LIVE:
+                continue
+            if t_off + t_len > self._heap_size or a_off + a_len > self._heap_size:
+                problems.append(f"id {book_id}: מצביע מחוץ ל-heap")
+                continue
+            try:
+                self._read_heap(t_off, t_len)
+                self._read_heap(a_off, a_len)
+            except UnicodeDecodeError:
+                problems.append(f"id {book_id}: מחרוזת לא תקינה ב-heap")
+            if price != price:
+                problems.append(f"id {book_id}: מחיר NaN")
+        for book_id in range(self._max_id + 1, self._capacity() + 1):
+            if self._unpack(book_id)[0] & LIVE:
+                problems.append(f"id {book_id}: רשומה חיה אחרי max_id")
+                break
+        return problems
+
+
+# ---------------------------------------------------------
+# גשר ל-books.csv
+# ---------------------------------------------------------
+
+def _remove_old_heaps(path: Path, gen: int):
+    """
+    מוחק heaps של דורות קודמים ל-gen - ה-header החדש כבר לא מפנה אליהם.
+    heaps של דורות חדשים יותר (import אחר) לא נוגעים בהם.
+    """
+    prefix, suffix = f"{path.name}.", ".heap"
+    for old in path.parent.glob(f"{path.name}.*.heap"):
+        old_gen = old.name[len(prefix):-len(suffix)]
+        if old_gen.isdigit() and int(old_gen) < gen:
+            old.unlink(missing_ok=True)
+
+
+def import_csv(csv_path, path="books.rec") -> int:
+    """
+    בונה את קובץ הרשומות מחדש מ-books.csv (כולל יומן, דרך ex_csv),
+    עם ה-ids מהקובץ. מחליף את הקובץ הקיים באופן אטומי, תחת ה-flock
+    (import אחד בכל פעם, ואף כתיבה של מופע פתוח לא הולכת לאיבוד).
+    מחזיר כמה ספרים נכתבו.
+    """
+    path = Path(path)
+    with lock_path_for(path).open("a+b") as lock_file, _flock(lock_file):
+        old = path.open("r+b") if path.exists() else None
+        try:
+            return _import_csv(csv_path, path, old)
+        finally:
+            if old is not None:
+                old.close()
+
+
+def _import_csv(csv_path, path: Path, old) -> int:
+    """
+    old - הקובץ הקיים (או None), פתוח עד אחרי ה-rename כדי לסמן בו REPLACED
+    """
+    import ex_csv
+
+    gen = 1
+    if old is not None:
+        magic, version, record_size, _, old_gen = HEADER.unpack(old.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} אינו קובץ רשומות ספרים (גרסה {VERSION})")
+        gen = old_gen + 1
+    heap_path = heap_path_for(path, gen)
+
+    records = bytearray()
+    heap_size = 0
+    max_id = count = 0
+    with heap_path.open("wb") as heap:
+        for b in ex_csv.iter_books(path=csv_path):
+            book_id = b["id"]
+            if book_id < 1:
+                raise ValueError(f"id לא תקין ב-CSV: {book_id}")
+            if book_id > max_id:
+                records.extend(b"\0" * ((book_id - max_id) * RECORD_SIZE))
+                max_id = book_id
+            title, author = b["title"].encode("utf-8"), b["author"].encode("utf-8")
+            heap.write(title + author)
+            RECORD.pack_into(
+                records, (book_id - 1) * RECORD_SIZE, LIVE | IN_STOCK, b["pages"], b["price"],
+                heap_size, len(title), heap_size + len(title), len(author),
+            )
+            heap_size += len(title) + len(author)
+            count += 1
+        heap.flush()
+        os.fsync(heap.fileno())
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        BookRecordFile._write_file(tmp, gen, max_id, bytes(records))
+        with tmp.open("r+b") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        heap_path.unlink(missing_ok=True)
+        raise
+
+    # מופעים פתוחים רואים את הסימון ונפתחים מחדש על הקובץ החדש;
+    # עד אז הם קוראים מה-heap הישן דרך ה-fd שלהם
+    if old is not None:
+        os.pwrite(old.fileno(), b"\1", REPLACED_OFFSET)
+    _remove_old_heaps(path, gen)
+    return count
+
+
+def export_csv(path="books.rec", csv_path="books.csv") -> int:
+    """
+    כותב את הספרים החיים ל-books.csv (ex_csv.save_books - קובץ זמני + rename)
+    """
+    import ex_csv
+
+    count = 0
+
+    def books(records):
+        nonlocal count
+        for b in records:
+            count += 1
+            yield b
+
+    with BookRecordFile(path) as records:
+        ex_csv.save_books(books(records), path=csv_path)
+    return count
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) >= 2 and argv[0] == "verify":
+        with BookRecordFile(argv[1]) as records:
+            problems = records.verify()
+            for problem in problems:
+                print(problem)
+            print(f"{len(records)} ספרים, {len(problems)} בעיות")
+        return 1 if problems else 0
+    if len(argv) == 3 and argv[0] == "import":
+        print(f"יובאו {import_csv(argv[1], argv[2])} ספרים ל-{argv[2]}")
+        return 0
+    if len(argv) == 3 and argv[0] == "export":
+        print(f"יוצאו {export_csv(argv[1], argv[2])} ספרים ל-{argv[2]}")
+        return 0
+    print("שימוש: python book_records.py [import books.csv books.rec | export books.rec books.csv | verify books.rec]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
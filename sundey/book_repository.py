@@ -0,0 +1,437 @@
+"""
+ממשק אחד לספרים (BookRepository) עם backends שאפשר להחליף:
+
+- "csv"     - books.csv דרך ex_csv.BookStore (בזיכרון + קובץ)
+- "sqlmodel" - טבלת books של ex_tut (MySQL לפי settings / DB_URL)
+- "sqlite"  - SQLite מוטמע בקובץ מקומי (WAL), בלי שרת ובלי רשת:
+               מתאים לשרת יחיד, כל שליפה היא קריאה מקומית
+- "records" - קובץ רשומות בינארי (book_records.py): עדכון מחיר / מלאי
+               הוא כתיבה אחת במקום
+
+הבחירה ב-settings.json: "book_backend" (או משתנה סביבה BOOK_BACKEND),
+והנתיבים ב-"book_csv_path" / "book_sqlite_path" / "book_records_path".
+
+אותו חוזה לכל ה-backends (נבדק ב-bench/check_book_backends.py):
+- ספר הוא dict עם id / title / author / pages / price
+- get של id שלא קיים -> None, update_price / delete שלא קיים -> False
+- all לפי id, by_price לפי (price, id) כולל שני הגבולות,
+  search - הכותרת מכילה את המילה (בלי תלות ברישיות / ניקוד), לפי id
+- init_db - יצירת הסכמה במפורש (לא ב-import ולא ב-constructor)
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Protocol
+
+from app.settings import load_settings
+from search_index import normalize
+
+BOOK_FIELDS = ("id", "title", "author", "pages", "price")
+BACKENDS = ("csv", "sqlmodel", "sqlite", "records")
+DEFAULT_BACKEND = "sqlmodel"
+DEFAULT_CSV_PATH = "books.csv"
+DEFAULT_SQLITE_PATH = "books.db"
+DEFAULT_RECORDS_PATH = "books.rec"
+
+
+class BookRepository(Protocol):
+    def init_db(self) -> None: ...
+
+    def add(self, title: str, author: str, pages: int, price: float) -> dict: ...
+
+    def get(self, book_id: int) -> Optional[dict]: ...
+
+    def update_price(self, book_id: int, new_price: float) -> bool: ...
+
+    def delete(self, book_id: int) -> bool: ...
+
+    def count(self) -> int: ...
+
+    def all(self) -> list: ...
+
+    def by_price(self, min_price: float = None, max_price: float = None) -> list: ...
+
+    def search(self, keyword: str) -> list: ...
+
+    def close(self) -> None: ...
+
+
+def _title_matches(title: str, keyword: str) -> bool:
+    return keyword in normalize(title)
+
+
+# ---------------------------------------------------------
+# CSV
+# ---------------------------------------------------------
+
+class CsvBookRepository:
+    def __init__(self, path=DEFAULT_CSV_PATH, journal: bool = None):
+        import ex_csv
+
+        self._store = ex_csv.BookStore(path, journal=ex_csv.JOURNAL_MODE if journal is None else journal)
+
+    def init_db(self) -> None:
+        # קובץ שלא קיים = מאגר ריק, נוצר בכתיבה הראשונה
+        pass
+
+    def add(self, title: str, author: str, pages: int, price: float) -> dict:
+        return self._store.add(title, author, pages, price)
+
+    def get(self, book_id: int) -> Optional[dict]:
+        return self._store.get(book_id)
+
+    def update_price(self, book_id: int, new_price: float) -> bool:
+        return self._store.update_price(book_id, new_price)
+
+    def delete(self, book_id: int) -> bool:
+        return self._store.delete(book_id)
+
+    def count(self) -> int:
+        return len(self._store)
+
+    def all(self) -> list:
+        return sorted(self._store.all(), key=lambda b: b["id"])
+
+    def by_price(self, min_price: float = None, max_price: float = None) -> list:
+        return self._store.by_price(min_price, max_price)
+
+    def search(self, keyword: str) -> list:
+        keyword = normalize(keyword)
+        if not keyword:
+            return []
+        return [b for b in self.all() if _title_matches(b["title"], keyword)]
+
+    def close(self) -> None:
+        self._store.wait_for_compaction()
+
+
+# ---------------------------------------------------------
+# SQLModel (ex_tut) - MySQL / כל DB לפי DB_URL
+# ---------------------------------------------------------
+
+class SQLModelBookRepository:
+    """
+    מעל המודל והמטמונים של ex_tut: כל כתיבה מעדכנת את book_cache ואת
+    אינדקס החיפוש שלו, כך שאפשר לערבב קריאות ל-ex_tut ולמאגר
+    """
+
+    def __init__(self):
+        import ex_tut
+
+        self._tut = ex_tut
+
+    @staticmethod
+    def _dict(book) -> dict:
+        return {name: getattr(book, name) for name in BOOK_FIELDS}
+
+    def _session(self):
+        from sqlmodel import Session
+
+        return Session(self._tut._engine())
+
+    def init_db(self) -> None:
+        self._tut.init_db()
+
+    def add(self, title: str, author: str, pages: int, price: float) -> dict:
+        with self._session() as session:
+            book = self._tut.Book(title=title, author=author, pages=pages, price=price)
+            session.add(book)
+            session.commit()
+            session.refresh(book)
+            self._tut._books_added([(book.id, book.title, book.author)])
+            return self._dict(book)
+
+    def get(self, book_id: int) -> Optional[dict]:
+        def load():
+            with self._session() as session:
+                return session.get(self._tut.Book, book_id)
+
+        book = self._tut.book_cache.get_or_load(("id", book_id), load)
+        return self._dict(book) if book is not None else None
+
+    def update_price(self, book_id: int, new_price: float) -> bool:
+        # אותו מסלול כמו ex_tut (session.add, מטמון, catalog_stats, timed)
+        return self._tut.update_book_price(book_id, new_price)
+
+    def delete(self, book_id: int) -> bool:
+        with self._session() as session:
+            book = session.get(self._tut.Book, book_id)
+            if book is None:
+                return False
+            session.delete(book)
+            session.commit()
+            self._tut._book_removed(book_id, book.title, book.author)
+            return True
+
+    def count(self) -> int:
+        from sqlmodel import func, select
+
+        with self._session() as session:
+            return session.exec(select(func.count()).select_from(self._tut.Book)).one()
+
+    def _select(self, *where, order_by=None):
+        from sqlmodel import select
+
+        Book = self._tut.Book
+        stmt = select(*(getattr(Book, name) for name in BOOK_FIELDS)).where(*where)
+        stmt = stmt.order_by(*(order_by if order_by is not None else [Book.id]))
+        with self._session() as session:
+            return [dict(zip(BOOK_FIELDS, row)) for row in session.exec(stmt)]
+
+    def all(self) -> list:
+        return self._select()
+
+    def by_price(self, min_price: float = None, max_price: float = None) -> list:
+        Book = self._tut.Book
+        where = []
+        if min_price is not None:
+            where.append(Book.price >= min_price)
+        if max_price is not None:
+            where.append(Book.price <= max_price)
+        return self._select(*where, order_by=[Book.price, Book.id])
+
+    def search(self, keyword: str) -> list:
+        ids = sorted(self._tut._get_search_index().search(keyword))
+        books = []
+        for start in range(0, len(ids), 1000):
+            books.extend(self._select(self._tut.Book.id.in_(ids[start:start + 1000])))
+        return books
+
+    def close(self) -> None:
+        pass
+
+
+# ---------------------------------------------------------
+# SQLite מוטמע (WAL)
+# ---------------------------------------------------------
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(200) NOT NULL,
+    author VARCHAR(100) NOT NULL,
+    pages INTEGER NOT NULL,
+    price REAL NOT NULL,
+    isbn VARCHAR(20) UNIQUE,
+    publication_year INTEGER,
+    in_stock BOOLEAN NOT NULL DEFAULT 1,
+    created_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_books_price ON books (price, id);
+CREATE INDEX IF NOT EXISTS ix_books_pages ON books (pages, id);
+"""
+
+
+class SqliteBookRepository:
+    """
+    חיבור sqlite3 אחד לכל thread (WAL: קוראים לא חוסמים את הכותב).
+    synchronous=NORMAL - ב-WAL עדיין בטוח לקריסה של התהליך, ורק
+    הטרנזקציה האחרונה יכולה ללכת לאיבוד בנפילת חשמל.
+    """
+
+    _SELECT = "SELECT id, title, author, pages, price FROM books"
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, busy_timeout_ms: int = 5000):
+        self.path = str(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.create_function("normalize", 1, normalize, deterministic=True)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _dicts(rows) -> list:
+        return [dict(zip(BOOK_FIELDS, row)) for row in rows]
+
+    def init_db(self) -> None:
+        self._conn().executescript(SQLITE_SCHEMA)
+
+    def add(self, title: str, author: str, pages: int, price: float) -> dict:
+        cur = self._conn().execute(
+            "INSERT INTO books (title, author, pages, price, created_at) VALUES (?, ?, ?, ?, ?)",
+            (title, author, pages, price, datetime.now().isoformat(sep=" ")),
+        )
+        return {"id": cur.lastrowid, "title": title, "author": author, "pages": pages, "price": price}
+
+    def get(self, book_id: int) -> Optional[dict]:
+        rows = self._conn().execute(self._SELECT + " WHERE id = ?", (book_id,)).fetchall()
+        return self._dicts(rows)[0] if rows else None
+
+    def update_price(self, book_id: int, new_price: float) -> bool:
+        cur = self._conn().execute("UPDATE books SET price = ? WHERE id = ?", (new_price, book_id))
+        return cur.rowcount > 0
+
+    def delete(self, book_id: int) -> bool:
+        cur = self._conn().execute("DELETE FROM books WHERE id = ?", (book_id,))
+        return cur.rowcount > 0
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def all(self) -> list:
+        return self._dicts(self._conn().execute(self._SELECT + " ORDER BY id"))
+
+    def by_price(self, min_price: float = None, max_price: float = None) -> list:
+        where, params = [], []
+        if min_price is not None:
+            where.append("price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            where.append("price <= ?")
+            params.append(max_price)
+        sql = self._SELECT + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY price, id"
+        return self._dicts(self._conn().execute(sql, params))
+
+    def search(self, keyword: str) -> list:
+        keyword = normalize(keyword)
+        if not keyword:
+            return []
+        return self._dicts(self._conn().execute(
+            self._SELECT + " WHERE instr(normalize(title), ?) > 0 ORDER BY id", (keyword,)
+        ))
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+# ---------------------------------------------------------
+# קובץ רשומות (mmap)
+# ---------------------------------------------------------
+
+class RecordBookRepository:
+    """
+    get / update_price / delete / set_in_stock הם O(1) לפי id.
+    by_price ו-search סורקים את כל הרשומות (אין אינדקס משני).
+    """
+
+    def __init__(self, path=DEFAULT_RECORDS_PATH):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _records(self):
+        if self._file is None:
+            from book_records import BookRecordFile
+
+            with self._lock:
+                if self._file is None:
+                    self._file = BookRecordFile(self.path)
+        return self._file
+
+    @staticmethod
+    def _dict(book) -> dict:
+        return {name: book[name] for name in BOOK_FIELDS}
+
+    def init_db(self) -> None:
+        # קובץ שלא קיים נוצר ריק בפתיחה
+        self._records()
+
+    def add(self, title: str, author: str, pages: int, price: float) -> dict:
+        return self._dict(self._records().add(title, author, pages, price))
+
+    def get(self, book_id: int) -> Optional[dict]:
+        book = self._records().get(book_id)
+        return self._dict(book) if book is not None else None
+
+    def update_price(self, book_id: int, new_price: float) -> bool:
+        return self._records().update_price(book_id, new_price)
+
+    def set_in_stock(self, book_id: int, in_stock: bool) -> bool:
+        return self._records().set_in_stock(book_id, in_stock)
+
+    def delete(self, book_id: int) -> bool:
+        return self._records().delete(book_id)
+
+    def count(self) -> int:
+        return len(self._records())
+
+    def all(self) -> list:
+        return [self._dict(b) for b in self._records()]
+
+    def by_price(self, min_price: float = None, max_price: float = None) -> list:
+        books = [
+            b for b in self.all()
+            if (min_price is None or b["price"] >= min_price)
+            and (max_price is None or b["price"] <= max_price)
+        ]
+        return sorted(books, key=lambda b: (b["price"], b["id"]))
+
+    def search(self, keyword: str) -> list:
+        keyword = normalize(keyword)
+        if not keyword:
+            return []
+        return [b for b in self.all() if _title_matches(b["title"], keyword)]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# ---------------------------------------------------------
+# בחירת backend לפי settings.json
+# ---------------------------------------------------------
+
+def book_settings(path: str = None) -> dict:
+    path = path or os.environ.get("DB_SETTINGS_FILE", "settings.json")
+    try:
+        settings = load_settings(path)
+    except FileNotFoundError:
+        settings = {}
+    return {
+        "book_backend": os.environ.get("BOOK_BACKEND") or settings.get("book_backend", DEFAULT_BACKEND),
+        "book_csv_path": settings.get("book_csv_path", DEFAULT_CSV_PATH),
+        "book_sqlite_path": settings.get("book_sqlite_path", DEFAULT_SQLITE_PATH),
+        "book_records_path": settings.get("book_records_path", DEFAULT_RECORDS_PATH),
+    }
+
+
+def create_repository(backend: str, csv_path=DEFAULT_CSV_PATH, sqlite_path=DEFAULT_SQLITE_PATH,
+                      records_path=DEFAULT_RECORDS_PATH):
+    if backend == "csv":
+        return CsvBookRepository(csv_path)
+    if backend == "sqlmodel":
+        return SQLModelBookRepository()
+    if backend == "sqlite":
+        return SqliteBookRepository(sqlite_path)
+    if backend == "records":
+        return RecordBookRepository(records_path)
+    raise ValueError(f"book_backend לא מוכר: {backend} (אפשר: {', '.join(BACKENDS)})")
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_book_repository() -> BookRepository:
+    """
+    המאגר המשותף לפי settings.json - נוצר בקריאה הראשונה
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                settings = book_settings()
+                _repository = create_repository(
+                    settings["book_backend"], settings["book_csv_path"],
+                    settings["book_sqlite_path"], settings["book_records_path"],
+                )
+    return _repository
@@ -0,0 +1,235 @@
+"""
+קובץ מטמון בינארי (sidecar) ליד books.csv.
+
+העמודות id / pages / price נשמרות כמערכים מספריים ארוזים (int64 / float64),
+ו-title / author כמערך היסטים (offsets) + בלוק בתים אחד (UTF-8).
+הקובץ נפתח עם mmap, כך שפתיחה היא כמעט חינמית ואין צורך ב-int() / float()
+על כל שורה.
+
+המטמון תקף רק כל עוד ה-mtime והגודל של books.csv זהים למה שנשמר בכותרת.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+
+MAGIC = b"BOOKCOL1"
+VERSION = 1
+# סימון סדר בתים - קובץ שנכתב במכונה עם סדר בתים אחר נחשב לא תקף
+BYTE_ORDER_MARK = 0x01020304
+HEADER = struct.Struct("=8sIIqqQQQ")
+ALIGN = 8
+
+
+def cache_path_for(csv_path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + ".colcache")
+
+
+def csv_signature(csv_path):
+    """
+    (mtime_ns, size) של קובץ ה-CSV, או None אם הוא לא קיים
+    """
+    try:
+        st = Path(csv_path).stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % ALIGN)
+
+
+class ColumnBuilder:
+    """
+    אוסף עמודות תוך כדי קריאת ה-CSV, בלי להחזיק מילון לכל שורה.
+    שימו לב: כל העמודות נשמרות בזיכרון עד write - 40 בתים לשורה
+    למספרים ולהיסטים + ה-UTF-8 של כל ה-titles וה-authors (בערך כגודל
+    ה-CSV). הקריאה הראשונה עם SIDECAR_CACHE לא זורמת בזיכרון קבוע
+    כמו iter_books בלי מטמון.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.pages = array("q")
+        self.prices = array("d")
+        self.title_offsets = array("Q", [0])
+        self.author_offsets = array("Q", [0])
+        self.titles = bytearray()
+        self.authors = bytearray()
+
+    def append(self, book):
+        self.ids.append(book["id"])
+        self.pages.append(book["pages"])
+        self.prices.append(book["price"])
+        self.titles += book["title"].encode("utf-8")
+        self.title_offsets.append(len(self.titles))
+        self.authors += book["author"].encode("utf-8")
+        self.author_offsets.append(len(self.authors))
+
+    def write(self, csv_path, signature):
+        """
+        כותב את המטמון לקובץ זמני ומחליף (rename).
+        signature - ה-(mtime_ns, size) של ה-CSV מלפני הקריאה.
+        """
+        path = cache_path_for(csv_path)
+        # שם ייחודי גם בין threads באותו תהליך (לא רק לפי pid)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        tmp = Path(tmp_name)
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            BYTE_ORDER_MARK,
+            signature[0],
+            signature[1],
+            len(self.ids),
+            len(self.titles),
+            len(self.authors),
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(_padding(len(header)))
+                for column in (
+                    self.ids,
+                    self.pages,
+                    self.prices,
+                    self.title_offsets,
+                    self.author_offsets,
+                ):
+                    f.write(column.tobytes())
+                f.write(self.titles)
+                f.write(_padding(len(self.titles)))
+                f.write(self.authors)
+                # בלי fsync קובץ קטוע יכול להישאר אחרי נפילה, כבר עם השם הסופי
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+class ColumnarBooks:
+    """
+    תצוגה לקריאה בלבד על קובץ המטמון הממופה לזיכרון.
+    ids / pages / prices הם memoryview מספריים שאפשר לעבור עליהם ישירות.
+    """
+
+    def __init__(self, path: Path):
+        self._views = []
+        self._file = path.open("rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self._file.close()
+            raise
+        try:
+            self._open_sections(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open_sections(self, path: Path):
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"{path} קטוע")
+        (
+            magic,
+            version,
+            bom,
+            self.csv_mtime_ns,
+            self.csv_size,
+            n,
+            titles_len,
+            authors_len,
+        ) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or bom != BYTE_ORDER_MARK:
+            raise ValueError(f"{path} אינו קובץ מטמון תקף")
+
+        # בודקים את כל הגדלים מול גודל הקובץ לפני שיוצרים views
+        start = HEADER.size + len(_padding(HEADER.size))
+        columns_size = (3 * n + 2 * (n + 1)) * 8
+        end = start + columns_size + titles_len + len(_padding(titles_len)) + authors_len
+        if end > len(self._mmap):
+            raise ValueError(f"{path} קטוע")
+
+        # כל view נרשם מיד, כדי ש-close ישחרר אותם לפני סגירת ה-mmap
+        view = memoryview(self._mmap)
+        self._views.append(view)
+        pos = start
+        sections = []
+        for fmt, count in (("q", n), ("q", n), ("d", n), ("Q", n + 1), ("Q", n + 1)):
+            size = count * 8
+            raw = view[pos:pos + size]
+            self._views.append(raw)
+            sections.append(raw.cast(fmt))
+            self._views.append(sections[-1])
+            pos += size
+        self.ids, self.pages, self.prices, self._title_offsets, self._author_offsets = sections
+        self._titles = view[pos:pos + titles_len]
+        self._views.append(self._titles)
+        pos += titles_len + len(_padding(titles_len))
+        self._authors = view[pos:pos + authors_len]
+        self._views.append(self._authors)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def title(self, i: int) -> str:
+        return str(self._titles[self._title_offsets[i]:self._title_offsets[i + 1]], "utf-8")
+
+    def author(self, i: int) -> str:
+        return str(self._authors[self._author_offsets[i]:self._author_offsets[i + 1]], "utf-8")
+
+    def row(self, i: int) -> dict:
+        return {
+            "id": self.ids[i],
+            "title": self.title(i),
+            "author": self.author(i),
+            "pages": self.pages[i],
+            "price": self.prices[i],
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def close(self):
+        # views נגזרים (cast) משוחררים לפני ה-view שהם נוצרו ממנו
+        for v in reversed(getattr(self, "_views", [])):
+            v.release()
+        self._views = []
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_cache(csv_path):
+    """
+    פותח את המטמון של csv_path אם הוא קיים ותואם ל-mtime ולגודל הנוכחיים,
+    אחרת מחזיר None
+    """
+    signature = csv_signature(csv_path)
+    path = cache_path_for(csv_path)
+    if signature is None or not path.exists():
+        return None
+
+    try:
+        cache = ColumnarBooks(path)
+    except (ValueError, TypeError, BufferError, struct.error, OSError):
+        # מטמון קטוע / פגום - חוזרים לקריאה מה-CSV
+        return None
+
+    if (cache.csv_mtime_ns, cache.csv_size) != signature:
+        cache.close()
+        return None
+    return cache
@@ -1,48 +1,268 @@
+import bisect
 import csv
+import io
+import os
+import tempfile
+import threading
+import warnings
 from pathlib import Path
 
+import csv_cache
+
 CSV_FILE = Path("books.csv")
 FIELDNAMES = ["id", "title", "author", "pages", "price"]
 
+# מצב יומן: שינויים נכתבים כשורות בסוף books.csv.journal במקום לכתוב מחדש
+# את כל הקובץ, ומדי פעם היומן "מקופל" חזרה לקובץ הראשי
+JOURNAL_MODE = False
+JOURNAL_FIELDS = ["op", "id", "title", "author", "pages", "price"]
+JOURNAL_MAX_BYTES = 1024 * 1024
+JOURNAL_MAX_RATIO = 0.5
+JOURNAL_MIN_RECORDS = 1000
+
+# מטמון עמודות בינארי ליד books.csv (ראה csv_cache.py) - חוסך את הפענוח
+# של הטקסט כל עוד הקובץ לא השתנה. הבנייה (בקריאה הראשונה) מחזיקה את כל
+# העמודות בזיכרון - ראה csv_cache.ColumnBuilder
+SIDECAR_CACHE = False
+
+
+def journal_path_for(path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".journal")
 
-def load_books():
+
+def _iter_csv(path):
     """
-    קורא את כל הספרים מה-CSV ומחזיר רשימה של מילונים
+    קורא את books.csv שורה אחרי שורה וממיר סוגים (id, pages, price) תוך כדי
     """
-    if not CSV_FILE.exists():
-        return []
+    with path.open(mode="r", newline="", encoding="utf-8") as f:
+        for b in csv.DictReader(f):
+            b["id"] = int(b["id"])
+            b["pages"] = int(b["pages"])
+            b["price"] = float(b["price"])
+            yield b
 
-    with CSV_FILE.open(mode="r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        books = list(reader)
 
-    # להמיר סוגים (id, pages, price)
-    for b in books:
-        b["id"] = int(b["id"])
-        b["pages"] = int(b["pages"])
-        b["price"] = float(b["price"])
+def _iter_base(path, use_cache=None):
+    """
+    הספרים שבקובץ הראשי - מהמטמון הבינארי אם הוא תקף,
+    אחרת מה-CSV (ואז המטמון נבנה מחדש בסוף הקריאה)
+    """
+    if use_cache is None:
+        use_cache = SIDECAR_CACHE
+    if not use_cache:
+        yield from _iter_csv(path)
+        return
+
+    cache = csv_cache.open_cache(path)
+    if cache is not None:
+        with cache:
+            yield from cache
+        return
+
+    signature = csv_cache.csv_signature(path)
+    builder = csv_cache.ColumnBuilder()
+    for b in _iter_csv(path):
+        builder.append(b)
+        yield b
+    # אם הקובץ השתנה בזמן הקריאה - לא שומרים מטמון שלא תואם לו
+    if signature is not None and csv_cache.csv_signature(path) == signature:
+        builder.write(path, signature)
+
+
+def _iter_journal(journal_path):
+    """
+    מחזיר את רשומות היומן כשורות (op, id, title, author, pages, price)
+    """
+    if not journal_path.exists():
+        return
+
+    with journal_path.open(mode="r", newline="", encoding="utf-8") as f:
+        data = f.read()
+    # שורה אחרונה בלי ירידת שורה = כתיבה שנקטעה באמצע, מתעלמים ממנה
+    if not data.endswith("\n"):
+        data = data[: data.rfind("\n") + 1]
+
+    for line_no, row in enumerate(csv.reader(data.splitlines(keepends=True)), start=1):
+        if _valid_journal_row(row):
+            yield row
+        else:
+            warnings.warn(f"{journal_path}: שורה {line_no} ביומן לא תקינה, מדלגים עליה: {row!r}")
+
+
+def _valid_journal_row(row) -> bool:
+    if len(row) != len(JOURNAL_FIELDS) or row[0] not in ("add", "update", "delete"):
+        return False
+    try:
+        int(row[1])
+        if row[0] == "add":
+            int(row[4])
+        if row[0] != "delete":
+            float(row[5])
+    except ValueError:
+        return False
+    return True
+
+
+def _append_journal(journal_path, row):
+    """
+    מוסיף שורה ליומן. אם הקובץ לא נגמר בירידת שורה (כתיבה קודמת נקטעה)
+    השארית נחתכת קודם - אחרת השורה החדשה הייתה נדבקת אליה ונאבדת.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    with journal_path.open(mode="a+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                f.seek(0)
+                data = f.read()
+                f.truncate(data.rfind(b"\n") + 1)
+        f.write(buffer.getvalue().encode("utf-8"))
+
+
+def _journal_book(row):
+    return {
+        "id": int(row[1]),
+        "title": row[2],
+        "author": row[3],
+        "pages": int(row[4]),
+        "price": float(row[5]),
+    }
 
-    return books
 
+def _replay_journal(by_id, journal_path):
+    """
+    מחיל את רשומות היומן (add / update / delete) על מילון ספרים לפי id.
+    ההחלה אידמפוטנטית, כך שאפשר להריץ אותה שוב על קובץ שכבר קופל.
+    מחזיר כמה רשומות הוחלו.
+    """
+    count = 0
+    for row in _iter_journal(journal_path):
+        op, book_id = row[0], int(row[1])
+        if op == "add":
+            by_id[book_id] = _journal_book(row)
+        elif op == "update":
+            if book_id in by_id:
+                by_id[book_id]["price"] = float(row[5])
+        elif op == "delete":
+            by_id.pop(book_id, None)
+        count += 1
+    return count
+
+
+def _journal_overlay(journal_path):
+    """
+    מסכם את היומן לשינוי סופי אחד לכל id, כדי להחיל אותו על קריאה זורמת:
+    ("set", book) / ("price", new_price) / ("delete", None)
+    """
+    overlay = {}
+    for row in _iter_journal(journal_path):
+        op, book_id = row[0], int(row[1])
+        if op == "add":
+            overlay[book_id] = ("set", _journal_book(row))
+        elif op == "update":
+            kind, value = overlay.get(book_id, ("price", None))
+            if kind == "set":
+                value["price"] = float(row[5])
+            elif kind == "price":
+                overlay[book_id] = ("price", float(row[5]))
+        elif op == "delete":
+            overlay[book_id] = ("delete", None)
+    return overlay
+
+
+def _iter_records(path, use_cache=None):
+    overlay = _journal_overlay(journal_path_for(path))
+    if path.exists():
+        for b in _iter_base(path, use_cache):
+            change = overlay.pop(b["id"], None)
+            if change is None:
+                yield b
+                continue
+            kind, value = change
+            if kind == "set":
+                yield value
+            elif kind == "price":
+                b["price"] = value
+                yield b
+
+    # ספרים שנוספו ביומן ועדיין לא קופלו לקובץ הראשי
+    for kind, value in overlay.values():
+        if kind == "set":
+            yield value
+
+
+def iter_books(chunk_size: int = None, path=None, use_cache=None):
+    """
+    מעבר זורם על הספרים בלי לטעון את כל הקובץ לזיכרון.
+    chunk_size=None - מחזיר ספר (מילון) אחד בכל פעם,
+    אחרת - רשימות של עד chunk_size ספרים.
+    הזיכרון תלוי רק בגודל היומן שטרם קופל, לא בגודל הקובץ.
+    use_cache - שימוש במטמון הבינארי (ברירת מחדל: SIDECAR_CACHE).
+    """
+    path = CSV_FILE if path is None else Path(path)
+    records = _iter_records(path, use_cache)
+    if chunk_size is None:
+        yield from records
+        return
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size חייב להיות >= 1")
+    chunk = []
+    for b in records:
+        chunk.append(b)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
-def save_books(books):
+
+def load_books(path=None, use_cache=None):
+    """
+    קורא את כל הספרים מה-CSV ומחזיר רשימה של מילונים
+    (כולל שינויים שעדיין נמצאים ביומן)
+    """
+    return list(iter_books(path=path, use_cache=use_cache))
+
+
+def save_books(books, path=None):
     """
     שומר רשימת ספרים (מילונים) חזרה ל-CSV
-    מוחק תוכן קודם וכותב מחדש
-    """
-    with CSV_FILE.open(mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-        writer.writeheader()
-        for b in books:
-            writer.writerow(
-                {
-                    "id": b["id"],
-                    "title": b["title"],
-                    "author": b["author"],
-                    "pages": b["pages"],
-                    "price": b["price"],
-                }
-            )
+    כותב לקובץ זמני ואז מחליף (rename) - כך שהקובץ אף פעם לא נשאר חצי כתוב.
+    הרשימה היא המצב המלא, ולכן יומן קיים נמחק אחרי ההחלפה.
+    """
+    path = CSV_FILE if path is None else Path(path)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            for b in books:
+                writer.writerow(
+                    {
+                        "id": b["id"],
+                        "title": b["title"],
+                        "author": b["author"],
+                        "pages": b["pages"],
+                        "price": b["price"],
+                    }
+                )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    journal = journal_path_for(path)
+    if journal.exists():
+        journal.unlink()
 
 
 def get_next_id(books):
@@ -54,24 +274,332 @@ def get_next_id(books):
     return max(b["id"] for b in books) + 1
 
 
-def add_book(title: str, author: str, pages: int, price: float):
+class BookStore:
     """
-    הוספת ספר חדש ל-CSV
+    מאגר ספרים בזיכרון מעל קובץ ה-CSV.
+    הקובץ נטען פעם אחת, ונשמרים אינדקסים לפי id ולפי כותרת
+    וה-id המקסימלי, כך שחיפוש בודד הוא O(1).
+    בנוסף רשימות ממוינות של (price, id) ו-(pages, id) לשאילתות טווח
+    עם bisect ולזול / יקר ביותר ב-O(1). הן מתעדכנות בכל שינוי (insort),
+    ונבנות מחדש (sort אחד) רק בטעינה.
+    אם הקובץ (או היומן) השתנה בדיסק (mtime / גודל) - נטען מחדש.
+
+    journal=True - כל שינוי נכתב כשורה אחת ביומן, והקובץ הראשי נכתב מחדש
+    רק בקיפול (compact) כשהיומן עובר את סף הגודל או היחס למספר השורות.
+    background_compaction=True - הקיפול רץ ב-thread נפרד.
+    use_cache - טעינה דרך המטמון הבינארי (ברירת מחדל: SIDECAR_CACHE).
     """
-    books = load_books()
-    new_id = get_next_id(books)
 
-    new_book = {
-        "id": new_id,
-        "title": title,
-        "author": author,
-        "pages": pages,
-        "price": price,
-    }
+    def __init__(
+        self,
+        path=None,
+        journal: bool = False,
+        journal_max_bytes: int = JOURNAL_MAX_BYTES,
+        journal_max_ratio: float = JOURNAL_MAX_RATIO,
+        background_compaction: bool = False,
+        use_cache: bool = None,
+    ):
+        self.path = CSV_FILE if path is None else Path(path)
+        self.journal_path = journal_path_for(self.path)
+        self.journal = journal
+        self.journal_max_bytes = journal_max_bytes
+        self.journal_max_ratio = journal_max_ratio
+        self.background_compaction = background_compaction
+        self.use_cache = use_cache
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._by_id = {}
+        self._by_title = {}
+        self._by_price = []
+        self._by_pages = []
+        self._max_id = 0
+        self._base_rows = 0
+        self._journal_records = 0
+        self._signature = None
+        self._loaded = False
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _file_signature(self):
+        return (self._stat(self.path), self._stat(self.journal_path))
+
+    @staticmethod
+    def _sorted_remove(items, key):
+        i = bisect.bisect_left(items, key)
+        if i < len(items) and items[i] == key:
+            del items[i]
+
+    def _index(self, book, sorted_indexes=True):
+        self._by_id[book["id"]] = book
+        self._by_title.setdefault(book["title"], {})[book["id"]] = None
+        if book["id"] > self._max_id:
+            self._max_id = book["id"]
+        if sorted_indexes:
+            bisect.insort(self._by_price, (book["price"], book["id"]))
+            bisect.insort(self._by_pages, (book["pages"], book["id"]))
+
+    def _unindex(self, book):
+        del self._by_id[book["id"]]
+        ids = self._by_title[book["title"]]
+        del ids[book["id"]]
+        if not ids:
+            del self._by_title[book["title"]]
+        if book["id"] == self._max_id:
+            self._max_id = max(self._by_id, default=0)
+        self._sorted_remove(self._by_price, (book["price"], book["id"]))
+        self._sorted_remove(self._by_pages, (book["pages"], book["id"]))
+
+    def reload(self):
+        """
+        טעינה מלאה של הקובץ + היומן ובניית האינדקסים מחדש
+        """
+        with self._lock:
+            self._by_id = {}
+            self._by_title = {}
+            self._by_price = []
+            self._by_pages = []
+            self._max_id = 0
+            self._signature = self._file_signature()
+            by_id = {}
+            if self.path.exists():
+                by_id = {b["id"]: b for b in _iter_base(self.path, self.use_cache)}
+            self._base_rows = len(by_id)
+            self._journal_records = _replay_journal(by_id, self.journal_path)
+            for b in by_id.values():
+                self._index(b, sorted_indexes=False)
+            self._by_price = sorted((b["price"], b["id"]) for b in by_id.values())
+            self._by_pages = sorted((b["pages"], b["id"]) for b in by_id.values())
+            self._loaded = True
+
+    def _ensure_fresh(self):
+        if not self._loaded or self._file_signature() != self._signature:
+            self.reload()
+
+    def _save(self, op, book):
+        if not self.journal:
+            save_books(self._by_id.values(), self.path)
+            self._base_rows = len(self._by_id)
+            self._journal_records = 0
+            self._signature = self._file_signature()
+            return
+
+        _append_journal(
+            self.journal_path,
+            [
+                op,
+                book["id"],
+                book["title"] if op == "add" else "",
+                book["author"] if op == "add" else "",
+                book["pages"] if op == "add" else "",
+                book["price"] if op != "delete" else "",
+            ],
+        )
+        self._journal_records += 1
+        self._signature = self._file_signature()
+        self._maybe_compact()
+
+    def _needs_compaction(self):
+        size = self._stat(self.journal_path)
+        if size is not None and size[1] >= self.journal_max_bytes:
+            return True
+        limit = self.journal_max_ratio * max(self._base_rows, JOURNAL_MIN_RECORDS)
+        return self._journal_records >= limit
+
+    def _maybe_compact(self):
+        if not self._needs_compaction():
+            return
+        if not self.background_compaction:
+            self.compact()
+            return
+        if self._compactor is None or not self._compactor.is_alive():
+            self._compactor = threading.Thread(target=self.compact, daemon=True)
+            self._compactor.start()
+
+    def compact(self):
+        """
+        מקפל את היומן לתוך books.csv (כתיבה לקובץ זמני + rename).
+        הכתיבה עצמה נעשית מחוץ לנעילה; רשומות שנוספו ליומן בזמן הקיפול
+        נשמרות ביומן החדש.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            if not self.journal_path.exists():
+                return
+            snapshot = [dict(b) for b in self._by_id.values()]
+            covered_bytes = self.journal_path.stat().st_size
+            covered_records = self._journal_records
+
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, mode="w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writeheader()
+                writer.writerows(snapshot)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self._lock:
+                with self.journal_path.open(mode="rb") as f:
+                    f.seek(covered_bytes)
+                    tail = f.read()
+                os.replace(tmp_name, self.path)
+                if tail:
+                    tmp_journal = self.journal_path.with_name(
+                        self.journal_path.name + ".tmp"
+                    )
+                    tmp_journal.write_bytes(tail)
+                    os.replace(tmp_journal, self.journal_path)
+                else:
+                    self.journal_path.unlink()
+                self._base_rows = len(snapshot)
+                self._journal_records -= covered_records
+                self._signature = self._file_signature()
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def wait_for_compaction(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def all(self):
+        with self._lock:
+            self._ensure_fresh()
+            return [dict(b) for b in self._by_id.values()]
+
+    def get(self, book_id: int):
+        with self._lock:
+            self._ensure_fresh()
+            book = self._by_id.get(book_id)
+            return dict(book) if book is not None else None
+
+    def title_exists(self, title: str) -> bool:
+        with self._lock:
+            self._ensure_fresh()
+            return title in self._by_title
+
+    def add(self, title: str, author: str, pages: int, price: float):
+        with self._lock:
+            self._ensure_fresh()
+            book = {
+                "id": self._max_id + 1,
+                "title": title,
+                "author": author,
+                "pages": pages,
+                "price": price,
+            }
+            self._index(book)
+            self._save("add", book)
+            return dict(book)
+
+    def update_price(self, book_id: int, new_price: float) -> bool:
+        with self._lock:
+            self._ensure_fresh()
+            book = self._by_id.get(book_id)
+            if book is None:
+                return False
+            self._sorted_remove(self._by_price, (book["price"], book_id))
+            book["price"] = new_price
+            bisect.insort(self._by_price, (new_price, book_id))
+            self._save("update", book)
+            return True
+
+    def delete(self, book_id: int) -> bool:
+        with self._lock:
+            self._ensure_fresh()
+            book = self._by_id.get(book_id)
+            if book is None:
+                return False
+            self._unindex(book)
+            self._save("delete", book)
+            return True
+
+    def _books(self, keys):
+        return [dict(self._by_id[book_id]) for _, book_id in keys]
+
+    def by_price(self, min_price=None, max_price=None, include_max: bool = True):
+        """
+        ספרים עם min_price <= price <= max_price (או < אם include_max=False),
+        ממוינים מהזול ליקר. None - בלי גבול.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            items = self._by_price
+            lo = 0 if min_price is None else bisect.bisect_left(items, (min_price,))
+            if max_price is None:
+                hi = len(items)
+            elif include_max:
+                hi = bisect.bisect_right(items, (max_price, float("inf")))
+            else:
+                hi = bisect.bisect_left(items, (max_price,))
+            return self._books(items[lo:hi])
+
+    def by_pages(self, min_pages=None, max_pages=None):
+        """
+        ספרים עם min_pages <= pages <= max_pages, ממוינים לפי מספר העמודים
+        """
+        with self._lock:
+            self._ensure_fresh()
+            items = self._by_pages
+            lo = 0 if min_pages is None else bisect.bisect_left(items, (min_pages,))
+            hi = len(items) if max_pages is None else bisect.bisect_right(items, (max_pages, float("inf")))
+            return self._books(items[lo:hi])
+
+    def cheapest(self):
+        with self._lock:
+            self._ensure_fresh()
+            return self._books(self._by_price[:1])[0] if self._by_price else None
+
+    def most_expensive(self):
+        with self._lock:
+            self._ensure_fresh()
+            return self._books(self._by_price[-1:])[0] if self._by_price else None
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_fresh()
+            return len(self._by_id)
+
+
+_store = None
+
+
+def get_store() -> BookStore:
+    """
+    מחזיר את המאגר המשותף של המודול (נוצר מחדש אם CSV_FILE שונה)
+    """
+    global _store
+    if _store is None or _store.path != Path(CSV_FILE):
+        _store = BookStore(CSV_FILE, journal=JOURNAL_MODE)
+    return _store
+
+
+def _loaded_store():
+    """
+    המאגר המשותף אם כבר נטען לזיכרון, אחרת None
+    (ואז עדיף לסרוק את הקובץ בזרימה ולעצור בהתאמה הראשונה)
+    """
+    if _store is not None and _store._loaded and _store.path == Path(CSV_FILE):
+        return _store
+    return None
+
 
-    books.append(new_book)
-    save_books(books)
-    print(f"נוסף ספר חדש עם id={new_id}")
+def add_book(title: str, author: str, pages: int, price: float):
+    """
+    הוספת ספר חדש ל-CSV
+    """
+    new_book = get_store().add(title, author, pages, price)
+    print(f"נוסף ספר חדש עם id={new_book['id']}")
     return new_book
 
 
@@ -79,8 +607,11 @@ def get_book_by_id(book_id: int):
     """
     החזרת ספר לפי ID
     """
-    books = load_books()
-    for b in books:
+    store = _loaded_store()
+    if store is not None:
+        return store.get(book_id)
+
+    for b in iter_books():
         if b["id"] == book_id:
             return b
     return None
@@ -90,35 +621,26 @@ def show_all_books():
     """
     הדפסת כל הספרים
     """
-    books = load_books()
-    if not books:
-        print("אין ספרים בקובץ.")
-        return
-
-    for b in books:
+    found = False
+    for b in iter_books():
+        found = True
         print(
             f"ID: {b['id']} | כותרת: {b['title']} | מחבר: {b['author']} | "
             f"עמודים: {b['pages']} | מחיר: {b['price']}"
         )
 
+    if not found:
+        print("אין ספרים בקובץ.")
+
 
 def update_book_price(book_id: int, new_price: float):
     """
     עדכון מחיר ספר לפי ID
     """
-    books = load_books()
-    found = False
-    for b in books:
-        if b["id"] == book_id:
-            b["price"] = new_price
-            found = True
-            break
-
-    if not found:
+    if not get_store().update_price(book_id, new_price):
         print(f"ספר עם ID {book_id} לא נמצא.")
         return False
 
-    save_books(books)
     print(f"עודכן מחיר הספר ID={book_id} ל-{new_price}")
     return True
 
@@ -127,24 +649,92 @@ def delete_book(book_id: int):
     """
     מחיקת ספר לפי ID
     """
-    books = load_books()
-    new_books = [b for b in books if b["id"] != book_id]
-
-    if len(new_books) == len(books):
+    if not get_store().delete(book_id):
         print(f"ספר עם ID {book_id} לא נמצא, לא נמחק.")
         return False
 
-    save_books(new_books)
     print(f"ספר עם ID={book_id} נמחק.")
     return True
 
 
+def get_cheap_books(max_price: float):
+    """
+    ספרים מתחת למחיר מסוים, מהזול ליקר
+    """
+    books = get_store().by_price(max_price=max_price, include_max=False)
+    if not books:
+        print(f"לא נמצאו ספרים מתחת למחיר {max_price}.")
+        return []
+
+    for b in books:
+        print(f"{b['id']}: {b['title']} - {b['price']}")
+    return books
+
+
+def get_long_books(min_pages: int):
+    """
+    ספרים עם לפחות min_pages עמודים, מהארוך לקצר
+    """
+    books = get_store().by_pages(min_pages=min_pages)
+    books.reverse()
+    if not books:
+        print(f"לא נמצאו ספרים עם יותר מ-{min_pages} עמודים.")
+        return []
+
+    for b in books:
+        print(f"{b['id']}: {b['title']} - {b['pages']} עמודים")
+    return books
+
+
+def books_in_price_range(min_price: float, max_price: float):
+    """
+    ספרים בטווח מחירים (כולל הקצוות), מהזול ליקר
+    """
+    books = get_store().by_price(min_price, max_price)
+    if not books:
+        print(f"לא נמצאו ספרים בטווח מחירים {min_price} - {max_price}.")
+        return []
+
+    for b in books:
+        print(f"{b['id']}: {b['title']} - {b['price']}")
+    return books
+
+
+def get_most_expensive_book():
+    """
+    הספר היקר ביותר
+    """
+    book = get_store().most_expensive()
+    if book is None:
+        print("אין ספרים בקובץ.")
+        return None
+
+    print(f"הספר היקר ביותר: {book['title']} - {book['price']}")
+    return book
+
+
+def get_cheapest_book():
+    """
+    הספר הזול ביותר
+    """
+    book = get_store().cheapest()
+    if book is None:
+        print("אין ספרים בקובץ.")
+        return None
+
+    print(f"הספר הזול ביותר: {book['title']} - {book['price']}")
+    return book
+
+
 def book_exists(title: str) -> bool:
     """
     בדיקה אם קיים ספר עם כותרת מסוימת
     """
-    books = load_books()
-    for b in books:
+    store = _loaded_store()
+    if store is not None:
+        return store.title_exists(title)
+
+    for b in iter_books():
         if b["title"] == title:
             return True
     return False
@@ -1,8 +1,15 @@
 from typing import Optional
-from sqlmodel import SQLModel, Session, create_engine, select, Field
+from sqlmodel import SQLModel, Session, select, Field
+
+from app.db import get_engine
 
 DB_URL = "mysql+pymysql://root@localhost:3306/test"
-engine = create_engine(DB_URL, echo=True)
+
+
+def _engine():
+    # engine משותף לפי settings.json (pool, echo) - DB_URL הוא ברירת המחדל.
+    # נוצר בשימוש הראשון, לא ב-import
+    return get_engine(DB_URL)
 
 
 class Book(SQLModel, table=True):
@@ -15,11 +22,13 @@ class Book(SQLModel, table=True):
     price: Optional[float] = Field(default=None)
 
 
-SQLModel.metadata.create_all(engine)
+def init_db():
+    # יצירת הטבלה אם לא קיימת - קוראים פעם אחת לפני השימוש
+    SQLModel.metadata.create_all(_engine(), tables=[Book.__table__])
 
 
 def add_book(title: str, author: str, pages: int, price: float):
-    with Session(engine) as session:
+    with Session(_engine()) as session:
         book = Book(title=title, author=author, pages=pages, price=price)
         session.add(book)
         session.commit()
@@ -28,7 +37,7 @@ def add_book(title: str, author: str, pages: int, price: float):
 
 
 def show_all_books():
-    with Session(engine) as session:
+    with Session(_engine()) as session:
         books = session.exec(select(Book)).all()
         print(books)
 
@@ -43,7 +52,7 @@ def show_all_books():
         )
 
 def get_book_by_id(book_id: int):
-    with Session(engine) as session:
+    with Session(_engine()) as session:
         book = session.get(Book, book_id)
     if book is None:
         print("error: book not found")
@@ -52,7 +61,7 @@ def get_book_by_id(book_id: int):
 
 
 def update_book_price(book_id, new_price):
-    with Session(engine) as session:
+    with Session(_engine()) as session:
         book = session.get(Book, book_id)
     if book is None:
         print("error: book not found")
@@ -65,7 +74,7 @@ def update_book_price(book_id, new_price):
 
 
 def delete_book(book_id):
-    with Session(engine) as session:
+    with Session(_engine()) as session:
         book = session.get(Book, book_id)
     if book is None:
         print("error: book not found")
@@ -75,24 +84,75 @@ def delete_book(book_id):
         print(book)
 
 def count_books():
-     with Session(engine) as session:
+     with Session(_engine()) as session:
         books = session.exec(select(Book)).all()
         return len(books)
 
 
-def add_books_from_list(books):
-    addd = 0
-    
-    for title, author, pages , price in books:
-        add_book(title,author,pages,price)
-        addd+=1
-    return addd
+def add_books_batched(books, batch_size: int = 500, return_ids: bool = False):
+    """
+    הוספת הרבה ספרים ב-Session אחד, עם commit אחד לכל batch_size ספרים
+    (במקום Session + commit + refresh לכל ספר).
+    return_ids=True - flush לפני ה-commit כדי לקבל את ה-ids, בלי refresh.
+    אם batch נכשל - רק הוא מבוטל (rollback), והשורות שלו נוספות שוב
+    אחת-אחת כדי לדעת בדיוק איזו שורה נכשלה.
+    מחזיר {"added": n, "ids": [...], "failed": [(index, row, error), ...]}
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    result = {"added": 0, "ids": [], "failed": []}
+
+    def commit_batch(session, batch):
+        objs = []
+        for index, row in batch:
+            title, author, pages, price = row
+            objs.append(Book(title=title, author=author, pages=pages, price=price))
+        session.add_all(objs)
+        if return_ids:
+            session.flush()
+            ids = [b.id for b in objs]
+        session.commit()
+        result["added"] += len(objs)
+        if return_ids:
+            result["ids"].extend(ids)
+
+    with Session(_engine()) as session:
+        def run(batch):
+            try:
+                commit_batch(session, batch)
+            except Exception as e:
+                session.rollback()
+                if len(batch) == 1:
+                    index, row = batch[0]
+                    result["failed"].append((index, row, str(e)))
+                    return
+                for item in batch:
+                    run([item])
+
+        batch = []
+        for index, row in enumerate(books):
+            batch.append((index, row))
+            if len(batch) == batch_size:
+                run(batch)
+                batch = []
+        if batch:
+            run(batch)
+
+    return result
+
+
+def add_books_from_list(books, batch_size: int = 500):
+    result = add_books_batched(books, batch_size)
+    for index, row, error in result["failed"]:
+        print(f"error: row {index} {row} failed: {error}")
+    return result["added"]
 
 
 
 def book_exists(title: str) -> bool:
     
-    with Session(engine) as session:
+    with Session(_engine()) as session:
         stmt = select(Book).where(Book.title == title)
         result = session.exec(stmt).first()
 
@@ -102,20 +162,9 @@ def book_exists(title: str) -> bool:
         return True
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-# add_book("daniel", "ddd", 300, 500.5)
-# delete_book(1)
-books=[("ssss","aaaaa",400 , 79.90 ) ,("gek","flask",322,3213.80)]
-print(add_books_from_list(books))
+if __name__ == "__main__":
+    init_db()
+    # add_book("daniel", "ddd", 300, 500.5)
+    # delete_book(1)
+    books=[("ssss","aaaaa",400 , 79.90 ) ,("gek","flask",322,3213.80)]
+    print(add_books_from_list(books))
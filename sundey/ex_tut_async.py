@@ -0,0 +1,459 @@
+import time
+from typing import Optional, Iterable
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import ex_tut
+from app.db import get_async_engine
+from ex_tut import (
+    Book,
+    DB_URL,
+    _available_stmt,
+    _average_price_stmt,
+    _book_removed,
+    _books_added,
+    _books_bulk_added,
+    _bulk_insert_rows,
+    _by_author_stmt,
+    _by_ids_stmts,
+    _by_price_stmt,
+    _cached_copy,
+    _cheap_books_stmt,
+    _count_stmt,
+    _create_books_table,
+    _in_order,
+    _invalidate_book,
+    _isbn_stmt,
+    _long_books_stmt,
+    _page_stmt,
+    _price_range_stmt,
+    _print_bulk_result,
+    _save_stats_snapshot,
+    _seek_page,
+    _seek_stmt,
+    _sorted_by_length_stmt,
+    _stats_from_row,
+    _stats_from_snapshot,
+    _stats_stmt,
+    _title_exists_stmt,
+)
+from search_index import TrigramIndex
+
+# ---------------------------------------------------------
+# גרסה אסינכרונית (asyncio) של הפונקציות ב-ex_tut.py
+# אותן חתימות ואותה התנהגות, רק עם await – כדי ש-FastAPI
+# לא יתפוס thread לכל פנייה ל-DB.
+# ה-URL מומר לדרייבר אסינכרוני (aiomysql / aiosqlite) לפי app/db.py
+# השאילתות, הוולידציה, מטמון ה-read-through (ex_tut.book_cache),
+# אינדקס החיפוש ותמונת המצב של catalog_stats – משותפים עם ex_tut,
+# כך ששתי הגרסאות מחזירות אותן תוצאות באותה טריות.
+# ---------------------------------------------------------
+
+
+
+def _engine():
+    # AsyncEngine משותף - נוצר בשימוש הראשון, לא ב-import
+    return get_async_engine(DB_URL)
+
+
+def _session() -> AsyncSession:
+    # בלי expire_on_commit – אחרי commit אסור לטעון שדות בעצלות ב-async
+    return AsyncSession(_engine(), expire_on_commit=False)
+
+
+async def init_db() -> None:
+    """
+    יצירת הטבלה ב-DB אם לא קיימת (כמו ex_tut.init_db)
+    """
+    async with _engine().begin() as conn:
+        await conn.run_sync(_create_books_table)
+
+
+# ---------------------------------------------------------
+# אינדקס חיפוש – האינדקס של ex_tut, נבנה כאן אם עוד לא נבנה
+# ---------------------------------------------------------
+
+async def rebuild_search_index() -> TrigramIndex:
+    index = TrigramIndex()
+    async with _session() as session:
+        result = await session.exec(select(Book.id, Book.title, Book.author))
+        for book_id, title, author in result:
+            index.add(book_id, title, author)
+    ex_tut._search_index = index
+    return index
+
+
+# ---------------------------------------------------------
+# חלק 1 – פונקציות CRUD בסיסיות
+# ---------------------------------------------------------
+
+async def add_book(title: str, author: str, pages: int, price: float) -> Book:
+    async with _session() as session:
+        book = Book(
+            title=title,
+            author=author,
+            pages=pages,
+            price=price
+        )
+        session.add(book)
+        await session.commit()
+        await session.refresh(book)
+        _books_added([(book.id, book.title, book.author)])
+        print(f"נוסף ספר חדש עם id={book.id}")
+        return book
+
+
+async def show_all_books() -> None:
+    async with _session() as session:
+        books = (await session.exec(select(Book))).all()
+
+    if not books:
+        print("אין ספרים במערכת.")
+        return
+
+    for b in books:
+        print(
+            f"ID: {b.id} | כותרת: {b.title} | מחבר: {b.author} | "
+            f"עמודים: {b.pages} | מחיר: {b.price}"
+        )
+
+
+async def get_book_by_id(book_id: int) -> Optional[Book]:
+    async def load():
+        async with _session() as session:
+            return await session.get(Book, book_id)
+
+    book = await ex_tut.book_cache.get_or_load_async(("id", book_id), load)
+
+    if book is None:
+        print(f"ספר עם ID {book_id} לא נמצא.")
+        return None
+    book = _cached_copy(book)
+
+    print(
+        f"ID: {book.id} | כותרת: {book.title} | מחבר: {book.author} | "
+        f"עמודים: {book.pages} | מחיר: {book.price}"
+    )
+    return book
+
+
+async def update_book_price(book_id: int, new_price: float) -> bool:
+    async with _session() as session:
+        book = await session.get(Book, book_id)
+        if book is None:
+            print(f"ספר עם ID {book_id} לא נמצא.")
+            return False
+
+        book.price = new_price
+        session.add(book)
+        await session.commit()
+        await session.refresh(book)
+        _invalidate_book(book.id, author=book.author)
+        print(f"עודכן מחיר הספר ID={book.id} ל-{book.price}")
+        return True
+
+
+async def delete_book(book_id: int) -> bool:
+    async with _session() as session:
+        book = await session.get(Book, book_id)
+        if book is None:
+            print(f"ספר עם ID {book_id} לא נמצא, לא נמחק.")
+            return False
+
+        await session.delete(book)
+        await session.commit()
+        _book_removed(book_id, book.title, book.author)
+        print(f"ספר עם ID={book_id} נמחק בהצלחה.")
+        return True
+
+
+async def count_books() -> int:
+    async with _session() as session:
+        count = (await session.exec(_count_stmt())).one()
+
+    print(f"יש {count} ספרים במערכת.")
+    return count
+
+
+async def add_books_from_list(books_list: Iterable[tuple[str, str, int, float]]) -> int:
+    added = 0
+    async with _session() as session:
+        books = []
+        for title, author, pages, price in books_list:
+            book = Book(
+                title=title,
+                author=author,
+                pages=pages,
+                price=price
+            )
+            session.add(book)
+            books.append(book)
+            added += 1
+        await session.flush()
+        rows = [(b.id, b.title, b.author) for b in books]
+        await session.commit()
+    _books_added(rows)
+
+    print(f"הוספו {added} ספרים חדשים.")
+    return added
+
+
+async def book_exists(title: str) -> bool:
+    async def load():
+        async with _session() as session:
+            return (await session.exec(_title_exists_stmt(title))).first() is not None
+
+    exists = await ex_tut.book_cache.get_or_load_async(("title", title), load)
+    print(f"האם הספר '{title}' קיים? {exists}")
+    return exists
+
+
+# ---------------------------------------------------------
+# חלק 2 – חיפושים ומיונים
+# ---------------------------------------------------------
+
+async def find_books_by_author(author_name: str):
+    async def load():
+        async with _session() as session:
+            return (await session.exec(_by_author_stmt(author_name))).all()
+
+    cached = await ex_tut.book_cache.get_or_load_async(("author", author_name), load)
+    books = [_cached_copy(b) for b in cached]
+
+    if not books:
+        print(f"לא נמצאו ספרים של המחבר: {author_name}")
+        return []
+
+    for b in books:
+        print(f"{b.id}: {b.title} ({b.price})")
+    return books
+
+
+async def get_cheap_books(max_price: float):
+    async with _session() as session:
+        books = (await session.exec(_cheap_books_stmt(max_price))).all()
+
+    if not books:
+        print(f"לא נמצאו ספרים מתחת למחיר {max_price}.")
+        return []
+
+    for b in books:
+        print(f"{b.id}: {b.title} - {b.price}")
+    return books
+
+
+async def get_long_books(min_pages: int):
+    async with _session() as session:
+        books = (await session.exec(_long_books_stmt(min_pages))).all()
+
+    if not books:
+        print(f"לא נמצאו ספרים עם יותר מ-{min_pages} עמודים.")
+        return []
+
+    for b in books:
+        print(f"{b.id}: {b.title} - {b.pages} עמודים")
+    return books
+
+
+async def search_books(keyword: str, include_author: bool = False):
+    index = ex_tut._search_index
+    if index is None:
+        index = await rebuild_search_index()
+    fields = ("title", "author") if include_author else ("title",)
+    ids = index.search(keyword, fields=fields)
+
+    loaded = []
+    async with _session() as session:
+        for stmt in _by_ids_stmts(ids):
+            loaded.extend(await session.exec(stmt))
+    books = _in_order(ids, loaded)
+
+    if not books:
+        print(f"לא נמצאו ספרים שהכותרת שלהם מכילה את: {keyword}")
+        return []
+
+    for b in books:
+        print(f"{b.id}: {b.title}")
+    return books
+
+
+async def books_in_price_range(min_price: float, max_price: float):
+    async with _session() as session:
+        books = (await session.exec(_price_range_stmt(min_price, max_price))).all()
+
+    if not books:
+        print(f"לא נמצאו ספרים בטווח מחירים {min_price} - {max_price}.")
+        return []
+
+    for b in books:
+        print(f"{b.id}: {b.title} - {b.price}")
+    return books
+
+
+async def get_most_expensive_book() -> Optional[Book]:
+    async with _session() as session:
+        book = (await session.exec(_by_price_stmt(descending=True))).first()
+
+    if book is None:
+        print("אין ספרים במערכת.")
+        return None
+
+    print(f"הספר היקר ביותר: {book.title} - {book.price}")
+    return book
+
+
+async def get_cheapest_book() -> Optional[Book]:
+    async with _session() as session:
+        book = (await session.exec(_by_price_stmt(descending=False))).first()
+
+    if book is None:
+        print("אין ספרים במערכת.")
+        return None
+
+    print(f"הספר הזול ביותר: {book.title} - {book.price}")
+    return book
+
+
+async def calculate_average_price() -> Optional[float]:
+    async with _session() as session:
+        avg_price = (await session.exec(_average_price_stmt())).one()
+
+    if avg_price is None:
+        print("אין ספרים, אי אפשר לחשב ממוצע.")
+        return None
+
+    avg_value = float(avg_price)
+    print(f"המחיר הממוצע של כל הספרים הוא: {avg_value}")
+    return avg_value
+
+
+async def catalog_stats(max_age: float = 0) -> dict:
+    now = time.monotonic()
+    cached, generation = _stats_from_snapshot(max_age, now)
+    if cached is not None:
+        return cached
+
+    async with _session() as session:
+        stats = _stats_from_row((await session.exec(_stats_stmt())).one())
+    _save_stats_snapshot(now, stats, generation)
+    return dict(stats)
+
+
+async def get_books_sorted_by_length(ascending: bool = True):
+    async with _session() as session:
+        books = (await session.exec(_sorted_by_length_stmt(ascending))).all()
+
+    for b in books:
+        print(f"{b.id}: {b.title} - {b.pages} עמודים")
+    return books
+
+
+async def get_books_page(page_number: int, page_size: int = 10):
+    stmt = _page_stmt(page_number, page_size)
+    async with _session() as session:
+        books = (await session.exec(stmt)).all()
+
+    print(f"דף {page_number} (גודל דף {page_size}):")
+    for b in books:
+        print(f"{b.id}: {b.title}")
+    return books
+
+
+async def get_books_after(cursor: Optional[str] = None, page_size: int = 10,
+                          order_by: str = "id", descending: bool = False):
+    stmt = _seek_stmt(cursor, page_size, order_by, descending)
+    async with _session() as session:
+        books = (await session.exec(stmt)).all()
+    books, next_cursor = _seek_page(books, page_size, order_by, descending)
+
+    for b in books:
+        print(f"{b.id}: {b.title}")
+    return books, next_cursor
+
+
+# ---------------------------------------------------------
+# חלק 3 – הרחבות ל-Book (ISBN, מלאי וכו')
+# ---------------------------------------------------------
+
+async def add_book_with_isbn(title: str, author: str, pages: int,
+                             price: float, isbn: str) -> Optional[Book]:
+    async with _session() as session:
+        existing = (await session.exec(_isbn_stmt(isbn))).first()
+
+        if existing:
+            print(f"ISBN {isbn} כבר קיים עבור הספר: {existing.title}")
+            return None
+
+        book = Book(
+            title=title,
+            author=author,
+            pages=pages,
+            price=price,
+            isbn=isbn,
+        )
+        session.add(book)
+        await session.commit()
+        await session.refresh(book)
+        _books_added([(book.id, book.title, book.author)])
+        print(f"נוסף ספר חדש עם ISBN {isbn} ו-id={book.id}")
+        return book
+
+
+async def bulk_add_books(rows, chunk_size: int = 1000) -> dict:
+    """
+    כמו ex_tut.bulk_add_books – אותה לוגיקת חבילות, רצה על ה-Session
+    הסינכרוני שמאחורי ה-AsyncSession (run_sync)
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size חייב להיות >= 1")
+
+    result = {"inserted": 0, "skipped": 0, "failed": 0, "errors": []}
+    async with _session() as session:
+        await session.run_sync(_bulk_insert_rows, rows, chunk_size, result)
+
+    if result["inserted"]:
+        _books_bulk_added()
+    _print_bulk_result(result)
+    return result
+
+
+async def _set_in_stock(book_id: int, in_stock: bool) -> bool:
+    async with _session() as session:
+        book = await session.get(Book, book_id)
+        if book is None:
+            print(f"ספר עם ID {book_id} לא נמצא.")
+            return False
+
+        book.in_stock = in_stock
+        session.add(book)
+        await session.commit()
+        _invalidate_book(book_id, author=book.author)
+        return True
+
+
+async def mark_out_of_stock(book_id: int) -> bool:
+    if not await _set_in_stock(book_id, False):
+        return False
+    print(f"ספר ID={book_id} סומן כלא במלאי.")
+    return True
+
+
+async def mark_in_stock(book_id: int) -> bool:
+    if not await _set_in_stock(book_id, True):
+        return False
+    print(f"ספר ID={book_id} סומן כבמלאי.")
+    return True
+
+
+async def get_available_books():
+    async with _session() as session:
+        books = (await session.exec(_available_stmt())).all()
+
+    if not books:
+        print("אין ספרים זמינים במלאי.")
+        return []
+
+    for b in books:
+        print(f"{b.id}: {b.title} (במלאי)")
+    return books
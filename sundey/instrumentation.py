@@ -0,0 +1,259 @@
+"""
+מדידת זמני שאילתות על ה-engine של SQLAlchemy + דקורטור timed לפונקציות.
+
+- instrument_engine(engine) - מאזין ל-before/after_cursor_execute ול-checkout
+  של ה-pool: היסטוגרמת זמנים ומספר שורות לכל "טביעת אצבע" של שאילתה
+  (ה-SQL בלי ערכים, רשימות IN מכווצות).
+- timed - אותה מדידה לכל קריאה לפונקציה, והשאילתות שרצות בתוכה
+  משויכות אליה ביומן השאילתות האיטיות.
+- שאילתה שלקחה יותר מ-slow_query_ms נשמרת ביומן האיטיות (100 האחרונות).
+- snapshot() מחזיר את הכול כמילון (לייצוא ל-JSON / לוג).
+
+כבוי כברירת מחדל. מופעל עם db_instrument ב-settings.json או
+משתנה סביבה DB_INSTRUMENT=1 (או enable() בזמן ריצה).
+כשהוא כבוי כל מאזין / עטיפה בודקים דגל אחד וחוזרים.
+ההגדרות נקראות בשימוש הראשון (instrument_engine / timed / enable / snapshot)
+ולא ב-import.
+"""
+import functools
+import re
+import threading
+import time
+from collections import deque
+from weakref import WeakSet
+
+from sqlalchemy import event
+
+from app.db import engine_settings, pool_metrics
+
+# גבולות עליונים של תאי ההיסטוגרמה (ms), האחרון - כל השאר
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+SLOW_LOG_SIZE = 100
+MAX_FINGERPRINTS = 1000
+
+_lock = threading.Lock()
+_local = threading.local()
+_engines = WeakSet()
+
+# None - עוד לא נקרא מ-settings.json (_load_settings)
+enabled = None
+slow_query_ms = None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_settings():
+    """
+    פעם אחת לתהליך. ערך שכבר נקבע עם enable / disable לא נדרס.
+    """
+    global enabled, slow_query_ms
+    settings = engine_settings()
+    if enabled is None:
+        enabled = bool(settings["db_instrument"])
+    if slow_query_ms is None:
+        slow_query_ms = float(settings["db_slow_query_ms"])
+
+
+class Histogram:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def record(self, ms: float, rows: int = None):
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if rows is not None and rows > 0:
+            self.rows += rows
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, q: float) -> float:
+        """
+        הערכה לפי התאים - הגבול העליון של התא שבו נמצא האחוזון
+        """
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= target and n:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "rows": self.rows,
+            "buckets": {str(b): n for b, n in zip(BUCKETS_MS, self.buckets) if n},
+        }
+
+
+_queries: dict = {}
+_functions: dict = {}
+_slow = deque(maxlen=SLOW_LOG_SIZE)
+_checkouts = 0
+
+_WS = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=MAX_FINGERPRINTS)
+def fingerprint(statement: str) -> str:
+    """
+    ה-SQL בלי ערכים: רווחים מכווצים, מחרוזות ומספרים -> ?, IN (?, ?, ...) -> IN (...)
+    """
+    text = _WS.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    return _IN_LIST.sub("IN (...)", text)
+
+
+def enable(threshold_ms: float = None):
+    global enabled, slow_query_ms
+    _load_settings()
+    if threshold_ms is not None:
+        slow_query_ms = float(threshold_ms)
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    global _checkouts
+    with _lock:
+        _queries.clear()
+        _functions.clear()
+        _slow.clear()
+        _checkouts = 0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if enabled:
+        conn.info.setdefault("instr_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not enabled:
+        return
+    starts = conn.info.get("instr_start")
+    if not starts:
+        # הופעל באמצע שאילתה
+        return
+    ms = (time.perf_counter() - starts.pop()) * 1000
+    rows = cursor.rowcount
+    key = fingerprint(statement)
+    with _lock:
+        hist = _queries.get(key)
+        if hist is None:
+            hist = _queries[key] = Histogram()
+        hist.record(ms, rows)
+        if ms >= slow_query_ms:
+            _slow.append(
+                {
+                    "time": time.time(),
+                    "ms": ms,
+                    "fingerprint": key,
+                    "rows": rows if rows >= 0 else None,
+                    "function": getattr(_local, "function", None),
+                }
+            )
+
+
+def _on_error(context):
+    # after_cursor_execute לא נקרא כשהשאילתה נכשלה
+    conn = context.connection
+    if conn is not None:
+        starts = conn.info.get("instr_start")
+        if starts:
+            starts.pop()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    global _checkouts
+    if enabled:
+        with _lock:
+            _checkouts += 1
+
+
+def instrument_engine(engine):
+    """
+    מחבר את המאזינים ל-engine (פעם אחת לכל engine)
+    """
+    _load_settings()
+    engine = getattr(engine, "sync_engine", engine)
+    if engine in _engines:
+        return engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _on_error)
+    event.listen(engine, "checkout", _on_checkout)
+    _engines.add(engine)
+    return engine
+
+
+def timed(fn):
+    """
+    מודד כל קריאה ל-fn (זמן + מספר שורות אם הוחזרה רשימה)
+    """
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if enabled is None:
+            _load_settings()
+        if not enabled:
+            return fn(*args, **kwargs)
+
+        outer = getattr(_local, "function", None)
+        _local.function = name
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            _local.function = outer
+            with _lock:
+                hist = _functions.get(name)
+                if hist is None:
+                    hist = _functions[name] = Histogram()
+                hist.record(ms)
+        if isinstance(result, list):
+            with _lock:
+                hist.rows += len(result)
+        return result
+
+    return wrapper
+
+
+def snapshot() -> dict:
+    _load_settings()
+    with _lock:
+        data = {
+            "enabled": enabled,
+            "slow_query_ms": slow_query_ms,
+            "checkouts": _checkouts,
+            "queries": {k: h.to_dict() for k, h in _queries.items()},
+            "functions": {k: h.to_dict() for k, h in _functions.items()},
+            "slow_queries": list(_slow),
+        }
+    data["pools"] = {
+        e.url.render_as_string(hide_password=True): pool_metrics(e) for e in list(_engines)
+    }
+    return data
@@ -0,0 +1,153 @@
+"""
+מטמון read-through בזיכרון: גודל מוגבל, פינוי LRU ו-TTL לכל רשומה.
+בטוח לשימוש מכמה threads.
+
+get_or_load(key, loader) מחזיר את הערך מהמטמון, ואם אין (או שפג תוקפו)
+קורא ל-loader ושומר את התוצאה. None לא נשמר - כך שפריט שלא נמצא
+ונוסף אחר כך לא "נתקע" כחסר.
+get_or_load_async - אותו דבר עם loader אסינכרוני (ex_tut_async).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize חייב להיות >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # עולה בכל invalidate / clear - טעינה שהתחילה לפני כן לא נשמרת
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def _lookup(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._data[key]
+            self.expirations += 1
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl else None
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def _store(self, key, value, expires_at):
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _begin_load(self, key):
+        """
+        (True, value) אם נמצא, אחרת (False, generation) לפני הטעינה
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return True, entry[0]
+            self.misses += 1
+            return False, self._generation
+
+    def _finish_load(self, key, value, generation, ttl):
+        if value is None:
+            return None
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl else None
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, value, expires_at)
+        return value
+
+    def get_or_load(self, key, loader, ttl: float = None):
+        found, value = self._begin_load(key)
+        if found:
+            return value
+        # הטעינה מחוץ לנעילה - פנייה איטית ל-DB לא חוסמת threads אחרים
+        return self._finish_load(key, loader(), value, ttl)
+
+    async def get_or_load_async(self, key, loader, ttl: float = None):
+        found, value = self._begin_load(key)
+        if found:
+            return value
+        return self._finish_load(key, await loader(), value, ttl)
+
+    def invalidate(self, *keys):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class NullCache:
+    """
+    מטמון "ריק" - כל קריאה הולכת ל-loader (לכיבוי המטמון)
+    """
+
+    def get(self, key, default=None):
+        return default
+
+    def set(self, key, value, ttl: float = None):
+        pass
+
+    def get_or_load(self, key, loader, ttl: float = None):
+        return loader()
+
+    async def get_or_load_async(self, key, loader, ttl: float = None):
+        return await loader()
+
+    def invalidate(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
@@ -0,0 +1,49 @@
+-- queries.sql
+-- השאילתות של סעיף א.4
+-- כל שאילתה מסומנת ב-"-- name:" וב-"-- uses:" (האינדקסים שהיא אמורה להשתמש בהם).
+-- python -m app.query_plans מריץ EXPLAIN על כל אחת ובודק את זה.
+
+USE workout_manager;
+
+-- name: workouts_by_email
+-- 1. כל האימונים של משתמש לפי email, מהחדש לישן
+-- uses: ix_workouts_user_date
+SELECT w.id, w.date, w.notes
+FROM users u
+JOIN workouts w ON w.user_id = u.id
+WHERE u.email = 'daniel@example.com'
+ORDER BY w.date DESC;
+
+-- name: workouts_per_user
+-- 2. כמה אימונים לכל משתמש
+-- uses: ix_workouts_user_date
+SELECT u.id, u.full_name, COUNT(w.id) AS total_workouts
+FROM users u
+LEFT JOIN workouts w ON w.user_id = u.id
+GROUP BY u.id, u.full_name;
+
+-- name: total_sets_by_exercise
+-- 3. כמה סטים של תרגיל מסוים בוצעו בסך הכול
+-- uses: ix_exercises_name, ix_workout_exercises_exercise
+SELECT SUM(we.sets) AS total_sets
+FROM exercises e
+JOIN workout_exercises we ON we.exercise_id = e.id
+WHERE e.name = 'Bench Press';
+
+-- name: distinct_exercises_per_user
+-- 4. כמה תרגילים שונים ביצע כל משתמש
+-- uses: ix_workouts_user_date, ix_workout_exercises_workout_exercise
+SELECT u.id, u.full_name, COUNT(DISTINCT e.name) AS distinct_exercises
+FROM users u
+LEFT JOIN workouts w ON w.user_id = u.id
+LEFT JOIN workout_exercises we ON we.workout_id = w.id
+LEFT JOIN exercises e ON e.id = we.exercise_id
+GROUP BY u.id, u.full_name;
+
+-- name: rows_per_muscle_group
+-- 5. כמה שורות ב-workout_exercises לכל קבוצת שרירים
+-- uses: ix_exercises_muscle_group, ix_workout_exercises_exercise
+SELECT e.muscle_group, COUNT(*) AS total
+FROM exercises e
+JOIN workout_exercises we ON we.exercise_id = e.id
+GROUP BY e.muscle_group;
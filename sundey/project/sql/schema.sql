@@ -10,14 +10,13 @@ CREATE DATABASE IF NOT EXISTS workout_manager
 -- השתמש בבסיס הנתונים
 USE workout_manager;
 
--- מחיקת טבלאות אם קיימות (לצורך בדיקות מאפס)
-DROP TABLE IF EXISTS workout_exercises;
-DROP TABLE IF EXISTS workouts;
-DROP TABLE IF EXISTS exercises;
-DROP TABLE IF EXISTS users;
+-- בלי DROP: הקובץ יוצר רק מה שחסר ולא מוחק נתונים.
+-- ל-DB שכבר קיים (עם נתונים) - להריץ את המיגרציות, שמוסיפות גם אינדקסים
+-- לטבלאות קיימות:
+--   python -m app.migrations
 
 -- טבלת משתמשים
-CREATE TABLE users (
+CREATE TABLE IF NOT EXISTS users (
     id INT AUTO_INCREMENT PRIMARY KEY,
     full_name VARCHAR(100) NOT NULL,
     email VARCHAR(100) NOT NULL UNIQUE,
@@ -25,18 +24,22 @@ CREATE TABLE users (
 ) ENGINE=InnoDB;
 
 -- טבלת תרגילים
-CREATE TABLE exercises (
+CREATE TABLE IF NOT EXISTS exercises (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
-    muscle_group VARCHAR(50)
+    muscle_group VARCHAR(50),
+    INDEX ix_exercises_name (name),
+    INDEX ix_exercises_muscle_group (muscle_group)
 ) ENGINE=InnoDB;
 
 -- טבלת אימונים
-CREATE TABLE workouts (
+CREATE TABLE IF NOT EXISTS workouts (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL,
     date DATE NOT NULL,
     notes VARCHAR(255),
+    -- האימונים של משתמש מהחדש לישן (משמש גם את ה-FK על user_id)
+    INDEX ix_workouts_user_date (user_id, date),
     CONSTRAINT fk_workouts_user
       FOREIGN KEY (user_id) REFERENCES users(id)
       ON DELETE CASCADE
@@ -44,13 +47,15 @@ CREATE TABLE workouts (
 ) ENGINE=InnoDB;
 
 -- טבלת חיבור בין אימון לתרגילים שבוצעו
-CREATE TABLE workout_exercises (
+CREATE TABLE IF NOT EXISTS workout_exercises (
     id INT AUTO_INCREMENT PRIMARY KEY,
     workout_id INT NOT NULL,
     exercise_id INT NOT NULL,
     sets INT NOT NULL CHECK (sets > 0),
     reps INT NOT NULL CHECK (reps > 0),
     weight DECIMAL(5,2) NOT NULL,
+    INDEX ix_workout_exercises_workout_exercise (workout_id, exercise_id),
+    INDEX ix_workout_exercises_exercise (exercise_id),
     CONSTRAINT fk_we_workout
       FOREIGN KEY (workout_id) REFERENCES workouts(id)
       ON DELETE CASCADE
@@ -60,3 +65,28 @@ CREATE TABLE workout_exercises (
       ON DELETE RESTRICT
       ON UPDATE CASCADE
 ) ENGINE=InnoDB;
+
+-- סיכומים לכל משתמש (ל-/users/{id}/stats)
+-- מתעדכנים באותה טרנזקציה שמוסיפה / מוחקת אימון (app/user_stats.py)
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INT PRIMARY KEY,
+    total_workouts INT NOT NULL DEFAULT 0,
+    total_volume DECIMAL(14,2) NOT NULL DEFAULT 0,
+    CONSTRAINT fk_user_stats_user
+      FOREIGN KEY (user_id) REFERENCES users(id)
+      ON DELETE CASCADE
+      ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- מונה לכל משתמש וקבוצת שרירים (תרגיל בלי muscle_group נשמר כ-'')
+CREATE TABLE IF NOT EXISTS user_muscle_stats (
+    user_id INT NOT NULL,
+    muscle_group VARCHAR(50) NOT NULL,
+    exercise_count INT NOT NULL DEFAULT 0,
+    volume DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, muscle_group),
+    CONSTRAINT fk_user_muscle_stats_user
+      FOREIGN KEY (user_id) REFERENCES users(id)
+      ON DELETE CASCADE
+      ON UPDATE CASCADE
+) ENGINE=InnoDB;
@@ -54,3 +54,18 @@ INSERT INTO workout_exercises (workout_id, exercise_id, sets, reps, weight) VALU
 -- workout 5 – Shoulders focus (משתמש 2)
 INSERT INTO workout_exercises (workout_id, exercise_id, sets, reps, weight) VALUES
   (5, 4, 4, 10, 30.00);  -- Overhead Press
+
+-- סיכומים לכל משתמש (user_stats) מהנתונים שהוכנסו למעלה
+-- (אותו חישוב כמו python -m app.user_stats rebuild)
+INSERT INTO user_stats (user_id, total_workouts, total_volume)
+SELECT w.user_id, COUNT(DISTINCT w.id), COALESCE(SUM(we.sets * we.reps * we.weight), 0)
+FROM workouts w
+LEFT JOIN workout_exercises we ON we.workout_id = w.id
+GROUP BY w.user_id;
+
+INSERT INTO user_muscle_stats (user_id, muscle_group, exercise_count, volume)
+SELECT w.user_id, COALESCE(e.muscle_group, ''), COUNT(*), SUM(we.sets * we.reps * we.weight)
+FROM workouts w
+JOIN workout_exercises we ON we.workout_id = w.id
+JOIN exercises e ON e.id = we.exercise_id
+GROUP BY w.user_id, COALESCE(e.muscle_group, '');
@@ -0,0 +1,146 @@
+"""
+אינדקס הפוך של trigrams (רצפים של 3 תווים) לחיפוש חלקי בכותרת / מחבר.
+
+במקום LIKE '%kw%' שסורק את כל הטבלה: מצמצמים מועמדים לפי החיתוך של
+רשימות ה-trigrams של מילת החיפוש, ורק עליהם עושים בדיקה מדויקת.
+
+נרמול (גם לטקסט וגם למילת החיפוש):
+- NFKD והסרת סימנים מצטרפים (ניקוד וטעמים בעברית, סימני הטעמה בלטינית)
+- casefold (אותיות גדולות / קטנות)
+- אותיות סופיות בעברית -> רגילות (ך->כ, ם->מ, ן->נ, ף->פ, ץ->צ)
+- רווחים מרובים -> רווח אחד
+
+TrigramIndex בטוח לשימוש מכמה threads: add / remove / search תחת נעילה אחת.
+"""
+import threading
+import unicodedata
+
+GRAM = 3
+FIELDS = ("title", "author")
+
+_FINAL_LETTERS = str.maketrans("ךםןףץ", "כמנפצ")
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    folded = stripped.casefold().translate(_FINAL_LETTERS)
+    return " ".join(folded.split())
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _match_rank(text: str, keyword: str):
+    """
+    דירוג התאמה (קטן = טוב יותר) או None אם אין התאמה:
+    0 - כל הטקסט, 1 - תחילת הטקסט, 2 - תחילת מילה, 3 - באמצע מילה
+    """
+    pos = text.find(keyword)
+    if pos < 0:
+        return None
+    if text == keyword:
+        return (0, 0)
+    if pos == 0:
+        return (1, 0)
+    # תחילת מילה - גם אם ההופעה הראשונה באמצע מילה
+    word_pos = text.find(" " + keyword)
+    if word_pos >= 0:
+        return (2, word_pos + 1)
+    return (3, pos)
+
+
+class TrigramIndex:
+    """
+    אינדקס trigrams בזיכרון על title ו-author, עם הוספה / מחיקה בודדת
+    """
+
+    def __init__(self):
+        # RLock - add קורא ל-remove כשה-id כבר קיים
+        self._lock = threading.RLock()
+        self._docs = {}
+        self._postings = {field: {} for field in FIELDS}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._docs
+
+    def add(self, doc_id, title: str, author: str = ""):
+        doc = (normalize(title), normalize(author))
+        with self._lock:
+            if doc_id in self._docs:
+                self.remove(doc_id)
+            self._docs[doc_id] = doc
+            for field, text in zip(FIELDS, doc):
+                postings = self._postings[field]
+                for gram in trigrams(text):
+                    postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id) -> bool:
+        with self._lock:
+            doc = self._docs.pop(doc_id, None)
+            if doc is None:
+                return False
+            for field, text in zip(FIELDS, doc):
+                postings = self._postings[field]
+                for gram in trigrams(text):
+                    ids = postings.get(gram)
+                    if ids is not None:
+                        ids.discard(doc_id)
+                        if not ids:
+                            del postings[gram]
+            return True
+
+    def _candidates(self, field: str, keyword: str):
+        """נקרא תחת self._lock"""
+        grams = trigrams(keyword)
+        if not grams:
+            # מילה קצרה מ-3 תווים - אין trigram, בודקים את כל המסמכים
+            return self._docs.keys()
+        postings = self._postings[field]
+        lists = []
+        for gram in grams:
+            ids = postings.get(gram)
+            if not ids:
+                return ()
+            lists.append(ids)
+        lists.sort(key=len)
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def search(self, keyword: str, fields=("title",), limit: int = None) -> list:
+        """
+        מחזיר ids של מסמכים שמכילים את keyword באחד השדות, מדורגים:
+        קודם התאמות בכותרת, ואז לפי סוג ההתאמה, מיקום ואורך הטקסט
+        """
+        keyword = normalize(keyword)
+        if not keyword:
+            return []
+
+        seen = set()
+        ranked = []
+        with self._lock:
+            docs = self._docs
+            for field_rank, field in enumerate(FIELDS):
+                if field not in fields:
+                    continue
+                for doc_id in self._candidates(field, keyword):
+                    if doc_id in seen:
+                        continue
+                    text = docs[doc_id][field_rank]
+                    rank = _match_rank(text, keyword)
+                    if rank is not None:
+                        seen.add(doc_id)
+                        ranked.append((field_rank, rank, len(text), doc_id))
+
+        ranked.sort()
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [item[-1] for item in ranked]